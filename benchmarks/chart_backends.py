@@ -0,0 +1,79 @@
+# benchmarks/chart_backends.py — сравнение способов рисования графиков в PDF-отчётах
+#
+#   python benchmarks/chart_backends.py --charts 50
+#
+# Строит PDF из N диаграмм того же вида, что в подробном отчёте, каждым
+# способом (reportlab / matplotlib) и печатает время генерации и размер файла.
+# База данных не нужна — данные для диаграмм случайные, но с фиксированным seed.
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, PageBreak
+
+from app.reports import fonts
+from app.reports.charts import BACKENDS, ChartSpec, chart_flowables
+
+
+FONT_NAME, = fonts.register("regular")
+
+
+def make_specs(n, seed=42):
+    rnd = random.Random(seed)
+    specs = []
+    for i in range(n):
+        tasks = rnd.randint(5, 12)
+        values = [rnd.randint(0, 40) for _ in range(tasks)]
+        specs.append(ChartSpec(
+            labels=[chr(ord('A') + t) for t in range(tasks)],
+            values=values,
+            title=f"Решённые задачи — Соревнование {i + 1}",
+            xlabel="Количество участников",
+            color='#10b981',
+            figsize=(10, max(4, tasks * 0.6)),
+            dpi=200,
+        ))
+    return specs
+
+
+def run(backend, specs, workers, out_dir):
+    path = os.path.join(out_dir, f"charts_{backend}.pdf")
+    start = time.perf_counter()
+    story = []
+    for chart in chart_flowables(specs, 500, 300, backend, workers, FONT_NAME):
+        story.extend([chart, PageBreak()])
+    SimpleDocTemplate(path, pagesize=A4).build(story)
+    elapsed = time.perf_counter() - start
+    return {"backend": backend, "charts": len(specs), "seconds": round(elapsed, 3),
+            "bytes": os.path.getsize(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--charts", type=int, default=30, help="число диаграмм в PDF")
+    parser.add_argument("--workers", type=int, default=None, help="процессов для matplotlib (по умолчанию — ядра)")
+    parser.add_argument("--json", action="store_true", help="вывести результат в JSON")
+    args = parser.parse_args()
+
+    specs = make_specs(args.charts)
+    with tempfile.TemporaryDirectory() as out_dir:
+        results = [run(backend, specs, args.workers, out_dir) for backend in BACKENDS]
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(f"{'способ':<12} {'диаграмм':>8} {'время, с':>10} {'размер, КБ':>12}")
+    for r in results:
+        print(f"{r['backend']:<12} {r['charts']:>8} {r['seconds']:>10.3f} {r['bytes'] / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# benchmarks/hot_paths.py — время основных операций приложения на текущей базе
+#
+#   python benchmarks/seed_data.py --scale medium --reset
+#   python benchmarks/hot_paths.py --repeat 5
+#   python benchmarks/hot_paths.py --baseline benchmarks/results/hot_paths-20260101-120000.json
+#
+# Замеряются те же пути, что выполняет приложение, без показа окон
+# (QT_QPA_PLATFORM=offscreen):
+#   home_stats            — карточки на главной (HOME_STATS_QUERY)
+#   refresh_table:<т>     — колонки из кэша схемы и первая страница PagedTableModel
+#   scroll:<т>            — ещё PAGES страниц при прокрутке
+#   dashboard.refresh_plot — запрос и перерисовка графика DashboardView
+#   snapshot.load         — чтение среза для статистического отчёта (итоги из сводки)
+#   snapshot.load_decisions — срез вместе с решениями по задачам (подробный отчёт)
+#   report.<тип>          — генерация каждого PDF-отчёта по готовому срезу
+# Результат (медиана и минимум по повторам, объёмы таблиц, коммит) пишется
+# в JSON; с --baseline медианы сравниваются с прошлым прогоном, и код
+# возврата 1 означает замедление больше --threshold процентов.
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+sys.path.insert(0, SRC_DIR)
+
+TABLES = ("users", "programming_tasks", "competition", "competition_tasks", "participation", "decisions")
+PAGES = 10
+
+
+def row_counts():
+    from database.database import connection
+    with connection() as conn:
+        cur = conn.cursor()
+        counts = {}
+        for table in TABLES:
+            cur.execute(f"SELECT COUNT(*) FROM `{table}`")
+            counts[table] = cur.fetchone()[0]
+        cur.close()
+    return counts
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"median": round(statistics.median(samples), 4), "min": round(min(samples), 4),
+            "samples": [round(s, 4) for s in samples]}
+
+
+# ============================= ПУТИ GUI =============================
+def qt_benchmarks(repeat, tables, selected):
+    if not os.environ.get("DISPLAY"):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QEventLoop
+    from PySide6.QtWidgets import QApplication
+
+    from app.table_model import PagedTableModel
+    from app.workers import get_executor
+    from database.queries import HOME_STATS_QUERY
+    from database.schema import schema_cache
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    executor = get_executor()
+
+    def wait(start):
+        """Вызвать start(done) и крутить цикл событий, пока не будет вызван done([ошибка])"""
+        loop = QEventLoop()
+        state = {"finished": False, "error": None}
+
+        def done(error=None):
+            state.update(finished=True, error=error)
+            loop.quit()
+        start(done)
+        if not state["finished"]:
+            loop.exec()
+        if state["error"]:
+            raise RuntimeError(state["error"])
+
+    results = {}
+
+    if selected("home_stats"):
+        results["home_stats"] = measure(lambda: wait(
+            lambda done: executor.query(HOME_STATS_QUERY, fetch="one", dictionary=True, key="bench_home",
+                                        on_result=lambda r: done(), on_error=done)), repeat)
+
+    for table in tables:
+        if not (selected(f"refresh_table:{table}") or selected(f"scroll:{table}")):
+            continue
+        model = PagedTableModel(executor)
+        page_loaded, page_failed = model._page_loaded, model._page_failed
+
+        def load(start, model=model, page_loaded=page_loaded, page_failed=page_failed):
+            # страница готова, когда модель обработала ответ исполнителя (в том числе пустой)
+            def run(done):
+                model._page_loaded = lambda page: (page_loaded(page), done())
+                model._page_failed = lambda msg: (page_failed(msg), done(msg))
+                start()
+            wait(run)
+
+        def first_page(model=model, table=table, load=load):
+            # как DataManagementView.refresh_table: колонки из кэша схемы, затем первая страница
+            load(lambda: model.set_table(table, schema_cache.column_names(table)))
+
+        def scroll(model=model, first_page=first_page, load=load):
+            first_page()
+            for _ in range(PAGES):
+                if not model.canFetchMore():
+                    break
+                load(model.fetchMore)
+
+        if selected(f"refresh_table:{table}"):
+            results[f"refresh_table:{table}"] = measure(first_page, repeat)
+        if selected(f"scroll:{table}"):
+            results[f"scroll:{table}"] = measure(scroll, repeat)
+
+    if selected("dashboard.refresh_plot"):
+        import main
+        view = main.DashboardView()
+        draw_plot = view.draw_plot
+
+        def refresh():
+            def run(done):
+                view.draw_plot = lambda data: (draw_plot(data), done())
+                view.show_error = done
+                view.refresh_plot()
+            wait(run)
+        results["dashboard.refresh_plot"] = measure(refresh, repeat)
+
+    return results
+
+
+# ============================= ОТЧЁТЫ =============================
+def report_benchmarks(repeat, selected):
+    from app.reports import AVAILABLE_REPORTS, ReportSnapshot, report_class
+
+    results = {}
+    if selected("snapshot.load"):
+        results["snapshot.load"] = measure(ReportSnapshot.load, repeat)
+    if selected("snapshot.load_decisions"):
+        results["snapshot.load_decisions"] = measure(lambda: ReportSnapshot.load(decisions=True), repeat)
+    snapshot = ReportSnapshot.load(decisions=True)
+    with tempfile.TemporaryDirectory() as out_dir:
+        for report_type in AVAILABLE_REPORTS:
+            name = f"report.{report_type}"
+            if not selected(name):
+                continue
+            options = {"snapshot": snapshot, "output_dir": out_dir}
+            if report_type == "detailed":
+                options["cache"] = False  # замеряем построение, а не чтение кэша разделов
+            # сообщения отчётов не мешают таблице результатов
+            with redirect_stdout(sys.stderr):
+                results[name] = measure(lambda: report_class(report_type)(**options).generate(), repeat)
+    return results
+
+
+# ============================= СРАВНЕНИЕ =============================
+def compare(results, baseline, threshold):
+    """Строки сравнения с прошлым прогоном и число замедлений больше threshold %"""
+    lines, regressions = [], 0
+    for name, r in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old or not old["median"]:
+            continue
+        change = (r["median"] - old["median"]) / old["median"] * 100
+        slow = change > threshold
+        regressions += slow
+        lines.append(f"{name:<34} {old['median']:>9.3f} → {r['median']:>9.3f} с  {change:+7.1f}%"
+                     + ("  ЗАМЕДЛЕНИЕ" if slow else ""))
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры основных операций DataWise на текущей базе.")
+    parser.add_argument("--repeat", type=int, default=3, help="повторов каждого замера (берётся медиана)")
+    parser.add_argument("--only", nargs="*", default=None, metavar="ИМЯ",
+                        help="только замеры, имена которых начинаются с указанных (home_stats, scroll, report. ...)")
+    parser.add_argument("--tables", nargs="*", default=list(TABLES), help="таблицы для refresh_table/scroll")
+    parser.add_argument("-o", "--output", default=None,
+                        help="файл результата (по умолчанию benchmarks/results/hot_paths-<время>.json)")
+    parser.add_argument("--baseline", default=None, help="прошлый результат для сравнения")
+    parser.add_argument("--threshold", type=float, default=20.0, help="допустимое замедление медианы, %% (по умолчанию 20)")
+    args = parser.parse_args()
+
+    def selected(name):
+        return args.only is None or any(name.startswith(prefix) for prefix in args.only)
+
+    run = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "rows": row_counts(),
+        "results": {},
+    }
+    run["results"].update(qt_benchmarks(args.repeat, args.tables, selected))
+    run["results"].update(report_benchmarks(args.repeat, selected))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"hot_paths-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(run, f, ensure_ascii=False, indent=2)
+
+    print("Объёмы: " + ", ".join(f"{t}={n:,}" for t, n in run["rows"].items()))
+    print(f"{'замер':<34} {'медиана, с':>10} {'мин, с':>10}")
+    for name, r in run["results"].items():
+        print(f"{name:<34} {r['median']:>10.3f} {r['min']:>10.3f}")
+    print(f"Результат: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressions = compare(run["results"], baseline, args.threshold)
+        print(f"\nСравнение с {args.baseline} (коммит {baseline.get('commit')}):")
+        print("\n".join(lines))
+        if regressions:
+            print(f"Замедлений больше {args.threshold:g}%: {regressions}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
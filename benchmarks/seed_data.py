@@ -0,0 +1,215 @@
+# benchmarks/seed_data.py — генератор тестовых данных для замеров на больших объёмах
+#
+#   python benchmarks/seed_data.py --scale medium --reset
+#   python benchmarks/seed_data.py --users 20000 --decisions 3000000 --seed 7 --reset
+#
+# Заполняет шесть таблиц схемы (users, programming_tasks, competition,
+# competition_tasks, participation, decisions) в базе из .env. Данные
+# детерминированы: одинаковые параметры и seed дают одинаковую базу.
+# Решения связаны с участием: участник решает задачи тех соревнований,
+# в которых участвовал, — как в настоящих данных.
+#
+# Только для локального MySQL: для другого хоста нужен --allow-remote.
+# --reset очищает все шесть таблиц перед загрузкой.
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from database.database import ConfigurationError, connection, connection_params  # noqa: E402
+
+SCALES = {
+    #          участники  соревнования  задачи   решения
+    "small":  dict(users=500, competitions=30, tasks=200, decisions=50_000),
+    "medium": dict(users=5_000, competitions=200, tasks=1_000, decisions=500_000),
+    "large":  dict(users=50_000, competitions=1_000, tasks=5_000, decisions=5_000_000),
+}
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# Порядок загрузки — по внешним ключам; очистка — в обратном порядке
+TABLES = ("users", "programming_tasks", "competition", "competition_tasks", "participation", "decisions")
+
+SURNAMES = ("Смирнов", "Иванов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов",
+            "Новиков", "Фёдоров", "Морозов", "Волков", "Алексеев", "Лебедев", "Семёнов", "Егоров")
+NAMES = ("Иван", "Алексей", "Дмитрий", "Максим", "Сергей", "Андрей", "Илья", "Никита", "Артём", "Павел")
+PATRONYMICS = ("Иванович", "Алексеевич", "Дмитриевич", "Сергеевич", "Андреевич", "Петрович", "Олегович")
+SPECIALIZATIONS = ("Программист", "Аналитик", "Тестировщик", "Студент", "Школьник", "Преподаватель", None)
+TITLES = ("Осенний тур", "Весенний чемпионат", "Зимний кубок", "Летний лагерь", "Тренировочный тур", "Блиц")
+LETTERS = "ABCDEFGHIJKLMNO"
+
+
+def generate(scale, rnd, participants=None, ok_share=0.45, start_ids=None):
+    """Строки для всех таблиц: {таблица: (колонки, итератор кортежей)}.
+
+    Решения выдаются генератором — миллионы строк не держатся в памяти.
+    """
+    ids = start_ids or {t: 1 for t in TABLES}
+    users = list(range(ids["users"], ids["users"] + scale["users"]))
+    tasks = list(range(ids["programming_tasks"], ids["programming_tasks"] + scale["tasks"]))
+    comps = list(range(ids["competition"], ids["competition"] + scale["competitions"]))
+    per_comp = participants or max(5, min(len(users), len(users) * 5 // max(1, len(comps))))
+
+    user_rows = [(uid, rnd.choice(SPECIALIZATIONS),
+                  f"{rnd.choice(SURNAMES)} {rnd.choice(NAMES)} {rnd.choice(PATRONYMICS)}",
+                  f"user{uid}@example.com") for uid in users]
+    task_rows = []
+    for tid in tasks:
+        complexity = rnd.randint(1, 15)
+        task_rows.append((tid, complexity * rnd.choice((50, 60, 80, 100)), complexity))
+
+    comp_rows, comp_task_rows, part_rows = [], [], []
+    comp_tasks, comp_users = {}, {}
+    ct_id, p_id = ids["competition_tasks"], ids["participation"]
+    first_day = datetime.date(2015, 1, 1)
+    for cid in comps:
+        n_tasks = min(len(tasks), rnd.randint(6, 15))
+        start = first_day + datetime.timedelta(days=rnd.randrange(365 * 12))
+        comp_rows.append((cid, f"{rnd.choice(TITLES)} {start.year} №{cid}", "Сгенерированное соревнование",
+                          start, start + datetime.timedelta(days=rnd.randint(0, 7)), n_tasks))
+        comp_tasks[cid] = rnd.sample(tasks, n_tasks)
+        for task_id, letter in zip(comp_tasks[cid], LETTERS):
+            comp_task_rows.append((ct_id, cid, task_id, letter))
+            ct_id += 1
+        comp_users[cid] = rnd.sample(users, min(len(users), max(1, int(rnd.gauss(per_comp, per_comp / 4)))))
+        places = list(range(1, len(comp_users[cid]) + 1))
+        rnd.shuffle(places)
+        for uid, place in zip(comp_users[cid], places):
+            part_rows.append((p_id, uid, cid, place))
+            p_id += 1
+
+    def decisions():
+        weights = [len(comp_users[c]) for c in comps]
+        picks = rnd.choices(comps, weights=weights, k=scale["decisions"]) if comps else []
+        for d_id, cid in enumerate(picks, ids["decisions"]):
+            yield (d_id, 'OK' if rnd.random() < ok_share else 'ERROR',
+                   rnd.choice(comp_users[cid]), rnd.choice(comp_tasks[cid]))
+
+    return {
+        "users": (("id", "Specialization", "FCs", "Email"), iter(user_rows)),
+        "programming_tasks": (("id", "points", "complexity"), iter(task_rows)),
+        "competition": (("id", "title", "description", "date_of_the_event", "end_date", "number_of_tasks"),
+                        iter(comp_rows)),
+        "competition_tasks": (("id", "competition_id", "task_id", "letter"), iter(comp_task_rows)),
+        "participation": (("id", "id_users", "id_competition", "Place_in_the_leaderboard"), iter(part_rows)),
+        "decisions": (("id", "status", "id_users", "id_programminng_tasks"), decisions()),
+    }
+
+
+def batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load(conn, table, columns, rows, batch_size, report=print):
+    """Вставить строки пачками executemany; возвращает число строк"""
+    cols = ", ".join(f"`{c}`" for c in columns)
+    sql = f"INSERT INTO `{table}` ({cols}) VALUES ({', '.join(['%s'] * len(columns))})"
+    cur = conn.cursor()
+    total, start = 0, time.perf_counter()
+    try:
+        for batch in batches(rows, batch_size):
+            cur.executemany(sql, batch)
+            conn.commit()
+            total += len(batch)
+            if total % (batch_size * 20) == 0:
+                report(f"  {table}: {total:,} строк, {total / (time.perf_counter() - start):,.0f} строк/с")
+    finally:
+        cur.close()
+    elapsed = time.perf_counter() - start
+    report(f"{table:<18} {total:>12,} строк  {elapsed:8.2f} с  {total / elapsed if elapsed else 0:>12,.0f} строк/с")
+    return total
+
+
+def next_ids(conn):
+    cur = conn.cursor()
+    ids = {}
+    for table in TABLES:
+        cur.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM `{table}`")
+        ids[table] = cur.fetchone()[0]
+    cur.close()
+    return ids
+
+
+def reset(conn):
+    cur = conn.cursor()
+    cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+    try:
+        for table in reversed(TABLES):
+            cur.execute(f"TRUNCATE TABLE `{table}`")
+    finally:
+        cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cur.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Заполнение локальной БД DataWise тестовыми данными.")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="готовый набор объёмов (по умолчанию small)")
+    for name in ("users", "competitions", "tasks", "decisions"):
+        parser.add_argument(f"--{name}", type=int, default=None, help=f"переопределить число строк: {name}")
+    parser.add_argument("--participants", type=int, default=None,
+                        help="среднее число участников соревнования (по умолчанию ~5 соревнований на участника)")
+    parser.add_argument("--ok-share", type=float, default=0.45, help="доля решений со статусом OK")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=5000, help="строк в одном INSERT")
+    parser.add_argument("--reset", action="store_true", help="очистить шесть таблиц перед загрузкой")
+    parser.add_argument("--allow-remote", action="store_true", help="разрешить запись в нелокальный сервер")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scale = dict(SCALES[args.scale])
+    for name in ("users", "competitions", "tasks", "decisions"):
+        if getattr(args, name) is not None:
+            scale[name] = getattr(args, name)
+
+    try:
+        params = connection_params()
+    except ConfigurationError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if params.get("host") not in LOCAL_HOSTS and not args.allow_remote:
+        print(f"Сервер {params.get('host')} не локальный; для записи туда укажите --allow-remote", file=sys.stderr)
+        return 2
+
+    print(f"База {params.get('database')}@{params.get('host')}: "
+          + ", ".join(f"{k}={v:,}" for k, v in scale.items()))
+    started = time.perf_counter()
+    with connection() as conn:
+        if args.reset:
+            reset(conn)
+        data = generate(scale, random.Random(args.seed), args.participants, args.ok_share, next_ids(conn))
+        cur = conn.cursor()
+        cur.execute("SET FOREIGN_KEY_CHECKS = 0")  # связи согласованы генератором
+        try:
+            for table in TABLES:
+                columns, rows = data[table]
+                load(conn, table, columns, rows, args.batch)
+        finally:
+            cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+        for table in TABLES:
+            cur.execute(f"ANALYZE TABLE `{table}`")
+            cur.fetchall()
+        cur.close()
+
+        from database import summary
+        if summary.exists():
+            print(f"Сводка решений перестроена: {summary.rebuild(conn):,} участников")
+    print(f"Готово за {time.perf_counter() - started:.1f} с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
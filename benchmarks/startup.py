@@ -0,0 +1,100 @@
+# benchmarks/startup.py — время запуска главного окна: до первой отрисовки
+#
+#   python benchmarks/startup.py --repeat 5
+#
+# Каждый замер — отдельный процесс (холодный импорт модулей). Режимы:
+#   eager — как было: matplotlib и модули отчётов импортируются при загрузке
+#           main.py, все пять страниц создаются в MainWindow.__init__
+#   lazy  — страницы создаются при первом выборе, тяжёлые модули — по требованию
+# Без DISPLAY используется QT_QPA_PLATFORM=offscreen. Запросы к БД страницы
+# выполняют в фоне, поэтому на время до первой отрисовки сервер не влияет.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+MODES = ("eager", "lazy")
+
+
+def measure(mode):
+    """Один замер в текущем процессе; печатает JSON и завершает процесс"""
+    start = time.perf_counter()
+    sys.path.insert(0, SRC_DIR)
+    if not os.environ.get("DISPLAY"):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    if mode == "eager":
+        # то, что main.py раньше импортировал на верхнем уровне
+        import matplotlib.pyplot  # noqa: F401
+        from matplotlib.backends import backend_qtagg  # noqa: F401
+        from app.reports import detailed_report, statistical_report  # noqa: F401
+
+    app = QApplication(sys.argv[:1])
+    import main
+    imported = time.perf_counter()
+
+    win = main.MainWindow(lazy_pages=(mode == "lazy"))
+    constructed = time.perf_counter()
+    result = {}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and not result:
+                result.update(
+                    mode=mode,
+                    import_seconds=round(imported - start, 4),
+                    window_seconds=round(constructed - imported, 4),
+                    first_paint_seconds=round(time.perf_counter() - start, 4),
+                )
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    paint_filter = FirstPaint()
+    app.installEventFilter(paint_filter)
+    win.show()
+    app.exec()
+    print(json.dumps(result))
+    sys.stdout.flush()
+    # не ждём фоновые запросы к БД, которые страницы успели запустить
+    os._exit(0)
+
+
+def run(mode, repeat):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode],
+                             capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    keys = ("import_seconds", "window_seconds", "first_paint_seconds")
+    return {"mode": mode, "repeat": repeat,
+            **{key: round(statistics.median(s[key] for s in samples), 4) for key in keys}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время запуска DataWise до первой отрисовки окна")
+    parser.add_argument("--repeat", type=int, default=5, help="замеров на режим (берётся медиана)")
+    parser.add_argument("--json", action="store_true", help="вывести результат в JSON")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child)
+
+    results = [run(mode, args.repeat) for mode in MODES]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(f"{'режим':<8}{'импорт, с':>12}{'окно, с':>12}{'до отрисовки, с':>18}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['import_seconds']:>12.3f}{r['window_seconds']:>12.3f}{r['first_paint_seconds']:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
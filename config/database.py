@@ -25,3 +25,55 @@ DATABASE_CONFIG = {
     'charset': os.getenv('DB_CHARSET', 'utf8mb4')
 
 }
+
+ 
+
+# Пул соединений (см. src/database/database.py)
+
+POOL_CONFIG = {
+
+    'size': int(os.getenv('DB_POOL_SIZE', 5)),
+
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+
+    'ping_interval': float(os.getenv('DB_POOL_PING_INTERVAL', 30))
+
+}
+
+ 
+
+# Локальная копия для чтения (см. src/database/replica.py): отчёты и дашборд
+
+# читают из файла SQLite вместо удалённого сервера, если DB_READ_BACKEND=replica
+
+REPLICA_CONFIG = {
+
+    'backend': os.getenv('DB_READ_BACKEND', 'mysql'),
+
+    'path': os.getenv('DB_REPLICA_PATH', ''),
+
+    'sync_interval': float(os.getenv('DB_REPLICA_SYNC_INTERVAL', 60)),
+
+    'checksum_interval': float(os.getenv('DB_REPLICA_CHECKSUM_INTERVAL', 3600))
+
+}
+
+ 
+
+# Живые счётчики главной и дашборда (см. src/app/change_feed.py): опрос новых строк
+
+# и журнала change_log, полная пересверка; keep_days — для python -m database.changes --prune.
+
+# По умолчанию выключены
+
+CHANGE_FEED_CONFIG = {
+
+    'poll_interval': float(os.getenv('DB_CHANGE_POLL_INTERVAL', 0)),
+
+    'resync_interval': float(os.getenv('DB_CHANGE_RESYNC_INTERVAL', 900)),
+
+    'lag': float(os.getenv('DB_CHANGE_LAG', 30)),
+
+    'keep_days': int(os.getenv('DB_CHANGE_LOG_KEEP_DAYS', 7))
+
+}
@@ -0,0 +1,267 @@
+# app/change_feed.py — живое обновление счётчиков и графиков без повторных агрегатов
+#
+# Вместо того чтобы снова выполнять COUNT(*) и GROUP BY, окна подписываются
+# на ленту изменений. Лента раз в poll_interval секунд читает в фоне:
+#   * новые строки отслеживаемых таблиц — id больше водяного знака, так видны
+#     и вставки из других программ;
+#   * журнал change_log (database/changes.py) — правки и удаления, сделанные
+#     приложением через database/mutations.py.
+# Подписчик получает базовый срез (свой запрос) в той же транзакции, в
+# которой снимаются водяные знаки. Затем ему приходят только дельты (Delta).
+#
+# id выдаются при вставке, а видны после коммита, поэтому строка с меньшим
+# id может появиться позже большей. Водяной знак — это пара (low, seen):
+# все id не больше low учтены, а id выше low, уже отданные подписчикам,
+# перечислены в seen. Каждый опрос перечитывает всё выше low и отдаёт только
+# строки не из seen; low поднимается до id, увиденных больше lag секунд назад.
+# Строка, чья транзакция шла дольше lag, в дельты не попадёт — её, как и
+# правки в обход приложения, исправит полная пересверка раз в resync_interval.
+#
+# Лента по умолчанию выключена (DB_CHANGE_POLL_INTERVAL=0) и не работает
+# при DB_READ_BACKEND=replica: опрос шёл бы на сервер, а не в копию.
+import time
+
+from PySide6.QtCore import QObject, QTimer
+
+from app.workers import get_executor
+from database import changes, replica
+from database.database import CHANGE_FEED_CONFIG
+
+BATCH = 10000  # строк одной таблицы и записей журнала за один опрос
+LAG_IDS = 1000  # последних id среза, выше которых ещё ждут строк с поздним коммитом
+
+
+class Delta:
+    """Изменения с прошлого опроса.
+
+    inserted — {таблица: [строки-словари с id и запрошенными колонками]};
+    changed — записи журнала {'table', 'row_id', 'action', 'before', 'after'}
+    только о строках, которые подписчики уже учли в своём срезе.
+    """
+
+    def __init__(self, inserted, changed):
+        self.inserted = inserted
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.changed) or any(self.inserted.values())
+
+    def for_table(self, table, action):
+        return [c for c in self.changed if c['table'] == table and c['action'] == action]
+
+    def count_change(self, table):
+        """На сколько изменилось число строк таблицы"""
+        return len(self.inserted.get(table, ())) - len(self.for_table(table, 'delete'))
+
+
+# ============================= ЧТЕНИЕ В ФОНЕ =============================
+def _max_id(cur, table):
+    cur.execute(f"SELECT COALESCE(MAX(id), 0) AS id FROM `{table}`")
+    return cur.fetchone()['id']
+
+
+def _baseline_mark(cur, table, now):
+    """Водяной знак среза: последние LAG_IDS id считаются увиденными сейчас —
+    строки с id в этом окне, закоммиченные после среза, придут вставками"""
+    low = max(0, _max_id(cur, table) - LAG_IDS)
+    cur.execute(f"SELECT id FROM `{table}` WHERE id > %s", (low,))
+    return low, dict.fromkeys((row['id'] for row in cur.fetchall()), now)
+
+
+def _advance(mark, ids, now, lag):
+    """Новый водяной знак: добавить увиденные id и поднять low до тех, что старше lag"""
+    low, seen = mark
+    seen = {**seen, **dict.fromkeys(ids, now)}
+    settled = [i for i, at in seen.items() if now - at >= lag]
+    if settled:
+        low = max(low, max(settled))
+    return low, {i: at for i, at in seen.items() if i > low}
+
+
+def _counted(mark, row_id):
+    low, seen = mark
+    return row_id <= low or row_id in seen
+
+
+def read_baseline(conn, queries, tracked):
+    """Срезы подписчиков и водяные знаки из одного снимка БД"""
+    log_exists = changes.exists(conn)
+    conn.start_transaction(consistent_snapshot=True, readonly=True)
+    cur = conn.cursor(dictionary=True)
+    now = time.monotonic()
+    try:
+        results = {}
+        for key, (sql, fetch) in queries.items():
+            cur.execute(sql)
+            results[key] = cur.fetchone() if fetch == "one" else cur.fetchall()
+        marks = {table: _baseline_mark(cur, table, now) for table in tracked}
+        log_mark = _baseline_mark(cur, changes.CHANGE_LOG_TABLE, now) if log_exists else (0, {})
+    finally:
+        cur.close()
+        conn.commit()
+    return results, marks, log_mark
+
+
+def read_changes(conn, tracked, marks, log_mark, lag):
+    """Delta и новые водяные знаки; None, если журнал отстал больше чем на BATCH записей"""
+    conn.start_transaction(consistent_snapshot=True, readonly=True)
+    cur = conn.cursor(dictionary=True)
+    now = time.monotonic()
+    try:
+        inserted, new_marks = {}, dict(marks)
+        for table, columns in tracked.items():
+            low, seen = marks[table]
+            cols = ', '.join(['`id`'] + [f"`{c}`" for c in columns])
+            cur.execute(f"SELECT {cols} FROM `{table}` WHERE id > %s ORDER BY id LIMIT %s", (low, BATCH))
+            rows = cur.fetchall()
+            inserted[table] = [row for row in rows if row['id'] not in seen]
+            new_marks[table] = _advance(marks[table], [row['id'] for row in inserted[table]], now, lag)
+            if len(rows) >= BATCH:
+                # пачка заполнена — пропуски внутри неё больше не ждём, иначе
+                # опрос перечитывал бы одни и те же строки
+                low = rows[-1]['id']
+                new_marks[table] = (low, {i: at for i, at in new_marks[table][1].items() if i > low})
+
+        changed = []
+        if changes.exists(conn):
+            cur.execute(changes.CHANGES_QUERY, (log_mark[0], BATCH))
+            entries = cur.fetchall()
+            if len(entries) >= BATCH:
+                return None
+            entries = [e for e in entries if e['id'] not in log_mark[1]]
+            for e in entries:
+                table = e['table_name']
+                # строки, ещё не учтённые подписчиками, прочитаны выше в
+                # текущем состоянии (или удалены до опроса)
+                if table in tracked and _counted(marks[table], e['row_id']):
+                    changed.append({'table': table, 'row_id': e['row_id'], 'action': e['action'],
+                                    'before': changes.decode(e['before_data']),
+                                    'after': changes.decode(e['after_data'])})
+            log_mark = _advance(log_mark, [e['id'] for e in entries], now, lag)
+    finally:
+        cur.close()
+        conn.commit()
+    return Delta(inserted, changed), new_marks, log_mark
+
+
+# ============================= ЛЕНТА =============================
+class ChangeFeed(QObject):
+    """Опрос изменений для подписанных окон; обратные вызовы — в GUI-потоке"""
+
+    def __init__(self, poll_interval=None, resync_interval=None, executor=None, parent=None):
+        super().__init__(parent)
+        self.poll_interval = CHANGE_FEED_CONFIG.get('poll_interval', 5) if poll_interval is None else poll_interval
+        self.resync_interval = (CHANGE_FEED_CONFIG.get('resync_interval', 900)
+                                if resync_interval is None else resync_interval)
+        self.lag = CHANGE_FEED_CONFIG.get('lag', 30)
+        self.executor = executor or get_executor()
+        self.subscribers = {}
+        self.marks = None          # {таблица: (low, seen)}; None — нужен новый срез
+        self.log_mark = (0, {})
+        self.last_reset = 0.0
+        self.busy = False
+        self.stale = False         # подписчики сменились, пока шёл опрос
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+
+    def subscribe(self, key, baseline_sql, on_reset, on_delta, tables, fetch="all", on_error=None):
+        """Подписать окно.
+
+        baseline_sql — полный запрос окна, его результат приходит в on_reset
+        (при подписке и при каждой пересверке); on_delta(Delta) — после
+        опросов, в которых что-то изменилось. tables — {таблица: колонки},
+        которые нужны окну в новых строках (id приходит всегда).
+        on_error(сообщение) — если опрос не удался.
+        """
+        self.subscribers[key] = (baseline_sql, fetch, tables, on_reset, on_delta, on_error)
+        self.marks = None  # общий снимок для всех подписчиков, включая нового
+        self.stale = self.busy
+        if not self.timer.isActive():
+            self.timer.start(int(self.poll_interval * 1000))
+        self.poll()
+
+    def unsubscribe(self, key):
+        self.subscribers.pop(key, None)
+        if not self.subscribers:
+            self.timer.stop()
+
+    def stop(self):
+        """Остановить опрос и забыть подписчиков (при закрытии окна)"""
+        self.timer.stop()
+        self.subscribers.clear()
+        self.executor.cancel_key("change_feed")
+        self.busy = False
+
+    def tracked(self):
+        tables = {}
+        for _, _, sub_tables, _, _, _ in self.subscribers.values():
+            for table, columns in sub_tables.items():
+                tables[table] = tuple(dict.fromkeys(tables.get(table, ()) + tuple(columns)))
+        return tables
+
+    def poll(self):
+        if self.busy or not self.subscribers:
+            return
+        self.busy = True
+        tracked = self.tracked()
+        if self.marks is None or time.monotonic() - self.last_reset > self.resync_interval:
+            queries = {key: (sql, fetch) for key, (sql, fetch, _, _, _, _) in self.subscribers.items()}
+            self.executor.execute(lambda conn: ("reset", read_baseline(conn, queries, tracked)),
+                                  key="change_feed", on_result=self._done, on_error=self._failed)
+        else:
+            marks, log_mark, lag = dict(self.marks), self.log_mark, self.lag
+            self.executor.execute(lambda conn: ("delta", read_changes(conn, tracked, marks, log_mark, lag)),
+                                  key="change_feed", on_result=self._done, on_error=self._failed)
+
+    def _done(self, result):
+        self.busy = False
+        if self.stale:
+            self.stale = False
+            self.poll()
+            return
+        kind, payload = result
+        if kind == "reset":
+            results, self.marks, self.log_mark = payload
+            self.last_reset = time.monotonic()
+            for key, rows in results.items():
+                if key in self.subscribers:
+                    self.subscribers[key][3](rows)
+        elif payload is None:
+            self.marks = None  # журнал отстал — проще перечитать срезы
+            self.poll()
+        else:
+            delta, self.marks, self.log_mark = payload
+            if delta:
+                for _, _, _, _, on_delta, _ in list(self.subscribers.values()):
+                    on_delta(delta)
+
+    def _failed(self, msg):
+        self.busy = False
+        self.stale = False
+        self.marks = None  # окна показали ошибку — следующий удачный опрос перечитает срезы
+        print("Обновление счётчиков:", msg)
+        for _, _, _, _, _, on_error in list(self.subscribers.values()):
+            if on_error:
+                on_error(msg)
+
+
+def enabled():
+    """Лента включена в .env и чтение идёт с сервера, а не из локальной копии"""
+    return CHANGE_FEED_CONFIG.get('poll_interval', 0) > 0 and not replica.enabled()
+
+
+_feed = None
+
+
+def stop():
+    """Остановить общую ленту, если она создавалась"""
+    if _feed is not None:
+        _feed.stop()
+
+
+def get_feed():
+    """Общая лента изменений; создаётся при первом обращении (после QApplication)"""
+    global _feed
+    if _feed is None:
+        _feed = ChangeFeed()
+    return _feed
@@ -0,0 +1,89 @@
+# app/report_queue.py — очередь генерации PDF-отчётов вне GUI-потока
+import itertools
+import os
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from app.reports import ReportCancelled, report_class
+
+
+class ReportJob(QRunnable):
+    """Один отчёт в очереди. Ход работы и итог отдаются через сигналы ReportQueue"""
+
+    def __init__(self, queue, job_id, report_type, name):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.queue = queue
+        self.id = job_id
+        self.report_type = report_type
+        self.name = name
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            self.queue.job_cancelled.emit(self.id)
+            return
+        try:
+            # модуль отчёта импортируется здесь, в фоновом потоке
+            report = report_class(self.report_type)(
+                on_progress=lambda fraction, phase: self.queue.job_progress.emit(self.id, fraction, phase),
+                should_cancel=lambda: self.cancelled,
+            )
+            report.generate()
+        except ReportCancelled:
+            self.queue.job_cancelled.emit(self.id)
+        except Exception as e:
+            self.queue.job_failed.emit(self.id, str(e))
+        else:
+            self.queue.job_finished.emit(self.id, os.path.abspath(report.filename))
+
+
+class ReportQueue(QObject):
+    """Отчёты генерируются по одному в собственном потоке, в порядке постановки.
+
+    Пока идёт генерация, остальные вкладки работают как обычно. Отчёт
+    в очереди снимается сразу, выполняющийся — останавливается в ближайшей
+    точке хода (между разделами или страницами), недописанный файл удаляется.
+    Сигналы приходят в GUI-поток.
+    """
+
+    job_added = Signal(int, str)             # id, название
+    job_progress = Signal(int, float, str)   # id, доля 0..1, этап
+    job_finished = Signal(int, str)          # id, путь к PDF
+    job_failed = Signal(int, str)            # id, сообщение
+    job_cancelled = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        for signal in (self.job_finished, self.job_failed, self.job_cancelled):
+            signal.connect(self._forget)
+
+    def submit(self, report_type, name):
+        """Поставить отчёт в очередь по типу из AVAILABLE_REPORTS"""
+        job = ReportJob(self, next(self._ids), report_type, name)
+        self._jobs[job.id] = job
+        self.job_added.emit(job.id, name)
+        self.pool.start(job)
+        return job.id
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None or job.cancelled:
+            return
+        job.cancelled = True
+        if self.pool.tryTake(job):
+            self.job_cancelled.emit(job_id)
+
+    def cancel_all(self):
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+
+    def pending(self):
+        return len(self._jobs)
+
+    def _forget(self, job_id, *args):
+        self._jobs.pop(job_id, None)
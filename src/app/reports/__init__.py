@@ -1,21 +1,28 @@
 # app/reports/__init__.py
-from .detailed_report import DetailedReport
-from .statistical_report import StatsReport
+# Классы отчётов импортируются лениво: сам пакет не тянет ReportLab,
+# matplotlib и шрифты, пока отчёт не понадобился (например, для --list)
+import importlib
+
+from .snapshot import ReportSnapshot
+from .progress import ReportCancelled
 
 # Удобные алиасы — можно будет писать просто:
 # from app.reports import DetailedReport, StatsReport
 
 
-# Список всех доступных отчётов (удобно для GUI)
+# Список всех доступных отчётов (удобно для GUI и командной строки)
 AVAILABLE_REPORTS = {
     "detailed": {
         "name": "Подробный отчёт по соревнованиям",
-        "class": DetailedReport,
-        "description": "Все соревнования, участники, задачи и решения"
+        "module": ".detailed_report",
+        "class_name": "DetailedReport",
+        "description": "Все соревнования, участники, задачи и решения",
+        "decisions": True,  # нужны решения по паре участник/задача, см. ReportSnapshot.load
     },
     "statistical": {
         "name": "Статистический отчёт и рейтинг",
-        "class": StatsReport,
+        "module": ".statistical_report",
+        "class_name": "StatsReport",
         "description": "ТОП участников, графики активности, анализ сложности"
     }
 }
@@ -23,24 +30,71 @@ AVAILABLE_REPORTS = {
 __all__ = [
     "DetailedReport",
     "StatsReport",
-    "DetailedReport",
-    "StatsReport",
-    "AVAILABLE_REPORTS"
+    "ReportSnapshot",
+    "ReportCancelled",
+    "AVAILABLE_REPORTS",
+    "report_class",
+    "needs_decisions",
 ]
 
+
+def report_class(report_type: str):
+    """Класс отчёта по его типу; модуль отчёта импортируется при первом обращении"""
+    report_type = report_type.lower()
+    if report_type not in AVAILABLE_REPORTS:
+        raise ValueError(f"Неизвестный тип отчёта: {report_type}. Доступно: {', '.join(AVAILABLE_REPORTS.keys())}")
+    info = AVAILABLE_REPORTS[report_type]
+    return getattr(importlib.import_module(info["module"], __name__), info["class_name"])
+
+
+def needs_decisions(report_types):
+    """Нужны ли отчётам решения по паре участник/задача (иначе хватает сводки)"""
+    return any(AVAILABLE_REPORTS[t.lower()].get("decisions", False) for t in report_types)
+
+
+def __getattr__(name):
+    # from app.reports import DetailedReport — импорт модуля только в этот момент
+    for info in AVAILABLE_REPORTS.values():
+        if info["class_name"] == name:
+            return getattr(importlib.import_module(info["module"], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Опционально: можно добавить функцию для запуска по имени
-def generate_report(report_type: str):
+def generate_report(report_type: str, **options):
     """
     Быстро сгенерировать отчёт по его типу.
-    
+    options передаются в конструктор отчёта (например, output_dir).
+
     Пример:
         generate_report("detailed")
-        generate_report("statistical")
+        generate_report("statistical", output_dir="reports")
     """
-    report_type = report_type.lower()
-    if report_type not in AVAILABLE_REPORTS:
-        raise ValueError(f"Неизвестный тип отчёта: {report_type}. Доступно: {', '.join(AVAILABLE_REPORTS.keys())}")
-    
-    report_class = AVAILABLE_REPORTS[report_type]["class"]
-    print(f"Генерация отчёта: {AVAILABLE_REPORTS[report_type]['name']}")
-    report_class().generate()
+    cls = report_class(report_type)
+    print(f"Генерация отчёта: {AVAILABLE_REPORTS[report_type.lower()]['name']}")
+    report = cls(**options)
+    report.generate()
+    return report.filename
+
+
+def generate_reports(report_types, snapshot=None, **options):
+    """
+    Сгенерировать несколько отчётов по одному согласованному срезу данных.
+
+    Данные читаются из БД один раз, поэтому цифры во всех отчётах совпадают,
+    даже если во время генерации кто-то добавляет решения.
+
+    Пример:
+        generate_reports(["detailed", "statistical"])
+    """
+    classes = [report_class(t) for t in report_types]
+
+    if snapshot is None:
+        snapshot = ReportSnapshot.load(decisions=needs_decisions(report_types))
+    files = []
+    for report_type, cls in zip(report_types, classes):
+        print(f"Генерация отчёта: {AVAILABLE_REPORTS[report_type.lower()]['name']}")
+        report = cls(snapshot=snapshot, **options)
+        report.generate()
+        files.append(report.filename)
+    return files
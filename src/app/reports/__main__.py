@@ -0,0 +1,107 @@
+# app/reports/__main__.py — генерация отчётов из командной строки, без GUI
+#
+#   cd src
+#   python -m app.reports --list
+#   python -m app.reports detailed statistical -o reports/ --jobs 2 --json
+#
+# PySide6 здесь не импортируется: команда работает на сервере без дисплея.
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext, redirect_stdout
+
+from . import AVAILABLE_REPORTS, ReportSnapshot, needs_decisions, report_class
+
+
+def run_report(report_type, snapshot, options, quiet=False):
+    """Сгенерировать один отчёт; результат — словарь для сводки (в том числе --json)"""
+    start = time.perf_counter()
+    result = {"type": report_type}
+    # при --json stdout занят сводкой, поэтому сообщения отчётов уходят в stderr
+    with redirect_stdout(sys.stderr) if quiet else nullcontext():
+        try:
+            report = report_class(report_type)(snapshot=snapshot, **options)
+            report.generate()
+            result["file"] = os.path.abspath(report.filename)
+        except Exception as e:
+            result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.reports",
+        description="Генерация PDF-отчётов DataWise без графического интерфейса.",
+    )
+    parser.add_argument("reports", nargs="*", metavar="ТИП",
+                        help=f"типы отчётов: {', '.join(AVAILABLE_REPORTS)} (по умолчанию — все)")
+    parser.add_argument("--list", action="store_true", help="показать доступные отчёты и выйти")
+    parser.add_argument("-o", "--output-dir", default=None, help="каталог для PDF (создаётся при необходимости)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="сколько отчётов строить одновременно, в отдельных процессах (по умолчанию 1)")
+    parser.add_argument("--chart-backend", default=None, choices=("reportlab", "matplotlib"),
+                        help="способ рисования графиков: reportlab или matplotlib (по умолчанию REPORT_CHART_BACKEND)")
+    parser.add_argument("--json", action="store_true", help="вывести сводку с временем работы в формате JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.list:
+        for key, info in AVAILABLE_REPORTS.items():
+            print(f"{key:<12} {info['name']} — {info['description']}")
+        return 0
+
+    report_types = [t.lower() for t in args.reports] or list(AVAILABLE_REPORTS)
+    unknown = [t for t in report_types if t not in AVAILABLE_REPORTS]
+    if unknown:
+        print(f"Неизвестный тип отчёта: {', '.join(unknown)}. Доступно: {', '.join(AVAILABLE_REPORTS)}", file=sys.stderr)
+        return 2
+
+    options = {}
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        options["output_dir"] = args.output_dir
+    if args.chart_backend:
+        options["chart_backend"] = args.chart_backend
+
+    started = time.perf_counter()
+    try:
+        # Все отчёты строятся по одному согласованному срезу данных
+        snapshot = ReportSnapshot.load(decisions=needs_decisions(report_types))
+    except Exception as e:
+        print(f"Не удалось подключиться к БД: {e}", file=sys.stderr)
+        return 1
+    snapshot_seconds = round(time.perf_counter() - started, 3)
+
+    jobs = [(t, snapshot, options, args.json) for t in report_types]
+    workers = max(1, min(args.jobs, len(jobs)))
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_report, *zip(*jobs)))
+    else:
+        results = [run_report(*job) for job in jobs]
+
+    summary = {
+        "snapshot_seconds": snapshot_seconds,
+        "total_seconds": round(time.perf_counter() - started, 3),
+        "jobs": workers,
+        "reports": results,
+    }
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        for r in results:
+            status = r.get("file") or f"ОШИБКА: {r['error']}"
+            print(f"{r['type']:<12} {r['seconds']:>8.2f} с  {status}")
+        print(f"Итого: {summary['total_seconds']:.2f} с (чтение данных {snapshot_seconds:.2f} с)")
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
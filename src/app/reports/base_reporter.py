@@ -5,11 +5,11 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
 import os
 
+from . import fonts
+
 
 class BasePDFReporter:
     def __init__(self, filename="report.pdf"):
@@ -23,26 +23,10 @@ class BasePDFReporter:
             bottomMargin=0.8*inch
         )
         self.story = []
-        self._register_fonts()
-
-    def _register_fonts(self):
-        # Пытаемся подключить Arial (Windows путь — на Linux упадёт в except)
-        try:
-            pdfmetrics.registerFont(TTFont('Arial-Russian', '/usr/share/fonts/truetype/msttcorefonts/arial.ttf'))
-            pdfmetrics.registerFont(TTFont('Arial-Russian-Bold', '/usr/share/fonts/truetype/msttcorefonts/arialbd.ttf'))
-            self.font_normal = 'Arial-Russian'
-            self.font_bold = 'Arial-Russian-Bold'
-        except:
-            # Если Arial нет — пробуем DejaVu (обычно есть на Linux и т.д.)
-            try:
-                pdfmetrics.registerFont(TTFont('DejaVuSans', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'))
-                pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'))
-                self.font_normal = 'DejaVuSans'
-                self.font_bold = 'DejaVuSans-Bold'
-            except:
-                self.font_normal = 'Helvetica'
-                self.font_bold = 'Helvetica-Bold'
-                print("Warning: Используется Helvetica — кириллица может отображаться квадратами")
+        # Шрифты из src/fonts через общий реестр — TTF разбирается один раз на процесс
+        self.font_normal, self.font_bold = fonts.register("regular", "bold")
+        if self.font_normal == 'Helvetica':
+            print("Warning: Используется Helvetica — кириллица может отображаться квадратами")
 
     def add_title(self, text):
         styles = getSampleStyleSheet()
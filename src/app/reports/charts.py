@@ -0,0 +1,156 @@
+# app/reports/charts.py — отрисовка графиков для PDF-отчётов
+import io
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Image
+
+# "reportlab" — векторные диаграммы средствами ReportLab (по умолчанию),
+# "matplotlib" — растровые PNG, как раньше
+BACKENDS = ("reportlab", "matplotlib")
+DEFAULT_BACKEND = os.getenv("REPORT_CHART_BACKEND", "reportlab")
+
+# Описание горизонтальной столбчатой диаграммы. Только простые данные —
+# спецификация передаётся в процессы-рисовальщики через pickle
+ChartSpec = namedtuple(
+    "ChartSpec",
+    ["labels", "values", "title", "xlabel", "color", "figsize", "dpi",
+     "title_size", "title_pad", "value_labels", "tight_layout"],
+    defaults=(None, None, False, False),
+)
+
+
+def render_chart(spec):
+    """Нарисовать диаграмму и вернуть PNG в байтах.
+
+    Используется объектный API matplotlib (Figure), а не глобальное состояние
+    pyplot, поэтому функцию можно безопасно вызывать в нескольких процессах.
+    """
+    from matplotlib import rc_context
+    from matplotlib.figure import Figure
+
+    with rc_context({'font.family': 'DejaVu Sans'}):
+        fig = Figure(figsize=spec.figsize)
+        ax = fig.subplots()
+        positions = range(len(spec.values))
+        bars = ax.barh(positions, spec.values, color=spec.color)
+        ax.set_yticks(positions, spec.labels)
+        if spec.title_size or spec.title_pad:
+            ax.set_title(spec.title, fontsize=spec.title_size, pad=spec.title_pad)
+        else:
+            ax.set_title(spec.title)
+        ax.set_xlabel(spec.xlabel)
+        ax.grid(True, axis='x', alpha=0.3)
+        if spec.value_labels:
+            for bar in bars:
+                width = int(bar.get_width())
+                if width > 0:
+                    ax.text(width + 0.1, bar.get_y() + bar.get_height() / 2, str(width), va='center')
+        if spec.tight_layout:
+            fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=spec.dpi, bbox_inches='tight')
+    return buf.getvalue()
+
+
+def render_charts(specs, workers=None):
+    """Нарисовать все диаграммы; при нескольких диаграммах — в пуле процессов.
+
+    workers=None — по числу ядер, workers=1 — последовательно в текущем процессе.
+    Результат — список PNG в том же порядке, что и specs.
+    """
+    specs = list(specs)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(specs))
+    if workers <= 1:
+        return [render_chart(spec) for spec in specs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render_chart, specs, chunksize=max(1, len(specs) // (workers * 4))))
+
+
+# ============================= ВЕКТОРНЫЙ ВАРИАНТ =============================
+def _nice_step(vmax, max_ticks=8):
+    """Шаг делений оси: 1, 2 или 5 × 10^k, целый — по оси откладываются количества"""
+    raw = max(vmax, 1) / max_ticks
+    magnitude = 10 ** math.floor(math.log10(raw)) if raw >= 1 else 1
+    for m in (1, 2, 5, 10):
+        if raw <= m * magnitude:
+            return max(1, int(m * magnitude))
+    return max(1, int(10 * magnitude))
+
+
+def build_drawing(spec, width, height, font_name="Helvetica"):
+    """Та же диаграмма в виде векторного Drawing ReportLab — без matplotlib и растра"""
+    from reportlab.graphics.shapes import Drawing, String
+    from reportlab.graphics.charts.barcharts import HorizontalBarChart
+
+    label_size = 8
+    title_size = min(spec.title_size or 12, 14)
+    label_width = max([stringWidth(str(l), font_name, label_size) for l in spec.labels] or [0])
+
+    d = Drawing(width, height)
+    chart = HorizontalBarChart()
+    chart.x = min(label_width + 8, width * 0.45)
+    chart.y = 32
+    chart.width = width - chart.x - 20
+    chart.height = height - chart.y - title_size - 16
+    chart.data = [list(spec.values)]
+    chart.bars[0].fillColor = colors.HexColor(spec.color)
+    chart.bars[0].strokeColor = None
+    chart.barSpacing = 2
+
+    chart.categoryAxis.categoryNames = [str(l) for l in spec.labels]
+    chart.categoryAxis.labels.fontName = font_name
+    chart.categoryAxis.labels.fontSize = label_size
+    chart.categoryAxis.labels.boxAnchor = 'e'
+    chart.categoryAxis.labels.dx = -4
+
+    vmax = max(spec.values) if spec.values else 0
+    step = _nice_step(vmax)
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = max(step, math.ceil(vmax * 1.08 / step) * step)
+    chart.valueAxis.valueStep = step
+    chart.valueAxis.labels.fontName = font_name
+    chart.valueAxis.labels.fontSize = label_size
+    chart.valueAxis.labelTextFormat = '%d'
+    chart.valueAxis.visibleGrid = True
+    chart.valueAxis.gridStrokeColor = colors.HexColor("#d1d5db")
+    chart.valueAxis.gridStrokeWidth = 0.5
+
+    if spec.value_labels:
+        chart.barLabelFormat = lambda v: str(int(v)) if v > 0 else ''
+        chart.barLabels.fontName = font_name
+        chart.barLabels.fontSize = label_size
+        chart.barLabels.boxAnchor = 'w'
+        chart.barLabels.dx = 3
+
+    d.add(chart)
+    d.add(String(width / 2, height - title_size - 2, spec.title,
+                 fontName=font_name, fontSize=title_size, textAnchor='middle'))
+    d.add(String(chart.x + chart.width / 2, 4, spec.xlabel,
+                 fontName=font_name, fontSize=9, textAnchor='middle'))
+    return d
+
+
+def chart_flowables(specs, width, height, backend=None, workers=None, font_name="Helvetica", pngs=None):
+    """Готовые flowable для вставки в story — по одному на спецификацию.
+
+    pngs — уже нарисованные PNG (или None) в порядке specs, например из кэша.
+    Для matplotlib рисуются только недостающие, и они дописываются в этот же список.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == "reportlab":
+        return [build_drawing(spec, width, height, font_name) for spec in specs]
+    if backend == "matplotlib":
+        specs = list(specs)
+        if pngs is None:
+            pngs = [None] * len(specs)
+        missing = [i for i, png in enumerate(pngs) if png is None]
+        for i, png in zip(missing, render_charts([specs[i] for i in missing], workers)):
+            pngs[i] = png
+        return [Image(io.BytesIO(png), width=width, height=height) for png in pngs]
+    raise ValueError(f"Неизвестный способ рисования графиков: {backend}. Доступно: {', '.join(BACKENDS)}")
@@ -1,30 +1,25 @@
 # app/reports/detailed_report.py — ФИНАЛЬНАЯ РАБОЧАЯ ВЕРСИЯ (без конфликтов стилей)
 import os
-import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import matplotlib.pyplot as plt
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
-# === Шрифты ===
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-FONT_DIR = os.path.join(BASE_DIR, "fonts")
-FONT_NAME = "DejaVu"
-BOLD_FONT_NAME = "DejaVu-Bold"
-
-if os.path.exists(os.path.join(FONT_DIR, "DejaVuSans.ttf")):
-    pdfmetrics.registerFont(TTFont(FONT_NAME, os.path.join(FONT_DIR, "DejaVuSans.ttf")))
-if os.path.exists(os.path.join(FONT_DIR, "DejaVuSans-Bold.ttf")):
-    pdfmetrics.registerFont(TTFont(BOLD_FONT_NAME, os.path.join(FONT_DIR, "DejaVuSans-Bold.ttf")))
-else:
-    BOLD_FONT_NAME = FONT_NAME
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+
+from . import fonts
+from .charts import ChartSpec, chart_flowables
+from .fragments import LINK_SCHEME, merge_fragments, render_fragment
+from .progress import Progress, ReportCancelled, remove_partial
+from .section_cache import SectionCache, fingerprint
+from .snapshot import ReportSnapshot
+
+# === Шрифты: только имена, TTF загружается при генерации (fonts.register) ===
+FONT_NAME = fonts.font_name("regular")
+BOLD_FONT_NAME = fonts.font_name("bold")
 
 # === Стили с УНИКАЛЬНЫМИ именами ===
 styles = getSampleStyleSheet()
@@ -39,75 +34,276 @@ styles.add(ParagraphStyle(name='DW_CompTitle',  fontName=BOLD_FONT_NAME, fontSiz
 styles.add(ParagraphStyle(name='DW_Section',    fontName=BOLD_FONT_NAME, fontSize=16, spaceBefore=20, spaceAfter=10))
 styles.add(ParagraphStyle(name='DW_Center',     fontName=FONT_NAME,      alignment=TA_CENTER, fontSize=12))
 
+STREAM_CHUNK = 10  # соревнований в одной порции потоковой сборки
+
+
+class StreamingStory(list):
+    """story, которая дочитывает flowable из генератора порций по мере расхода.
+
+    doc.build() забирает flowable с начала списка (del flowables[0]) и
+    проверяет len(flowables) перед каждым шагом — в этот момент, когда
+    список опустел, подгружается следующая порция. Отрисованные разделы
+    больше ни на что не ссылаются и освобождаются.
+    """
+
+    def __init__(self, chunks):
+        super().__init__()
+        self._chunks = iter(chunks)
+
+    def __len__(self):
+        while not list.__len__(self):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self.extend(chunk)
+        return list.__len__(self)
+
+
+def _make_doc(target):
+    return SimpleDocTemplate(target, pagesize=A4,
+                             topMargin=2*cm, bottomMargin=2*cm,
+                             leftMargin=2*cm, rightMargin=2*cm)
+
+
+def _render_sections(job):
+    """Задача процесса-исполнителя: разделы нескольких соревнований отдельным PDF.
+
+    Возвращает часть документа с якорями и PNG графиков (для кэша разделов).
+    """
+    competitions, sections, chart_backend = job
+    fonts.register()
+    report = DetailedReport(chart_backend=chart_backend, chart_workers=1, cache=False)
+    fragment = render_fragment(_make_doc, report._competition_sections(competitions, sections))
+    return fragment, [section['png'] for section in sections]
+
+
+def _section_value(section):
+    """Раздел для JSON-кэша: строки таблиц и параметры графика (PNG — отдельно)"""
+    chart = section['chart']
+    return {'participants': section['participants'], 'tasks': section['tasks'],
+            'chart': chart._asdict() if chart is not None else None}
+
+
+def _section_from_cache(key, fp, value, png):
+    chart = value['chart']
+    if chart is not None:
+        chart = ChartSpec(**dict(chart, figsize=tuple(chart['figsize'])))
+    return {'key': key, 'fp': fp, 'participants': value['participants'], 'tasks': value['tasks'],
+            'chart': chart, 'png': png}
+
+
 class DetailedReport:
-    def __init__(self):
+    def __init__(self, snapshot=None, chart_backend=None, chart_workers=None, cache=True,
+                 stream=False, chunk_size=STREAM_CHUNK, workers=1, on_progress=None, should_cancel=None,
+                 output_dir=None):
         now = datetime.now()
         self.generated_at = now.strftime("%d %B %Y в %H:%M")
-        self.filename = f"Подробный_отчет_{now.strftime('%Y-%m-%d_%H-%M')}.pdf"
-        self.doc = SimpleDocTemplate(self.filename, pagesize=A4,
-                                     topMargin=2*cm, bottomMargin=2*cm,
-                                     leftMargin=2*cm, rightMargin=2*cm)
+        self.filename = os.path.join(output_dir or "", f"Подробный_отчет_{now.strftime('%Y-%m-%d_%H-%M')}.pdf")
+        self.doc = _make_doc(self.filename)
         self.story = []
-        self.temp_files = []
+        self.snapshot = snapshot  # None — прочитать свой срез при генерации
+        self.chart_backend = chart_backend  # None — REPORT_CHART_BACKEND или "reportlab"
+        self.chart_workers = chart_workers  # для matplotlib: None — по числу ядер, 1 — без пула процессов
+        # Потоковая сборка: разделы готовятся и отрисовываются порциями по chunk_size
+        # соревнований, в памяти — только текущая порция. Иначе story собирается целиком
+        self.stream = stream
+        self.chunk_size = chunk_size
+        # Параллельная сборка: разделы порциями по chunk_size строятся в workers процессах
+        # отдельными PDF и склеиваются по порядку (нужен pypdf). 1 — в текущем процессе
+        self.workers = workers
+        # Кэш разделов соревнований: True — каталог по умолчанию (REPORT_CACHE_DIR),
+        # False — без кэша, либо готовый SectionCache
+        self.cache = SectionCache() if cache is True else (cache or None)
+        self._dirty = {}  # ключ раздела -> раздел, ещё не записанный в кэш
+        # on_progress(доля, этап) и should_cancel() — для запуска из GUI, см. progress.py
+        self.progress = Progress(on_progress, should_cancel)
+        self._done = self._total = 0  # разделов соревнований готово / всего
 
     def generate(self):
-        from database.database import get_connection
-        conn = get_connection()
-        if not conn:
-            self.story.append(Paragraph("Ошибка подключения к БД", styles['DW_Center']))
-            self.doc.build(self.story)
+        fonts.register()
+        existed = os.path.exists(self.filename)
+        try:
+            self.progress(0.0, "Чтение данных")
+            snapshot = self.snapshot
+            if snapshot is None:
+                try:
+                    snapshot = ReportSnapshot.load(decisions=True)
+                except Exception as e:
+                    print(f"Не удалось подключиться к БД: {e}")
+                    self.story.append(Paragraph("Ошибка подключения к БД", styles['DW_Center']))
+                    self.doc.build(self.story)
+                    return
+            self._build(snapshot)
+        except ReportCancelled:
+            remove_partial(self.filename, existed)
+            raise
+        print(f"Подробный отчёт успешно создан: {os.path.abspath(self.filename)}")
+
+    def _section(self, snapshot, comp):
+        """Данные раздела соревнования: строки таблиц и график.
+
+        Если исходные строки раздела не изменились с прошлого запуска,
+        раздел (вместе с уже нарисованным PNG) берётся из кэша.
+        """
+        key, fp = f"comp_{comp['id']}", None
+        if self.cache:
+            fp = fingerprint(snapshot.section_rows(comp))
+            cached = self.cache.get(key, fp)
+            if cached is not None:
+                return _section_from_cache(key, fp, *cached)
+
+        participants = [[p['Place_in_the_leaderboard'] or "—", p['FCs'], p['Specialization'] or "—"]
+                        for p in snapshot.participants(comp['id'])]
+        tasks, oks = [], []
+        task_stats = snapshot.competition_task_stats(comp['id'])
+        for t in task_stats:
+            ok = t['ok'] or 0
+            err = t['err'] or 0
+            tasks.append([t['letter'] or "—", str(t['id']), str(t['points']), str(t['complexity']), str(ok), str(err), str(ok + err)])
+            oks.append(ok)
+        chart = None
+        if oks and sum(oks) > 0:
+            chart = ChartSpec(
+                labels=[t['letter'] or f"Задача {i+1}" for i, t in enumerate(task_stats)],
+                values=oks,
+                title=f"Решённые задачи — {comp['title'] or 'Без названия'}",
+                xlabel="Количество участников",
+                color='#10b981',
+                figsize=(10, max(4, len(oks)*0.6)),
+                dpi=200,
+            )
+        section = {'key': key, 'fp': fp, 'participants': participants, 'tasks': tasks, 'chart': chart, 'png': None}
+        if self.cache:
+            self._dirty[key] = section
+        return section
+
+    def _save_cache(self):
+        if not self.cache:
             return
-        cur = conn.cursor(dictionary=True)
+        for section in self._dirty.values():
+            self.cache.put(section['key'], section['fp'], _section_value(section), section['png'])
+        self._dirty.clear()
+
+    def _build(self, snapshot):
+        self._done, self._total = 0, len(snapshot.competitions)
+        if self.workers and self.workers > 1:
+            self._build_parallel(snapshot)
+        else:
+            chunks = self._story_chunks(snapshot)
+            self.story = StreamingStory(chunks) if self.stream else [f for chunk in chunks for f in chunk]
+            if not self.stream:
+                self.progress(0.9, "Сборка PDF")
+            self.doc.setProgressCallBack(self.progress.doc_callback)
+            self.doc.build(self.story)
+        self.progress(1.0, "Готово")
+
+        if self.cache:
+            self.cache.prune(f"comp_{comp['id']}" for comp in snapshot.competitions)
+            stats = self.cache.stats()
+            print(f"Кэш разделов: из кэша {stats['hits']}, собрано заново {stats['misses']}")
+
+    def _build_parallel(self, snapshot):
+        """Разделы — в пуле процессов, титул и итоги — здесь же, затем склейка.
+
+        Каждый раздел начинается с новой страницы, поэтому разбиение документа
+        на части по границам разделов не меняет ни одной страницы.
+        """
+        competitions = snapshot.competitions
+        sections = [self._section(snapshot, comp) for comp in competitions]
+        size = max(1, self.chunk_size)
+        jobs = [(competitions[i:i + size], sections[i:i + size], self.chart_backend)
+                for i in range(0, len(competitions), size)]
+
+        pool = ProcessPoolExecutor(max_workers=min(self.workers, max(1, len(jobs))))
+        try:
+            results = pool.map(_render_sections, jobs)
+            front = render_fragment(_make_doc, self._front_matter(competitions, LINK_SCHEME))
+            final = render_fragment(_make_doc, self._final_stats(snapshot))
+            fragments = [front]
+            for (_, chunk, _), (fragment, pngs) in zip(jobs, results):
+                fragments.append(fragment)
+                for section, png in zip(chunk, pngs):
+                    if self.cache and png is not None and section['png'] is None:
+                        section['png'] = png
+                        self._dirty[section['key']] = section
+                self._done += len(chunk)
+                self.progress(0.05 + 0.85 * self._done / max(1, self._total),
+                              f"Соревнование {self._done} из {self._total}")
+            fragments.append(final)
+        finally:
+            # при отмене не ждём порции, которые ещё не начались
+            pool.shutdown(cancel_futures=True)
+        self._save_cache()
+        self.progress(0.9, "Склейка PDF")
+        merge_fragments(fragments, self.filename)
+
+    def _story_chunks(self, snapshot):
+        """Порции story: титул с содержанием, разделы соревнований, итоговая статистика.
 
+        Ссылки содержания (#comp_<id>, #final_stats) — именованные назначения PDF,
+        они разрешаются при сохранении файла, поэтому работают и при потоковой сборке.
+        """
+        competitions = snapshot.competitions
+        yield self._front_matter(competitions)
+        size = self.chunk_size if self.stream else len(competitions)
+        for start in range(0, len(competitions), max(1, size)):
+            chunk = competitions[start:start + size]
+            yield self._competition_sections(chunk, [self._section(snapshot, comp) for comp in chunk])
+        yield self._final_stats(snapshot)
+
+    def _front_matter(self, competitions, link_prefix="#"):
+        story = []
         # === Титульная страница ===
-        self.story.append(Spacer(1, 6*cm))
-        self.story.append(Paragraph("ПОДРОБНЫЙ ОТЧЁТ", styles['DW_Title']))
-        self.story.append(Paragraph("по всем соревнованиям по программированию", styles['DW_SubTitle']))
-        self.story.append(Paragraph(f"Сформирован: {self.generated_at}", styles['DW_DateTime']))
-        self.story.append(Paragraph(
+        story.append(Spacer(1, 6*cm))
+        story.append(Paragraph("ПОДРОБНЫЙ ОТЧЁТ", styles['DW_Title']))
+        story.append(Paragraph("по всем соревнованиям по программированию", styles['DW_SubTitle']))
+        story.append(Paragraph(f"Сформирован: {self.generated_at}", styles['DW_DateTime']))
+        story.append(Paragraph(
             "Данный отчёт содержит полную информацию о проведённых соревнованиях, список участников, "
             "статистику по задачам, результаты решений и общий рейтинг лидеров. "
             "Все данные актуальны на момент генерации отчёта.",
             styles['DW_Desc']
         ))
-        self.story.append(Paragraph("Система DataWise © 2025", styles['DW_Center']))
-        self.story.append(PageBreak())
+        story.append(Paragraph("Система DataWise © 2025", styles['DW_Center']))
+        story.append(PageBreak())
 
         # === Содержание ===
-        self.story.append(Paragraph("СОДЕРЖАНИЕ", styles['DW_TOC_Title']))
-        self.story.append(Spacer(1, 20))
-
-        cur.execute("SELECT id, title FROM competition ORDER BY date_of_the_event DESC")
-        competitions = cur.fetchall()
+        story.append(Paragraph("СОДЕРЖАНИЕ", styles['DW_TOC_Title']))
+        story.append(Spacer(1, 20))
 
         for comp in competitions:
             title = comp['title'] or f"Соревнование #{comp['id']}"
-            self.story.append(Paragraph(
-                f"• <a href=\"#comp_{comp['id']}\" color=\"#1e40af\"><b>{title}</b></a>",
+            story.append(Paragraph(
+                f"• <a href=\"{link_prefix}comp_{comp['id']}\" color=\"#1e40af\"><b>{title}</b></a>",
                 styles['DW_TOC_Item']
             ))
-        self.story.append(Paragraph(
-            "• <a href=\"#final_stats\" color=\"#1e40af\"><b>Итоговая статистика и рейтинг</b></a>",
+        story.append(Paragraph(
+            f"• <a href=\"{link_prefix}final_stats\" color=\"#1e40af\"><b>Итоговая статистика и рейтинг</b></a>",
             styles['DW_TOC_Item']
         ))
-        self.story.append(PageBreak())
+        story.append(PageBreak())
+        return story
 
+    def _competition_sections(self, competitions, sections):
+        story = []
+        chart_slots = []  # (позиция в story, раздел) — графики порции рисуются одним этапом
         # === По каждому соревнованию ===
-        for comp in competitions:
+        for comp, section in zip(competitions, sections):
             comp_id = comp['id']
             title = comp['title'] or "Без названия"
+            self.progress(0.05 + 0.85 * self._done / max(1, self._total),
+                          f"Соревнование {self._done + 1} из {self._total}: {title}")
+            self._done += 1
 
-            self.story.append(Paragraph(f"<a name=\"comp_{comp_id}\"/>", styles['DW_Center']))
-            self.story.append(Paragraph(title, styles['DW_CompTitle']))
-            self.story.append(Spacer(1, 12))
+            story.append(Paragraph(f"<a name=\"comp_{comp_id}\"/>", styles['DW_Center']))
+            story.append(Paragraph(title, styles['DW_CompTitle']))
+            story.append(Spacer(1, 12))
 
-            cur.execute("SELECT * FROM competition WHERE id = %s", (comp_id,))
-            c = cur.fetchone()
             info = [
-                ["Дата начала", c['date_of_the_event'].strftime('%d.%m.%Y')],
-                ["Дата окончания", c['end_date'].strftime('%d.%m.%Y') if c['end_date'] else "—"],
-                ["Количество задач", str(c['number_of_tasks'])],
-                ["Описание", c['description'] or "—"],
+                ["Дата начала", comp['date_of_the_event'].strftime('%d.%m.%Y')],
+                ["Дата окончания", comp['end_date'].strftime('%d.%m.%Y') if comp['end_date'] else "—"],
+                ["Количество задач", str(comp['number_of_tasks'])],
+                ["Описание", comp['description'] or "—"],
             ]
             t = Table(info, colWidths=[150, 350])
             t.setStyle(TableStyle([
@@ -117,24 +313,13 @@ class DetailedReport:
                 ('LEFTPADDING', (0,0), (-1,-1), 12),
                 ('FONTSIZE', (0,0), (-1,-1), 12),
             ]))
-            self.story.append(t)
-            self.story.append(Spacer(1, 30))
+            story.append(t)
+            story.append(Spacer(1, 30))
 
             # Участники
-            cur.execute("""
-                SELECT u.FCs, u.Specialization, p.Place_in_the_leaderboard
-                FROM participation p
-                JOIN users u ON p.id_users = u.id
-                WHERE p.id_competition = %s
-                ORDER BY COALESCE(p.Place_in_the_leaderboard, 9999)
-            """, (comp_id,))
-            self.story.append(Paragraph("УЧАСТНИКИ", styles['DW_Section']))
-            participants = cur.fetchall()
-            if participants:
-                data = [["Место", "ФИО", "Специализация"]]
-                for p in participants:
-                    place = p['Place_in_the_leaderboard'] or "—"
-                    data.append([place, p['FCs'], p['Specialization'] or "—"])
+            story.append(Paragraph("УЧАСТНИКИ", styles['DW_Section']))
+            if section['participants']:
+                data = [["Место", "ФИО", "Специализация"]] + section['participants']
                 pt = Table(data, colWidths=[80, 280, 140])
                 pt.setStyle(TableStyle([
                     ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#1e293b")),
@@ -142,36 +327,15 @@ class DetailedReport:
                     ('GRID', (0,0), (-1,-1), 0.8, colors.grey),
                     ('FONTNAME', (0,0), (-1,-1), FONT_NAME),
                 ]))
-                self.story.append(pt)
+                story.append(pt)
             else:
-                self.story.append(Paragraph("Участников нет", styles['DW_Center']))
-            self.story.append(Spacer(1, 30))
+                story.append(Paragraph("Участников нет", styles['DW_Center']))
+            story.append(Spacer(1, 30))
 
             # Задачи и статистика
-            self.story.append(Paragraph("ЗАДАЧИ И СТАТИСТИКА РЕШЕНИЙ", styles['DW_Section']))
-            cur.execute("""
-                SELECT pt.id, pt.points, pt.complexity, ct.letter,
-                       COUNT(CASE WHEN d.status = 'OK' THEN 1 END) AS ok,
-                       COUNT(CASE WHEN d.status != 'OK' AND d.status IS NOT NULL THEN 1 END) AS err
-                FROM competition_tasks ct
-                JOIN programming_tasks pt ON ct.task_id = pt.id
-                LEFT JOIN decisions d ON pt.id = d.id_programminng_tasks
-                    AND d.id_users IN (SELECT id_users FROM participation WHERE id_competition = %s)
-                WHERE ct.competition_id = %s
-                GROUP BY pt.id, ct.letter
-                ORDER BY ct.letter
-            """, (comp_id, comp_id))
-            tasks = cur.fetchall()
-
-            if tasks:
-                data = [["Буква", "Задача", "Баллы", "Сложность", "OK", "Ошибка", "Всего"]]
-                oks = []
-                for t in tasks:
-                    ok = t['ok'] or 0
-                    err = t['err'] or 0
-                    total = ok + err
-                    data.append([t['letter'] or "—", str(t['id']), str(t['points']), str(t['complexity']), str(ok), str(err), str(total)])
-                    oks.append(ok)
+            story.append(Paragraph("ЗАДАЧИ И СТАТИСТИКА РЕШЕНИЙ", styles['DW_Section']))
+            if section['tasks']:
+                data = [["Буква", "Задача", "Баллы", "Сложность", "OK", "Ошибка", "Всего"]] + section['tasks']
                 table = Table(data, colWidths=[60, 80, 70, 90, 70, 80, 80])
                 table.setStyle(TableStyle([
                     ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#1e40af")),
@@ -179,43 +343,44 @@ class DetailedReport:
                     ('GRID', (0,0), (-1,-1), 1, colors.lightgrey),
                     ('FONTNAME', (0,0), (-1,-1), FONT_NAME),
                 ]))
-                self.story.append(table)
-
-                if oks and sum(oks) > 0:
-                    plt.figure(figsize=(10, max(4, len(oks)*0.6)))
-                    plt.barh(range(len(oks)), oks, color='#10b981')
-                    plt.yticks(range(len(oks)), [t['letter'] or f"Задача {i+1}" for i, t in enumerate(tasks)])
-                    plt.title(f"Решённые задачи — {title}")
-                    plt.xlabel("Количество участников")
-                    plt.grid(axis='x', alpha=0.3)
-                    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-                    plt.savefig(tmp.name, dpi=200, bbox_inches='tight')
-                    plt.close()
-                    self.temp_files.append(tmp.name)
-                    self.story.append(Spacer(1, 20))
-                    self.story.append(Image(tmp.name, width=500, height=300))
+                story.append(table)
+
+                if section['chart']:
+                    story.append(Spacer(1, 20))
+                    chart_slots.append((len(story), section))
+                    story.append(None)  # место под график
             else:
-                self.story.append(Paragraph("Задачи не назначены", styles['DW_Center']))
-            self.story.append(PageBreak())
+                story.append(Paragraph("Задачи не назначены", styles['DW_Center']))
+            story.append(PageBreak())
+
+        # === Графики: все сразу (растровые — в пуле процессов, PNG в памяти) ===
+        # Уже нарисованные PNG берутся из кэша разделов, новые — запоминаются в разделе
+        # (и без своего кэша: процесс-исполнитель возвращает их родителю, см. _render_sections)
+        sections = [section for _, section in chart_slots]
+        pngs = [section['png'] for section in sections]
+        charts = chart_flowables([section['chart'] for section in sections], 500, 300,
+                                 self.chart_backend, self.chart_workers, FONT_NAME, pngs)
+        for (pos, section), chart, png in zip(chart_slots, charts, pngs):
+            story[pos] = chart
+            if png is not None and section['png'] is None:
+                section['png'] = png
+                if self.cache:
+                    self._dirty[section['key']] = section
+        self._save_cache()
+        return story
 
+    def _final_stats(self, snapshot):
+        story = []
         # === Итоговая статистика ===
-        self.story.append(Paragraph("<a name=\"final_stats\"/>", styles['DW_Center']))
-        self.story.append(Paragraph("ИТОГОВАЯ СТАТИСТИКА И РЕЙТИНГ", styles['DW_CompTitle']))
-        self.story.append(Spacer(1, 30))
-
-        cur.execute("""
-            SELECT u.FCs, COUNT(*) as solved
-            FROM decisions d
-            JOIN users u ON d.id_users = u.id
-            WHERE d.status = 'OK'
-            GROUP BY u.id, u.FCs
-            ORDER BY solved DESC LIMIT 15
-        """)
-        top15 = cur.fetchall()
+        story.append(Paragraph("<a name=\"final_stats\"/>", styles['DW_Center']))
+        story.append(Paragraph("ИТОГОВАЯ СТАТИСТИКА И РЕЙТИНГ", styles['DW_CompTitle']))
+        story.append(Spacer(1, 30))
+
+        top15 = snapshot.top_solvers(15)
         if top15:
             data = [["№", "Участник", "Решено задач"]]
-            for i, row in enumerate(top15, 1):
-                data.append([str(i), row['FCs'], str(row['solved'])])
+            for i, (name, solved) in enumerate(top15, 1):
+                data.append([str(i), name, str(solved)])
             t = Table(data, colWidths=[60, 350, 120])
             t.setStyle(TableStyle([
                 ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#1e293b")),
@@ -223,18 +388,9 @@ class DetailedReport:
                 ('GRID', (0,0), (-1,-1), 1, colors.grey),
                 ('FONTNAME', (0,0), (-1,-1), FONT_NAME),
             ]))
-            self.story.append(t)
-
-        self.story.append(Spacer(1, 40))
-        self.story.append(Paragraph(f"Отчёт сформирован {self.generated_at}", styles['DW_Center']))
-        self.story.append(Paragraph("© DataWise 2025", styles['DW_Center']))
-
-        self.doc.build(self.story)
+            story.append(t)
 
-        for f in self.temp_files:
-            try: os.remove(f)
-            except: pass
-
-        cur.close()
-        conn.close()
-        print(f"Подробный отчёт успешно создан: {os.path.abspath(self.filename)}")
+        story.append(Spacer(1, 40))
+        story.append(Paragraph(f"Отчёт сформирован {self.generated_at}", styles['DW_Center']))
+        story.append(Paragraph("© DataWise 2025", styles['DW_Center']))
+        return story
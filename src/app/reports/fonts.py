@@ -0,0 +1,81 @@
+# app/reports/fonts.py — шрифты PDF-отчётов: одна регистрация на процесс
+import os
+import threading
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "fonts")
+
+# начертание -> (имя в ReportLab, файл в src/fonts, замена, если файла нет)
+FACES = {
+    "regular": ("DejaVu", "DejaVuSans.ttf", "Helvetica"),
+    "bold": ("DejaVu-Bold", "DejaVuSans-Bold.ttf", "Helvetica-Bold"),
+}
+
+# Символы, которые в каждой части параллельного отчёта получают одни и те же
+# коды (см. prime): ASCII, кириллица и типографские знаки, затем — чем
+# дополнить первое подмножество шрифта до 256 кодов
+BASE_CHARS = ("".join(map(chr, range(32, 127))) + "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+              "абвгдеёжзийклмнопрстуфхцчшщъыьэюя" + "№«»—–…°•·±×")
+FILL_CHARS = "".join(map(chr, list(range(0xA1, 0x180)) + list(range(0x400, 0x460))))
+SUBSET_SIZE = 256  # столько кодов в одном подмножестве TTF у ReportLab
+
+_lock = threading.RLock()  # font_name вызывается и внутри register
+_names = {}         # начертание -> выбранное имя шрифта
+_registered = set()  # имена TTF, уже разобранных в этом процессе
+
+
+def font_name(face="regular"):
+    """Имя шрифта для стилей. Файл только проверяется на наличие, TTF не читается"""
+    with _lock:
+        if face not in _names:
+            name, filename, fallback = FACES[face]
+            _names[face] = name if os.path.exists(os.path.join(FONT_DIR, filename)) else fallback
+        return _names[face]
+
+
+def register(*faces):
+    """Зарегистрировать начертания в ReportLab (по умолчанию все) и вернуть их имена.
+
+    TTF разбирается один раз на процесс; метрики глифов после этого живут
+    в реестре pdfmetrics и используются всеми отчётами и диаграммами.
+    Повторные вызовы почти ничего не стоят — их можно делать в начале
+    каждой генерации, в том числе в процессах-исполнителях.
+    """
+    faces = faces or tuple(FACES)
+    files = {name: filename for name, filename, _ in FACES.values()}
+    with _lock:
+        for face in faces:
+            name = font_name(face)
+            if name in _registered or name not in files:
+                continue  # уже разобран или встроенный шрифт PDF (Helvetica)
+            pdfmetrics.registerFont(TTFont(name, os.path.join(FONT_DIR, files[name])))
+            _registered.add(name)
+    return tuple(font_name(face) for face in faces)
+
+
+def prime(pdf_doc):
+    """Занять первое подмножество каждого TTF одинаковым набором символов.
+
+    ReportLab раздаёт коды символам в порядке появления в документе, поэтому
+    части, построенные отдельно, встраивают разные подмножества одного шрифта
+    и при склейке их нельзя объединить. После prime первое подмножество во
+    всех частях совпадает байт в байт; редкие символы уходят в следующие.
+    Шрифт при этом встраивается, даже если в части не используется.
+    pdf_doc — PDFDocument холста (canvas._doc) до отрисовки первой страницы.
+    """
+    with _lock:
+        fonts = [pdfmetrics.getFont(name) for name in sorted(_registered)]
+    for font in fonts:
+        font.splitString(BASE_CHARS, pdf_doc)
+        for ch in FILL_CHARS:
+            if font.state[pdf_doc].nextCode >= SUBSET_SIZE:
+                break
+            font.splitString(ch, pdf_doc)
+        font.getSubsetInternalName(0, pdf_doc)  # и внутренние имена /F1, /F2 — в одном порядке
+
+
+def registered():
+    """Имена TTF-шрифтов, уже загруженных в этом процессе"""
+    return sorted(_registered)
@@ -0,0 +1,77 @@
+# app/reports/fragments.py — сборка PDF из независимо построенных частей
+import io
+import re
+
+from . import fonts
+
+# Ссылка на якорь в другой части: <a href="fragment:comp_5">. ReportLab
+# записывает её как обычную URI-ссылку, после склейки она заменяется
+# переходом к месту якоря <a name="comp_5"/> на его странице
+LINK_SCHEME = "fragment:"
+ANCHOR_RE = re.compile(r'<a name="(\w+)"/>')
+MERGE_PASSES = 3  # глубина шрифта в PDF: Font -> FontDescriptor -> FontFile2
+
+
+def render_fragment(make_doc, story):
+    """Построить часть документа в памяти.
+
+    make_doc(буфер) должна вернуть DocTemplate с теми же настройками страницы,
+    что и у целого отчёта. Результат — (PDF в байтах, {якорь: (номер страницы, y верха якоря)}).
+    """
+    buf = io.BytesIO()
+    doc = make_doc(buf)
+    anchors = {}
+
+    def after_flowable(flowable):
+        match = ANCHOR_RE.match(getattr(flowable, 'text', '') or '')
+        if match:
+            # frame._y — низ уже размещённого flowable за вычетом отступа после него
+            top = doc.frame._y + flowable.getSpaceAfter() + flowable.height
+            anchors[match.group(1)] = (doc.page - 1, top)
+
+    doc.afterFlowable = after_flowable
+    # одинаковые подмножества шрифтов во всех частях — при склейке останется одна копия
+    doc.beforeDocument = lambda: fonts.prime(doc.canv._doc)
+    doc.build(story)
+    return buf.getvalue(), anchors
+
+
+def merge_fragments(fragments, filename):
+    """Склеить части [(PDF, якоря), ...] по порядку и проставить межчастные ссылки"""
+    try:
+        from pypdf import PdfReader, PdfWriter
+        from pypdf.generic import ArrayObject, FloatObject, NameObject, NullObject, NumberObject
+    except ImportError:
+        raise RuntimeError("Для параллельной сборки отчёта нужен пакет pypdf (pip install pypdf)")
+
+    writer = PdfWriter()
+    anchors = {}
+    for pdf, fragment_anchors in fragments:
+        start = len(writer.pages)
+        writer.append(PdfReader(io.BytesIO(pdf)))
+        anchors.update({name: (start + page, top) for name, (page, top) in fragment_anchors.items()})
+
+    for page in writer.pages:
+        for annot in page.get('/Annots') or []:
+            annot = annot.get_object()
+            action = annot.get('/A')
+            uri = action.get_object().get('/URI') if action else None
+            if not uri or not uri.startswith(LINK_SCHEME):
+                continue
+            name = uri[len(LINK_SCHEME):]
+            if name not in anchors:
+                raise ValueError(f"Ссылка на несуществующий якорь: {name}")
+            page_index, top = anchors[name]
+            del annot['/A']
+            annot[NameObject('/Dest')] = ArrayObject([
+                writer.pages[page_index].indirect_reference, NameObject('/XYZ'), NullObject(),
+                FloatObject(float(top)), NumberObject(0),
+            ])
+
+    # шрифты (после fonts.prime) и прочие совпадающие объекты частей — по одной копии.
+    # Объекты сравниваются вместе со ссылками, поэтому за проход склеивается один
+    # уровень: файл шрифта, затем его описание, затем сам шрифт
+    for _ in range(MERGE_PASSES):
+        writer.compress_identical_objects()
+    with open(filename, 'wb') as f:
+        writer.write(f)
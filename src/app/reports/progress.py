@@ -0,0 +1,43 @@
+# app/reports/progress.py — ход генерации отчёта и отмена
+import os
+
+
+class ReportCancelled(Exception):
+    """Генерация отчёта отменена; недописанный файл удалён"""
+
+
+class Progress:
+    """Связь отчёта с вызывающим кодом.
+
+    on_progress(доля 0..1, этап) получает ход работы, should_cancel() → True
+    означает «пора остановиться»: в ближайшей точке хода поднимается
+    ReportCancelled. Без колбэков ничего не делает — отчёты по-прежнему
+    можно запускать из консоли.
+    """
+
+    def __init__(self, on_progress=None, should_cancel=None):
+        self.on_progress = on_progress
+        self.should_cancel = should_cancel
+
+    def __call__(self, fraction, phase):
+        self.check()
+        if self.on_progress:
+            self.on_progress(min(1.0, max(0.0, fraction)), phase)
+
+    def check(self):
+        if self.should_cancel and self.should_cancel():
+            raise ReportCancelled("Генерация отчёта отменена")
+
+    def doc_callback(self, kind, value):
+        """Для doc.setProgressCallBack: отмена проверяется и на каждой странице сборки PDF"""
+        if kind == 'PAGE':
+            self.check()
+
+
+def remove_partial(filename, existed):
+    """Удалить файл, если его создала прерванная генерация (старый отчёт не трогаем)"""
+    if not existed and os.path.exists(filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
@@ -0,0 +1,98 @@
+# app/reports/section_cache.py — дисковый кэш разделов подробного отчёта
+#
+# Формат — JSON и сырые байты PNG, а не pickle: каталог REPORT_CACHE_DIR
+# может быть общим, и чтение чужого файла не должно выполнять код.
+import hashlib
+import json
+import os
+import tempfile
+
+# Версия формата: увеличивать при изменении содержимого раздела или вида графиков
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = os.getenv(
+    "REPORT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "datawise", "reports"),
+)
+
+
+def fingerprint(rows):
+    """Отпечаток исходных строк раздела. repr стабилен для кортежей, чисел, строк и дат"""
+    return hashlib.sha256(repr((CACHE_VERSION, rows)).encode("utf-8")).hexdigest()
+
+
+class SectionCache:
+    """Подготовленные данные разделов: <ключ>.json и, если есть, <ключ>.png.
+
+    Запись хранится вместе с отпечатком исходных строк; если отпечаток
+    не совпал — раздел считается изменившимся и собирается заново.
+    PNG проверяется по хешу из JSON: не совпал — запись без картинки.
+    Повреждённый или недоступный файл — просто промах, а не ошибка отчёта.
+    """
+
+    def __init__(self, directory=None, namespace="detailed"):
+        self.directory = os.path.join(directory or DEFAULT_CACHE_DIR, namespace)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    def get(self, key, fp):
+        """(значение, байты PNG или None) либо None при промахе"""
+        try:
+            with open(self._path(key, "json"), encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception:
+            entry = None
+        if (not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION
+                or entry.get("fingerprint") != fp):
+            self.misses += 1
+            return None
+        blob = None
+        if entry.get("blob"):
+            try:
+                with open(self._path(key, "png"), "rb") as f:
+                    blob = f.read()
+            except OSError:
+                blob = None
+            if blob is not None and hashlib.sha256(blob).hexdigest() != entry["blob"]:
+                blob = None
+        self.hits += 1
+        return entry.get("value"), blob
+
+    def _write(self, path, data):
+        """Атомарная запись: сначала во временный файл, затем os.replace"""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def put(self, key, fp, value, blob=None):
+        """value — данные для JSON, blob — байты PNG графика раздела"""
+        entry = {"version": CACHE_VERSION, "fingerprint": fp, "value": value,
+                 "blob": hashlib.sha256(blob).hexdigest() if blob is not None else None}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if blob is not None:
+                self._write(self._path(key, "png"), blob)
+            self._write(self._path(key, "json"), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Не удалось записать кэш раздела {key}: {e}")
+
+    def prune(self, keep):
+        """Удалить записи разделов, которых больше нет в отчёте (и файлы старого формата)"""
+        keep = set(keep)
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            key, ext = os.path.splitext(name)
+            if ext == ".pickle" or (ext in (".json", ".png") and key not in keep):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
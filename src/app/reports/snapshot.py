@@ -0,0 +1,205 @@
+# app/reports/snapshot.py — согласованный срез данных для всех отчётов
+from collections import defaultdict
+
+USERS_QUERY = "SELECT id, FCs, Specialization FROM users"
+
+COMPETITIONS_QUERY = """
+SELECT id, title, description, date_of_the_event, end_date, number_of_tasks
+FROM competition
+ORDER BY date_of_the_event DESC
+"""
+
+TASKS_QUERY = "SELECT id, points, complexity FROM programming_tasks"
+
+COMPETITION_TASKS_QUERY = "SELECT competition_id, task_id, letter FROM competition_tasks ORDER BY competition_id, task_id"
+
+PARTICIPATION_QUERY = """
+SELECT id, id_competition, id_users, Place_in_the_leaderboard
+FROM participation
+ORDER BY id
+"""
+
+# Решения по паре (участник, задача) — полный GROUP BY по decisions. Нужны только
+# разделам подробного отчёта, поэтому читаются по требованию (load(decisions=True)
+# или при первом обращении к snapshot.decisions); итоги и рейтинги берутся из сводки
+DECISION_TOTALS_QUERY = """
+SELECT id_users, id_programminng_tasks,
+       COUNT(CASE WHEN status = 'OK' THEN 1 END) AS ok,
+       COUNT(CASE WHEN status != 'OK' AND status IS NOT NULL THEN 1 END) AS err
+FROM decisions
+GROUP BY id_users, id_programminng_tasks
+"""
+
+# Рейтинги — из сводки, которую поддерживает database/mutations.py
+SOLVE_SUMMARY_QUERY = "SELECT id_users, solved, attempts, points FROM user_solve_summary"
+
+
+def _decision_totals(cur):
+    cur.execute(DECISION_TOTALS_QUERY)
+    return {(uid, tid): (ok, err) for uid, tid, ok, err in cur.fetchall()}
+
+
+class ReportSnapshot:
+    """Данные для отчётов, прочитанные одной транзакцией с согласованным чтением.
+
+    Все таблицы загружаются один раз, после чего любое число отчётов
+    строится из памяти и видит одни и те же цифры:
+
+        snapshot = ReportSnapshot.load(decisions=True)
+        DetailedReport(snapshot=snapshot).generate()
+        StatsReport(snapshot=snapshot).generate()
+
+    Решения по паре участник/задача нужны только подробному отчёту: без
+    decisions=True они читаются отдельным запросом при первом обращении
+    к snapshot.decisions (уже вне общей транзакции).
+    """
+
+    def __init__(self, users, competitions, tasks, competition_tasks, participation, decisions=None, summary=None):
+        self.users = users                          # id -> (ФИО, специализация)
+        self.competitions = competitions            # [dict], по убыванию даты начала
+        self.tasks = tasks                          # id -> (баллы, сложность)
+        self.competition_tasks = competition_tasks  # id соревнования -> [(id задачи, буква)]
+        self.participation = participation          # id соревнования -> [(id участника, место)]
+        self._decisions = decisions                 # (id участника, id задачи) -> (ok, err); None — не прочитаны
+        self.summary = summary                      # id участника -> (решено, попыток, баллы) или None
+        self._solved = None
+
+    @classmethod
+    def load(cls, conn=None, decisions=False):
+        """Прочитать срез. Без conn — соединение для чтения (пул или локальная копия).
+        decisions=True — сразу и решения по паре участник/задача, в той же транзакции"""
+        if conn is None:
+            from database.database import connection
+            with connection(read_only=True) as conn:
+                return cls.load(conn, decisions)
+
+        conn.start_transaction(consistent_snapshot=True, isolation_level='REPEATABLE READ', readonly=True)
+        try:
+            cur = conn.cursor()
+            cur.execute(USERS_QUERY)
+            users = {uid: (name, spec) for uid, name, spec in cur.fetchall()}
+
+            cur.execute(COMPETITIONS_QUERY)
+            columns = cur.column_names
+            competitions = [dict(zip(columns, row)) for row in cur.fetchall()]
+
+            cur.execute(TASKS_QUERY)
+            tasks = {tid: (points, complexity) for tid, points, complexity in cur.fetchall()}
+
+            competition_tasks = defaultdict(list)
+            cur.execute(COMPETITION_TASKS_QUERY)
+            for comp_id, task_id, letter in cur.fetchall():
+                competition_tasks[comp_id].append((task_id, letter))
+
+            participation = defaultdict(list)
+            cur.execute(PARTICIPATION_QUERY)
+            for _, comp_id, user_id, place in cur.fetchall():
+                participation[comp_id].append((user_id, place))
+
+            if decisions:
+                decisions = _decision_totals(cur)
+            else:
+                decisions = None
+
+            try:
+                cur.execute(SOLVE_SUMMARY_QUERY)
+                summary = {uid: (solved, attempts, points) for uid, solved, attempts, points in cur.fetchall()}
+            except Exception:
+                summary = None  # сводка ещё не создана (python -m database.summary --rebuild)
+            cur.close()
+        finally:
+            conn.commit()
+        return cls(users, competitions, tasks, competition_tasks, participation, decisions, summary)
+
+    @property
+    def decisions(self):
+        """(id участника, id задачи) -> (ok, err); при первом обращении читается из БД"""
+        if self._decisions is None:
+            from database.database import connection
+            with connection(read_only=True) as conn:
+                cur = conn.cursor()
+                try:
+                    self._decisions = _decision_totals(cur)
+                finally:
+                    cur.close()
+        return self._decisions
+
+    # --- сводные цифры ---
+    def counts(self):
+        if self.summary is not None:
+            decisions = sum(attempts for _, attempts, _ in self.summary.values())
+            ok_decisions = sum(solved for solved, _, _ in self.summary.values())
+        else:
+            decisions = sum(ok + err for ok, err in self.decisions.values())
+            ok_decisions = sum(ok for ok, _ in self.decisions.values())
+        return {
+            'competitions': len(self.competitions),
+            'users': len(self.users),
+            'tasks': len(self.tasks),
+            'decisions': decisions,
+            'ok_decisions': ok_decisions,
+        }
+
+    def solved_by_user(self):
+        """id участника -> число решений со статусом OK"""
+        if self._solved is None and self.summary is not None:
+            self._solved = {uid: solved for uid, (solved, _, _) in self.summary.items()}
+        if self._solved is None:
+            solved = defaultdict(int)
+            for (uid, _), (ok, _) in self.decisions.items():
+                solved[uid] += ok
+            self._solved = dict(solved)
+        return self._solved
+
+    def top_solvers(self, limit, include_zero=False):
+        """[(ФИО, решено)] по убыванию решённого, при равенстве — по ФИО"""
+        solved = self.solved_by_user()
+        rows = [(name, solved.get(uid, 0)) for uid, (name, _) in self.users.items()
+                if name is not None and (include_zero or solved.get(uid, 0) > 0)]
+        rows.sort(key=lambda r: (-r[1], r[0]))
+        return rows[:limit]
+
+    # --- по соревнованию ---
+    def participants(self, comp_id):
+        """Участники соревнования по месту в таблице лидеров (без места — в конце)"""
+        rows = [(place if place is not None else 9999, i, uid, place)
+                for i, (uid, place) in enumerate(self.participation.get(comp_id, []))
+                if uid in self.users]
+        rows.sort()
+        return [{'FCs': self.users[uid][0], 'Specialization': self.users[uid][1],
+                 'Place_in_the_leaderboard': place} for _, _, uid, place in rows]
+
+    def section_rows(self, comp):
+        """Все исходные строки, от которых зависит раздел соревнования, — для отпечатка"""
+        comp_id = comp['id']
+        participation = tuple(self.participation.get(comp_id, []))
+        tasks = tuple((task_id, letter, self.tasks.get(task_id))
+                      for task_id, letter in self.competition_tasks.get(comp_id, []))
+        users = {uid for uid, _ in participation}
+        return (
+            tuple(sorted(comp.items())),
+            tuple((uid, place, self.users.get(uid)) for uid, place in participation),
+            tasks,
+            tuple(sorted((uid, task_id, self.decisions[(uid, task_id)])
+                         for uid in users for task_id, _, _ in tasks
+                         if (uid, task_id) in self.decisions)),
+        )
+
+    def competition_task_stats(self, comp_id):
+        """Задачи соревнования с числом OK/ошибочных решений его участников"""
+        users = {uid for uid, _ in self.participation.get(comp_id, [])}
+        rows = []
+        for task_id, letter in self.competition_tasks.get(comp_id, []):
+            if task_id not in self.tasks:
+                continue
+            ok = err = 0
+            for uid in users:
+                counts = self.decisions.get((uid, task_id))
+                if counts:
+                    ok += counts[0]
+                    err += counts[1]
+            points, complexity = self.tasks[task_id]
+            rows.append({'id': task_id, 'points': points, 'complexity': complexity,
+                         'letter': letter, 'ok': ok, 'err': err})
+        rows.sort(key=lambda r: (r['letter'] is not None, r['letter'] or "", r['id']))
+        return rows
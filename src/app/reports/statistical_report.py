@@ -1,26 +1,19 @@
 # app/reports/statistical_report.py — ПОЛНАЯ РАБОЧАЯ ВЕРСИЯ (график отображается!)
 import os
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import tempfile
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 
-# === Кириллица ===
-FONT_NAME = "DejaVu"
-FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "fonts", "DejaVuSans.ttf")
-if os.path.exists(FONT_PATH):
-    pdfmetrics.registerFont(TTFont(FONT_NAME, FONT_PATH))
-else:
-    FONT_NAME = "Helvetica"
+from . import fonts
+from .charts import ChartSpec, chart_flowables
+from .progress import Progress, ReportCancelled, remove_partial
+from .snapshot import ReportSnapshot
 
-rcParams['font.family'] = 'DejaVu Sans'
+# === Кириллица: общий реестр шрифтов, TTF загружается при генерации ===
+FONT_NAME = fonts.font_name("regular")
 
 styles = getSampleStyleSheet()
 styles.add(ParagraphStyle(name='MyBigTitle',   fontName=FONT_NAME, fontSize=26, alignment=TA_CENTER, spaceAfter=20, textColor=colors.HexColor("#1e40af")))
@@ -29,13 +22,25 @@ styles.add(ParagraphStyle(name='MySection',    fontName=FONT_NAME, fontSize=16,
 styles.add(ParagraphStyle(name='MyCenter',     fontName=FONT_NAME, alignment=TA_CENTER, fontSize=11))
 
 class StatsReport:
-    def __init__(self):
-        self.filename = f"Статистический_отчет_{datetime.now().strftime('%Y-%m-%d')}.pdf"
+    def __init__(self, snapshot=None, chart_backend=None, on_progress=None, should_cancel=None, output_dir=None):
+        self.filename = os.path.join(output_dir or "", f"Статистический_отчет_{datetime.now().strftime('%Y-%m-%d')}.pdf")
+        self.snapshot = snapshot  # None — прочитать свой срез при генерации
+        self.chart_backend = chart_backend  # None — REPORT_CHART_BACKEND или "reportlab"
         self.doc = SimpleDocTemplate(self.filename, pagesize=A4, topMargin=60, bottomMargin=60, leftMargin=50, rightMargin=50)
+        self.progress = Progress(on_progress, should_cancel)  # см. progress.py
 
     def generate(self):
+        fonts.register("regular")
+        existed = os.path.exists(self.filename)
+        try:
+            self._generate()
+        except ReportCancelled:
+            remove_partial(self.filename, existed)
+            raise
+        print(f"Статистический отчёт успешно создан: {self.filename}")
+
+    def _generate(self):
         story = []
-        temp_files = []  # ← Собираем все временные файлы, чтобы удалить ПОСЛЕ сборки PDF
 
         story.append(Paragraph("СТАТИСТИЧЕСКИЙ ОТЧЁТ", styles['MyBigTitle']))
         story.append(Paragraph("и рейтинг участников", styles['MySubTitle']))
@@ -43,24 +48,19 @@ class StatsReport:
         story.append(Spacer(1, 40))
 
         try:
-            import mysql.connector
-            conn = mysql.connector.connect(host='pma.morohin.info', user='phpmyadmin', password='0907', database='phpmyadmin')
-            cur = conn.cursor()
+            self.progress(0.0, "Чтение данных")
+            snapshot = self.snapshot or ReportSnapshot.load()
+            self.progress(0.3, "Таблицы")
 
             # === Статистика ===
-            cur.execute("SELECT COUNT(*) FROM competition"); comp = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM users"); users = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM programming_tasks"); tasks = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM decisions"); decisions = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM decisions WHERE status = 'OK'"); ok_solutions = cur.fetchone()[0]
-
+            counts = snapshot.counts()
             data = [
                 ["Показатель", "Значение"],
-                ["Соревнований", str(comp)],
-                ["Участников", str(users)],
-                ["Задач", str(tasks)],
-                ["Всего решений", str(decisions)],
-                ["Успешных решений", f"{ok_solutions}"]
+                ["Соревнований", str(counts['competitions'])],
+                ["Участников", str(counts['users'])],
+                ["Задач", str(counts['tasks'])],
+                ["Всего решений", str(counts['decisions'])],
+                ["Успешных решений", f"{counts['ok_decisions']}"]
             ]
 
             table = Table(data, colWidths=[300, 180])
@@ -81,16 +81,7 @@ class StatsReport:
             story.append(Paragraph("ТОП-10 УЧАСТНИКОВ ПО РЕШЁННЫМ ЗАДАЧАМ", styles['MySection']))
             story.append(Spacer(1, 15))
 
-            cur.execute("""
-                SELECT u.FCs, COUNT(d.id) as solved
-                FROM users u
-                LEFT JOIN decisions d ON u.id = d.id_users AND d.status = 'OK'
-                GROUP BY u.id, u.FCs
-                HAVING u.FCs IS NOT NULL
-                ORDER BY solved DESC, u.FCs
-                LIMIT 10
-            """)
-            top = cur.fetchall()
+            top = snapshot.top_solvers(10, include_zero=True)
 
             if top and top[0][1] > 0:
                 data = [["№", "Участник", "Решено задач"]]
@@ -121,60 +112,37 @@ class StatsReport:
             story.append(Paragraph("РАСПРЕДЕЛЕНИЕ РЕШЕНИЙ ПО УЧАСТНИКАМ", styles['MySection']))
             story.append(Spacer(1, 15))
 
-            cur.execute("""
-                SELECT u.FCs, COUNT(d.id) as cnt
-                FROM users u
-                LEFT JOIN decisions d ON u.id = d.id_users AND d.status = 'OK'
-                WHERE u.FCs IS NOT NULL
-                GROUP BY u.id, u.FCs
-                ORDER BY cnt DESC
-                LIMIT 15
-            """)
-            data = cur.fetchall()
+            self.progress(0.5, "График")
+            data = snapshot.top_solvers(15, include_zero=True)
 
             if data and any(row[1] > 0 for row in data):
                 names = [row[0][:25] + "..." if len(row[0]) > 25 else row[0] for row in data]
                 counts = [row[1] for row in data]
 
-                plt.figure(figsize=(10, 6))
-                bars = plt.barh(names, counts, color='#3b82f6')
-                plt.title("Топ участников по количеству решений", fontsize=16, pad=20)
-                plt.xlabel("Количество решений")
-                plt.grid(True, axis='x', alpha=0.3)
-
-                for i, bar in enumerate(bars):
-                    width = int(bar.get_width())
-                    if width > 0:
-                        plt.text(width + 0.1, bar.get_y() + bar.get_height()/2, str(width), va='center')
-
-                plt.tight_layout()
-
-                # ← КЛЮЧЕВОЕ ИСПРАВЛЕНИЕ: используем tempfile + не удаляем сразу!
-                tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-                tmp_path = tmp.name
-                tmp.close()
-                temp_files.append(tmp_path)  # запоминаем для удаления ПОСЛЕ сборки
-
-                plt.savefig(tmp_path, dpi=180, bbox_inches='tight')
-                plt.close()
-
-                story.append(Image(tmp_path, width=520, height=340))
+                spec = ChartSpec(
+                    labels=names,
+                    values=counts,
+                    title="Топ участников по количеству решений",
+                    xlabel="Количество решений",
+                    color='#3b82f6',
+                    figsize=(10, 6),
+                    dpi=180,
+                    title_size=16,
+                    title_pad=20,
+                    value_labels=True,
+                    tight_layout=True,
+                )
+                story.extend(chart_flowables([spec], 520, 340, self.chart_backend, font_name=FONT_NAME))
             else:
                 story.append(Paragraph("Нет успешных решений для графика", styles['MyCenter']))
 
-            conn.close()
-
+        except ReportCancelled:
+            raise
         except Exception as e:
             story.append(Paragraph(f"Ошибка: {str(e)}", styles['MyCenter']))
 
         # === Сборка PDF ===
+        self.progress(0.8, "Сборка PDF")
+        self.doc.setProgressCallBack(self.progress.doc_callback)
         self.doc.build(story)
-
-        # === Удаляем временные файлы ТОЛЬКО ПОСЛЕ сборки PDF ===
-        for path in temp_files:
-            try:
-                os.remove(path)
-            except:
-                pass
-
-        print(f"Статистический отчёт успешно создан: {self.filename}")
+        self.progress(1.0, "Готово")
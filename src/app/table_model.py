@@ -0,0 +1,163 @@
+# app/table_model.py — модель таблицы БД с постраничной подгрузкой
+import bisect
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+
+
+
+class PagedTableModel(QAbstractTableModel):
+    """Строки таблицы БД, подгружаемые страницами по мере прокрутки.
+
+    Страница выбирается по ключу: WHERE id > последний загруженный id
+    ORDER BY id LIMIT n — стоимость запроса не зависит от того, как далеко
+    пролистана таблица. Вид сам вызывает canFetchMore/fetchMore, когда
+    пользователь доходит до конца загруженных строк; страница запрашивается
+    через QueryExecutor и добавляется в модель по готовности.
+    """
+    PAGE_SIZE = 200
+
+    load_error = Signal(str)
+
+    def __init__(self, executor, parent=None, page_size=PAGE_SIZE):
+        super().__init__(parent)
+        self.executor = executor
+        self.page_size = page_size
+        self._key = f"page:{id(self)}"
+        self._loading = False
+        self.table_name = None
+        self.columns = []
+        self._rows = []
+        self._last_id = None
+        self._exhausted = True
+
+    def set_table(self, table_name, columns):
+        """Переключиться на другую таблицу и загрузить первую страницу"""
+        self.beginResetModel()
+        self.table_name = table_name
+        self.columns = list(columns)
+        self._rows = []
+        self._last_id = None
+        self._exhausted = table_name is None
+        self._loading = False
+        self.executor.cancel_key(self._key)  # страница прежней таблицы больше не нужна
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    # --- подгрузка ---
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self._loading or not self.canFetchMore(parent):
+            return
+        self._loading = True
+        sql, params = self._page_query()
+        self.executor.query(sql, params, key=self._key,
+                            on_result=self._page_loaded, on_error=self._page_failed)
+
+    def _page_failed(self, msg):
+        self._loading = False
+        self._exhausted = True
+        self.load_error.emit(msg)
+
+    def _page_loaded(self, page):
+        self._loading = False
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+        self._rows.extend(page)
+        self._last_id = page[-1][0]
+        self.endInsertRows()
+
+    def _page_query(self):
+        cols = ', '.join(['`id`'] + [f"`{c}`" for c in self.columns])
+        sql = f"SELECT {cols} FROM `{self.table_name}`"
+        params = []
+        if self._last_id is not None:
+            sql += " WHERE id > %s"
+            params.append(self._last_id)
+        sql += " ORDER BY id LIMIT %s"
+        params.append(self.page_size)
+        return sql, params
+
+    # --- доступ к загруженным строкам ---
+    def record(self, row):
+        """Запись в виде словаря {'id': ..., колонка: значение} — без запроса к БД"""
+        if not 0 <= row < len(self._rows):
+            return None
+        return dict(zip(['id'] + self.columns, self._rows[row]))
+
+    def rows_for_ids(self, ids):
+        """Номера загруженных строк с этими id"""
+        ids = set(ids)
+        return [i for i, row in enumerate(self._rows) if row[0] in ids]
+
+    # --- точечные изменения после правки данных, без перезагрузки таблицы ---
+    def remove_ids(self, ids):
+        """Убрать строки с этими id; соседние строки удаляются одним диапазоном"""
+        rows = self.rows_for_ids(ids)
+        while rows:
+            last = first = rows.pop()
+            while rows and rows[-1] == first - 1:
+                first = rows.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+
+    def upsert_row(self, row):
+        """Подставить строку (id, *колонки), перечитанную после INSERT/UPDATE.
+
+        Загруженная строка с тем же id заменяется. Новая вставляется по порядку id,
+        если попадает в уже загруженный диапазон; иначе её принесёт следующая
+        страница при прокрутке (WHERE id > последний загруженный).
+        """
+        row = tuple(row)
+        for i, old in enumerate(self._rows):
+            if old[0] == row[0]:
+                self._rows[i] = row
+                self.dataChanged.emit(self.index(i, 0), self.index(i, len(self.columns) - 1))
+                return
+        if not self._exhausted and (self._last_id is None or row[0] > self._last_id):
+            return
+        pos = bisect.bisect_left([r[0] for r in self._rows], row[0])
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self._rows.insert(pos, row)
+        self.endInsertRows()
+
+    def update_values(self, ids, values):
+        """Подставить values ({колонка: значение}) в строки с этими id"""
+        positions = {self.columns.index(c) + 1: v for c, v in values.items() if c in self.columns}
+        rows = self.rows_for_ids(ids)
+        for i in rows:
+            row = list(self._rows[i])
+            for pos, value in positions.items():
+                row[pos] = value
+            self._rows[i] = tuple(row)
+        if rows:
+            self.dataChanged.emit(self.index(rows[0], 0), self.index(rows[-1], len(self.columns) - 1))
+
+    # --- интерфейс QAbstractTableModel ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            val = self._rows[index.row()][index.column() + 1]  # [0] — id
+            return str(val) if val is not None else ""
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section] if section < len(self.columns) else None
+        return str(section + 1)
@@ -0,0 +1,213 @@
+# app/workers.py — фоновое выполнение запросов к БД вне GUI-потока
+import itertools
+import threading
+
+import mysql.connector
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from database.database import POOL_CONFIG, connection, get_pool
+
+DEFAULT_TIMEOUT = 30  # секунд
+SHUTDOWN_WAIT = 3     # секунд ждать отменённые чтения при закрытии
+
+
+class QueryRequest(QRunnable):
+    """Одна фоновая задача исполнителя. Результат отдаётся через сигналы QueryExecutor"""
+
+    def __init__(self, executor, request_id, fn, key, connect, on_result, on_error, read_only=False, write=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.executor = executor
+        self.id = request_id
+        self.fn = fn
+        self.key = key
+        self.connect = connect
+        self.read_only = read_only
+        self.write = write
+        self.on_result = on_result
+        self.on_error = on_error
+        self.cancelled = False
+        self.connection_id = None  # id потока на сервере, пока запрос выполняется
+        # KILL QUERY и возврат соединения в пул взаимоисключающи: иначе KILL,
+        # отправленный с опозданием, прервал бы чужой запрос на том же соединении
+        self.kill_lock = threading.Lock()
+
+    def run(self):
+        if self.cancelled:
+            self.executor._failed.emit(self.id, "Запрос отменён")
+            return
+        try:
+            if self.connect:
+                with connection(read_only=self.read_only) as conn:
+                    self.connection_id = conn.connection_id
+                    try:
+                        result = self.fn(conn)
+                    finally:
+                        with self.kill_lock:
+                            self.connection_id = None
+            else:
+                result = self.fn()
+        except Exception as e:
+            self.executor._failed.emit(self.id, str(e))
+        else:
+            self.executor._finished.emit(self.id, result)
+
+
+class QueryExecutor(QObject):
+    """Общий исполнитель запросов к БД для всех вкладок.
+
+    Запросы выполняются в отдельном QThreadPool, а on_result / on_error
+    вызываются в GUI-потоке. Запрос с тем же key отменяет предыдущий
+    (например, при быстром переключении таблиц в выпадающем списке):
+    его результат отбрасывается, а выполняющийся на сервере запрос
+    прерывается через KILL QUERY. По истечении timeout секунд запрос
+    отменяется так же и on_error получает сообщение о таймауте.
+    Запись (write=True, query(commit=True)) по умолчанию без таймаута:
+    иначе окно могло бы сообщить об ошибке для уже зафиксированной правки.
+    """
+
+    _finished = Signal(int, object)
+    _failed = Signal(int, str)
+
+    def __init__(self, parent=None, default_timeout=DEFAULT_TIMEOUT):
+        super().__init__(parent)
+        self.default_timeout = default_timeout
+        self.pool = QThreadPool(self)
+        # по размеру пула из настроек, не создавая сам пул: без .env окно
+        # открывается, а ошибка конфигурации приходит в on_error запросов
+        self.pool.setMaxThreadCount(max(1, POOL_CONFIG.get('size', 5)))
+        self._ids = itertools.count(1)
+        self._requests = {}
+        self._by_key = {}
+        self._finished.connect(self._on_finished)
+        self._failed.connect(self._on_failed)
+
+    def execute(self, fn, key=None, on_result=None, on_error=None, timeout=None, connect=True, read_only=False,
+                write=False):
+        """Выполнить fn(conn) (или fn() при connect=False) в фоне.
+        read_only=True — только чтение: может выполняться на локальной копии БД;
+        write=True — fn изменяет данные, таймаут по умолчанию к нему не применяется"""
+        if key is not None:
+            self.cancel_key(key)
+        req = QueryRequest(self, next(self._ids), fn, key, connect, on_result, on_error, read_only, write)
+        self._requests[req.id] = req
+        if key is not None:
+            self._by_key[key] = req
+        if timeout is None:
+            timeout = 0 if write else self.default_timeout
+        if timeout:
+            QTimer.singleShot(int(timeout * 1000), self, lambda rid=req.id: self._on_timeout(rid, timeout))
+        self.pool.start(req)
+        return req
+
+    def query(self, sql, params=(), fetch="all", dictionary=False, commit=False, **kwargs):
+        """Выполнить один SQL-запрос. fetch: "all", "one" или "none" — тогда
+        результатом будет {'rowcount': ..., 'lastrowid': ...}"""
+        def run(conn):
+            cur = conn.cursor(dictionary=dictionary)
+            try:
+                cur.execute(sql, params)
+                if fetch == "all":
+                    result = cur.fetchall()
+                elif fetch == "one":
+                    result = cur.fetchone()
+                else:
+                    result = {'rowcount': cur.rowcount, 'lastrowid': cur.lastrowid}
+                if commit:
+                    conn.commit()
+                return result
+            finally:
+                cur.close()
+        kwargs.setdefault("write", commit)
+        return self.execute(run, **kwargs)
+
+    def cancel_key(self, key):
+        req = self._by_key.get(key)
+        if req is not None:
+            self.cancel(req)
+
+    def cancel(self, req):
+        if req.cancelled:
+            return
+        req.cancelled = True
+        if req.key is not None and self._by_key.get(req.key) is req:
+            del self._by_key[req.key]
+        if self.pool.tryTake(req):
+            self._requests.pop(req.id, None)
+        elif req.connection_id is not None:
+            self._kill(req)
+        # иначе запрос уже выполняется: ссылку держим до его сигнала, результат будет отброшен
+
+    def _kill(self, req):
+        # Отдельный поток и отдельное соединение вне пула: таймаут срабатывает
+        # как раз тогда, когда все потоки и соединения пула заняты зависшими запросами
+        connection_id = req.connection_id
+
+        def kill():
+            try:
+                conn = mysql.connector.connect(**get_pool().params)
+                try:
+                    cur = conn.cursor()
+                    # под kill_lock запрос не может вернуть соединение в пул;
+                    # если он уже закончился, соединение могло достаться другому
+                    with req.kill_lock:
+                        if req.connection_id == connection_id:
+                            cur.execute(f"KILL QUERY {int(connection_id)}")
+                    cur.close()
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"Не удалось прервать запрос {connection_id}:", e)
+        threading.Thread(target=kill, name="kill-query", daemon=True).start()
+
+    def shutdown(self, wait=SHUTDOWN_WAIT):
+        """При закрытии приложения: чтения отменяются, записи дописываются.
+        Обратные вызовы больше не приходят — окна уже разрушаются"""
+        writes = False
+        for req in list(self._requests.values()):
+            if req.write:
+                req.on_result = req.on_error = None
+                writes = True
+            else:
+                self.cancel(req)
+        if writes:
+            self.pool.waitForDone()
+        else:
+            self.pool.waitForDone(int(wait * 1000))
+
+    def _take(self, request_id):
+        req = self._requests.pop(request_id, None)
+        if req is None or req.cancelled:
+            return None
+        if req.key is not None and self._by_key.get(req.key) is req:
+            del self._by_key[req.key]
+        return req
+
+    def _on_finished(self, request_id, result):
+        req = self._take(request_id)
+        if req and req.on_result:
+            req.on_result(result)
+
+    def _on_failed(self, request_id, message):
+        req = self._take(request_id)
+        if req and req.on_error:
+            req.on_error(message)
+
+    def _on_timeout(self, request_id, timeout):
+        req = self._requests.get(request_id)
+        if req is None or req.cancelled:
+            return
+        self.cancel(req)
+        if req.on_error:
+            req.on_error(f"Превышено время ожидания запроса ({timeout} с)")
+
+
+_executor = None
+
+
+def get_executor():
+    """Общий исполнитель; создаётся при первом обращении (после QApplication)"""
+    global _executor
+    if _executor is None:
+        _executor = QueryExecutor()
+    return _executor
@@ -0,0 +1,338 @@
+# database/bulk_import.py — массовая загрузка строк из CSV или JSON
+#
+#   cd src
+#   python -m database.bulk_import decisions results.csv --batch 2000 --rejects rejected.csv
+#   python -m database.bulk_import participation contest.jsonl
+#
+# Файл читается потоком: CSV (разделитель «,», «;» или табуляция, первая
+# строка — имена колонок), JSON-массив объектов или JSON Lines. Каждое
+# значение проверяется по типу колонки, внешние ключи — по множествам id,
+# загруженным в память один раз. Строки вставляются пачками executemany,
+# каждая пачка — одна транзакция (database/mutations.py, вместе со сводкой
+# решений). Ошибочные строки не прерывают загрузку, а собираются в список
+# отклонённых с номером строки файла и причиной.
+import csv
+import datetime
+import json
+import os
+import re
+import sys
+import time
+
+from database import mutations
+from database.schema import schema_cache
+
+DEFAULT_BATCH = 1000
+FORMATS = ("csv", "json", "jsonl")
+DELIMITERS = ",;\t"
+READ_CHUNK = 1 << 16
+
+INT_TYPES = ("tinyint", "smallint", "mediumint", "int", "integer", "bigint")
+FLOAT_TYPES = ("decimal", "float", "double")
+TEXT_TYPES = ("char", "varchar", "tinytext", "text", "mediumtext", "longtext")
+
+
+# ============================= ЧТЕНИЕ ФАЙЛА =============================
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext == ".json":
+        return "json"
+    return "csv"
+
+
+def read_csv(f):
+    sample = f.read(READ_CHUNK)
+    f.seek(0)
+    try:
+        reader = csv.DictReader(f, dialect=csv.Sniffer().sniff(sample, delimiters=DELIMITERS))
+    except csv.Error:
+        # Sniffer не справляется, если в какой-то строке лишние значения, — тогда
+        # разделитель берётся по заголовку, а такие строки отклоняются при загрузке
+        header = sample.split("\n", 1)[0]
+        reader = csv.DictReader(f, delimiter=max(DELIMITERS, key=header.count))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_json_array(f):
+    """Объекты JSON-массива по одному, без чтения всего файла в память"""
+    decoder = json.JSONDecoder()
+    buf, pos, index, started = "", 0, 0, False
+    while True:
+        chunk = f.read(READ_CHUNK)
+        buf = buf[pos:] + chunk
+        pos = 0
+        while True:
+            while pos < len(buf) and (buf[pos].isspace() or (started and buf[pos] == ",")):
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("Ожидался JSON-массив объектов")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not chunk:
+                    raise
+                break  # объект не дочитан — нужен следующий кусок файла
+            index += 1
+            yield index, obj
+            pos = end
+        if not chunk:
+            if started:
+                raise ValueError("JSON-массив не закрыт")
+            return
+
+
+def read_jsonl(f):
+    for line_no, line in enumerate(f, 1):
+        if line.strip():
+            yield line_no, json.loads(line)
+
+
+def read_rows(path, fmt=None):
+    """(номер строки/объекта, словарь колонка -> значение) по одному"""
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат {fmt}; поддерживаются {', '.join(FORMATS)}")
+    with open(path, encoding="utf-8-sig", newline="" if fmt == "csv" else None) as f:
+        reader = {"csv": read_csv, "json": read_json_array, "jsonl": read_jsonl}[fmt]
+        for number, row in reader(f):
+            if not isinstance(row, dict):
+                raise ValueError(f"Запись {number}: ожидался объект с колонками")
+            yield number, row
+
+
+# ============================= ПРОВЕРКА ТИПОВ =============================
+def converter(col):
+    """Функция value -> значение для INSERT; ValueError с причиной, если не подходит"""
+    length = re.search(r"\((\d+)\)", col.column_type or "")
+    max_len = int(length.group(1)) if length and col.data_type in TEXT_TYPES else None
+    allowed = ([v.replace("''", "'") for v in re.findall(r"'((?:[^']|'')*)'", col.column_type or "")]
+               if col.data_type in ("set", "enum") else None)
+
+    def convert(value):
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            if col.nullable or col.auto_increment:
+                return None
+            raise ValueError(f"{col.name}: пустое значение")
+        try:
+            if col.data_type in INT_TYPES:
+                if isinstance(value, float) and not value.is_integer() or isinstance(value, bool):
+                    raise ValueError
+                return int(value)
+            if col.data_type in FLOAT_TYPES:
+                return float(value)
+            if col.data_type == "date":
+                text = str(value)
+                if re.fullmatch(r"\d{2}\.\d{2}\.\d{4}", text):
+                    return datetime.datetime.strptime(text, "%d.%m.%Y").date()
+                return datetime.date.fromisoformat(text)
+            if col.data_type in ("datetime", "timestamp"):
+                return datetime.datetime.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"{col.name}: «{value}» не подходит для типа {col.column_type}") from None
+        value = str(value)
+        if max_len is not None and len(value) > max_len:
+            raise ValueError(f"{col.name}: длиннее {max_len} символов")
+        if allowed is not None:
+            parts = value.split(",") if col.data_type == "set" else [value]
+            if any(p not in allowed for p in parts):
+                raise ValueError(f"{col.name}: «{value}» не входит в {', '.join(allowed)}")
+        return value
+    return convert
+
+
+# ============================= ЗАГРУЗКА =============================
+class ImportResult:
+    def __init__(self, table):
+        self.table = table
+        self.inserted = 0
+        self.rejected = []      # (номер строки, исходная строка, причина)
+        self.seconds = 0.0
+        self.cancelled = False
+
+    @property
+    def processed(self):
+        return self.inserted + len(self.rejected)
+
+    @property
+    def rows_per_second(self):
+        return self.inserted / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        text = (f"{self.table}: добавлено {self.inserted:,}, отклонено {len(self.rejected):,} "
+                f"за {self.seconds:.1f} с ({self.rows_per_second:,.0f} строк/с)")
+        return text + (" — загрузка прервана" if self.cancelled else "")
+
+
+class BulkImporter:
+    """Загрузка строк в одну таблицу. Пачка, которую отвергла БД (дубликат
+    ключа и т. п.), повторяется построчно — отклоняются только виновные строки."""
+
+    def __init__(self, conn, table, batch_size=DEFAULT_BATCH, on_progress=None, should_cancel=None):
+        self.conn = conn
+        self.table = table
+        self.batch_size = max(1, batch_size)
+        self.on_progress = on_progress        # on_progress(ImportResult) после каждой пачки
+        self.should_cancel = should_cancel
+        self.columns = {c.name: c for c in schema_cache.columns(table, conn)}
+        if not self.columns:
+            raise ValueError(f"Таблица {table} не найдена")
+        self.converters = {name: converter(col) for name, col in self.columns.items()}
+        self.foreign_keys = schema_cache.foreign_keys(table, conn)
+        self._ref_ids = {}
+
+    def _check_header(self, names):
+        unknown = [n for n in names if n not in self.columns]
+        if unknown:
+            raise ValueError(f"В таблице {self.table} нет колонок: {', '.join(unknown)}")
+        missing = [c.name for c in self.columns.values()
+                   if c.name not in names and not c.nullable and not c.auto_increment]
+        if missing:
+            raise ValueError(f"В файле нет обязательных колонок: {', '.join(missing)}")
+
+    def _referenced(self, column):
+        """Множество допустимых значений внешнего ключа (читается один раз)"""
+        if column not in self._ref_ids:
+            ref_table, ref_column = self.foreign_keys[column]
+            cur = self.conn.cursor()
+            try:
+                cur.execute(f"SELECT `{ref_column}` FROM `{ref_table}`")
+                self._ref_ids[column] = {row[0] for row in cur.fetchall()}
+            finally:
+                cur.close()
+        return self._ref_ids[column]
+
+    @staticmethod
+    def _check_keys(names, row):
+        """Запись должна содержать ровно колонки заголовка (первой записи)"""
+        if None in row:  # csv.DictReader кладёт значения сверх заголовка под ключ None
+            raise ValueError(f"лишних значений без колонки в заголовке: {len(row[None])}")
+        if len(row) == len(names) and all(n in row for n in names):
+            return
+        parts = []
+        extra = [k for k in row if k not in names]
+        if extra:
+            parts.append(f"лишние колонки: {', '.join(extra)}")
+        missing = [n for n in names if n not in row]
+        if missing:
+            parts.append(f"нет колонок: {', '.join(missing)}")
+        raise ValueError("колонки не совпадают с первой записью — " + "; ".join(parts))
+
+    def _convert(self, names, row):
+        self._check_keys(names, row)
+        values = tuple(self.converters[n](row.get(n)) for n in names)
+        for n, value in zip(names, values):
+            if n in self.foreign_keys and value is not None and value not in self._referenced(n):
+                ref_table, ref_column = self.foreign_keys[n]
+                raise ValueError(f"{n}: нет записи {ref_table}.{ref_column} = {value}")
+        return values
+
+    def _flush(self, names, batch, result):
+        if not batch:
+            return
+        try:
+            mutations.insert_rows(self.conn, self.table, names, [values for _, _, values in batch])
+            result.inserted += len(batch)
+        except Exception:
+            for number, row, values in batch:
+                try:
+                    mutations.insert_rows(self.conn, self.table, names, [values])
+                    result.inserted += 1
+                except Exception as e:
+                    result.rejected.append((number, row, str(e)))
+        batch.clear()
+
+    def run(self, rows):
+        """rows — итератор (номер, словарь); возвращает ImportResult"""
+        result = ImportResult(self.table)
+        start = time.perf_counter()
+        names, batch = None, []
+        for number, row in rows:
+            if names is None:
+                names = [n for n in row if n is not None]  # колонки берутся из первой записи
+                self._check_header(names)
+            try:
+                batch.append((number, row, self._convert(names, row)))
+            except ValueError as e:
+                result.rejected.append((number, row, str(e)))
+            if len(batch) >= self.batch_size:
+                self._flush(names, batch, result)
+                result.seconds = time.perf_counter() - start
+                if self.on_progress:
+                    self.on_progress(result)
+                if self.should_cancel and self.should_cancel():
+                    result.cancelled = True
+                    break
+        if not result.cancelled:
+            self._flush(names, batch, result)
+        result.seconds = time.perf_counter() - start
+        if self.on_progress:
+            self.on_progress(result)
+        return result
+
+
+def import_file(conn, table, path, fmt=None, batch_size=DEFAULT_BATCH, on_progress=None, should_cancel=None):
+    """Загрузить файл в таблицу; возвращает ImportResult"""
+    importer = BulkImporter(conn, table, batch_size, on_progress, should_cancel)
+    return importer.run(read_rows(path, fmt))
+
+
+def write_rejects(path, rejected):
+    """Сохранить отклонённые строки в CSV: номер строки, причина и исходные значения"""
+    keys = []
+    for _, row, _ in rejected:
+        keys.extend(k for k in row if k is not None and k not in keys)
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "error"] + keys)
+        for number, row, reason in rejected:
+            writer.writerow([number, reason] + [row.get(k, "") for k in keys] + list(row.get(None) or ()))
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m database.bulk_import",
+                                     description="Массовая загрузка строк в таблицу DataWise из CSV или JSON.")
+    parser.add_argument("table", help="таблица, например decisions или participation")
+    parser.add_argument("file", help="CSV, JSON-массив объектов или JSON Lines")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="формат файла (по умолчанию — по расширению)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help=f"строк в транзакции (по умолчанию {DEFAULT_BATCH})")
+    parser.add_argument("--rejects", default=None, help="сохранить отклонённые строки в этот CSV")
+    args = parser.parse_args(argv)
+
+    def progress(result):
+        print(f"\r{result.processed:,} строк, {result.rows_per_second:,.0f} строк/с", end="", file=sys.stderr)
+
+    from database.database import connection
+    try:
+        with connection() as conn:
+            result = import_file(conn, args.table, args.file, args.format, args.batch, on_progress=progress)
+    except (OSError, ValueError) as e:
+        print(f"\nИмпорт не выполнен: {e}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(result.summary())
+    for number, _, reason in result.rejected[:10]:
+        print(f"  строка {number}: {reason}")
+    if len(result.rejected) > 10:
+        print(f"  … и ещё {len(result.rejected) - 10}")
+    if result.rejected and args.rejects:
+        write_rejects(args.rejects, result.rejected)
+        print(f"Отклонённые строки: {args.rejects}")
+    return 0 if not result.rejected else 3
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# database/changes.py — журнал правок и удалений (change_log)
+#
+#   cd src
+#   python -m database.changes --prune            # старше DB_CHANGE_LOG_KEEP_DAYS дней
+#   python -m database.changes --prune --days 3
+#
+# Пишется функциями database/mutations.py в той же транзакции, что и само
+# изменение. Читает журнал app/change_feed.py: по нему открытые окна
+# узнают, что строку изменили или удалили. Вставки в журнал не пишутся —
+# новые строки видны по водяному знаку id в самих таблицах.
+#
+# Старые записи удаляет только --prune (например, из cron): лента в окнах
+# журнал лишь читает. Окно, отставшее сильнее срока хранения, заметит это
+# только при полной пересверке.
+import argparse
+import json
+import sys
+
+CHANGE_LOG_TABLE = "change_log"
+
+CHANGES_QUERY = """
+SELECT id, table_name, row_id, action, before_data, after_data
+FROM change_log
+WHERE id > %s
+ORDER BY id
+LIMIT %s
+"""
+
+
+def exists(conn=None):
+    """Создан ли журнал (миграция 0004); без него правки просто не отслеживаются"""
+    from database.schema import schema_cache
+    return CHANGE_LOG_TABLE in schema_cache.tables(conn)
+
+
+def rows_by_id(cur, table, ids):
+    """{id: строка-словарь} для журнала — текущие значения строк"""
+    ids = list(ids)
+    if not ids:
+        return {}
+    cur.execute(f"SELECT * FROM `{table}` WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+    names = cur.column_names
+    return {row[0]: dict(zip(names, row)) for row in cur.fetchall()}
+
+
+def _dump(row):
+    return None if row is None else json.dumps(row, ensure_ascii=False, default=str)
+
+
+def log(cur, table, action, before, after=None):
+    """Записать правку ('update') или удаление ('delete'); before/after — {id: строка}"""
+    after = after or {}
+    entries = [(table, row_id, action, _dump(row), _dump(after.get(row_id))) for row_id, row in before.items()]
+    if entries:
+        cur.executemany("INSERT INTO change_log (table_name, row_id, action, before_data, after_data) "
+                        "VALUES (%s, %s, %s, %s, %s)", entries)
+
+
+def decode(data):
+    return None if data is None else json.loads(data)
+
+
+def prune(conn, days=7):
+    """Удалить записи журнала старше days дней; возвращает их число"""
+    cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM change_log WHERE changed_at < NOW() - INTERVAL %s DAY", (days,))
+        conn.commit()
+        return cur.rowcount
+    finally:
+        cur.close()
+
+
+def main(argv=None):
+    from database.database import CHANGE_FEED_CONFIG
+    keep_days = CHANGE_FEED_CONFIG.get('keep_days', 7)
+    parser = argparse.ArgumentParser(prog="python -m database.changes",
+                                     description="Обслуживание журнала правок и удалений (change_log).")
+    parser.add_argument("--prune", action="store_true", help="удалить старые записи журнала")
+    parser.add_argument("--days", type=int, default=keep_days,
+                        help=f"сколько дней хранить записи (по умолчанию {keep_days})")
+    args = parser.parse_args(argv)
+    if not args.prune:
+        parser.print_help()
+        return 0
+
+    from database.database import connection
+    try:
+        with connection() as conn:
+            if not exists(conn):
+                print("Журнала change_log нет (python -m database.migrations)")
+                return 0
+            rows = prune(conn, args.days)
+    except Exception as e:
+        print(f"Не удалось очистить журнал: {e}", file=sys.stderr)
+        return 1
+    print(f"Удалено записей журнала: {rows}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,237 @@
 # database.py — обязательный файл для работы отчётов
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import mysql.connector
+from mysql.connector import errors
+
+# config/ лежит в корне проекта, а main.py запускается из src/
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+try:
+    from config.database import DATABASE_CONFIG, POOL_CONFIG, REPLICA_CONFIG, CHANGE_FEED_CONFIG
+except ImportError as e:
+    print("Конфигурация БД не загружена:", e)
+    DATABASE_CONFIG = {}
+    POOL_CONFIG = {}
+    REPLICA_CONFIG = {}
+    CHANGE_FEED_CONFIG = {}
+
+class ConfigurationError(errors.InterfaceError):
+    """В .env не задано, к какой базе подключаться"""
+
+
+def connection_params():
+    """Параметры подключения из DATABASE_CONFIG (.env); без DB_NAME — ConfigurationError"""
+    if not DATABASE_CONFIG.get('database'):
+        raise ConfigurationError("Не задана база данных: скопируйте .env.example в .env "
+                                 "и укажите DB_HOST, DB_NAME, DB_USER и DB_PASSWORD")
+    params = dict(DATABASE_CONFIG)
+    params['autocommit'] = True
+    return params
+
+
+# ============================= ПУЛ СОЕДИНЕНИЙ =============================
+class PooledConnection:
+    """Соединение, взятое из пула. close() возвращает его в пул, а не рвёт"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise errors.OperationalError("Соединение уже возвращено в пул")
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+
+class ConnectionPool:
+    """Пул соединений с MySQL: соединение создаётся один раз и переиспользуется.
+
+    При выдаче соединение, простоявшее дольше ping_interval секунд, проверяется
+    ping'ом; мёртвое выбрасывается и заменяется новым. Если все size соединений
+    заняты, acquire() ждёт освобождения не дольше timeout секунд.
+    """
+
+    def __init__(self, params, size=5, timeout=10.0, ping_interval=30.0):
+        self.params = params
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._idle = deque()  # (соединение, время возврата в пул)
+        self._opened = 0
+        self._cond = threading.Condition()
+        self.hits = 0       # выдано готовое соединение
+        self.misses = 0     # пришлось открывать новое
+        self.waits = 0      # пришлось ждать освобождения
+        self.discarded = 0  # выброшено как нерабочее
+
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        with self._cond:
+            while not self._idle and self._opened >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise errors.PoolError(f"Нет свободных соединений в пуле (размер {self.size})")
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                self._cond.wait(remaining)
+            if self._idle:
+                conn, released_at = self._idle.pop()  # LIFO — самое «тёплое» соединение
+            else:
+                conn, released_at = None, None
+                self._opened += 1
+
+        if conn is not None and not self._healthy(conn, released_at):
+            self._close_quietly(conn)
+            with self._cond:
+                self.discarded += 1
+            conn = None
 
+        if conn is None:
+            try:
+                conn = mysql.connector.connect(**self.params)
+            except Exception:
+                with self._cond:
+                    self._opened -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self.misses += 1
+        else:
+            with self._cond:
+                self.hits += 1
+        return PooledConnection(self, conn)
 
-def get_connection():
-    """Единое подключение к БД — используется и в main.py, и в отчётах"""
+    def release(self, conn):
+        try:
+            if conn.unread_result:
+                conn.consume_results()
+            if conn.in_transaction:
+                conn.rollback()
+            alive = True
+        except Exception:
+            alive = False
+        with self._cond:
+            if alive:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._opened -= 1
+                self.discarded += 1
+            self._cond.notify()
+        if not alive:
+            self._close_quietly(conn)
+
+    def _healthy(self, conn, released_at):
+        if time.monotonic() - released_at < self.ping_interval:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._opened -= len(idle)
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'opened': self._opened,
+                'idle': len(self._idle),
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'discarded': self.discarded,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Общий на весь процесс пул, создаётся при первом обращении"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                connection_params(),
+                size=POOL_CONFIG.get('size', 5),
+                timeout=POOL_CONFIG.get('timeout', 10.0),
+                ping_interval=POOL_CONFIG.get('ping_interval', 30.0),
+            )
+        return _pool
+
+
+def read_connection():
+    """Соединение для чтения: локальная копия, если она включена и заполнена, иначе из пула"""
+    if REPLICA_CONFIG.get('backend') == 'replica':
+        from database import replica
+        conn = replica.read_connection()
+        if conn is not None:
+            return conn
+    return get_pool().acquire()
+
+
+@contextmanager
+def connection(read_only=False):
+    """Взять соединение на время блока with; ошибки подключения пробрасываются.
+
+    read_only=True — только чтение, его можно обслужить из локальной копии
+    (DB_READ_BACKEND=replica, см. database/replica.py).
+    """
+    conn = read_connection() if read_only else get_pool().acquire()
     try:
-        return mysql.connector.connect(
-            host='pma.morohin.info',
-            user='phpmyadmin',
-            password='0907',
-            database='phpmyadmin',   # ты уже переименовал — оставляем так
-            charset='utf8mb4',
-            autocommit=True
-        )
+        yield conn
+    finally:
+        conn.close()
+
+
+def get_connection(read_only=False):
+    """Единое подключение к БД — используется и в main.py, и в отчётах.
+
+    Соединение берётся из общего пула; conn.close() возвращает его обратно.
+    read_only=True — как у connection().
+    """
+    try:
+        return read_connection() if read_only else get_pool().acquire()
     except Exception as e:
         print(f"Не удалось подключиться к БД: {e}")
         return None
+
+
+def pool_stats():
+    return get_pool().stats()
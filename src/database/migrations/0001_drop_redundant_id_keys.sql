@@ -0,0 +1,6 @@
+-- KEY id дублирует первичный ключ: лишняя запись в каждом индексе при вставке
+ALTER TABLE `competition` DROP INDEX `id`;
+ALTER TABLE `decisions` DROP INDEX `id`;
+ALTER TABLE `participation` DROP INDEX `id`;
+ALTER TABLE `programming_tasks` DROP INDEX `id`;
+ALTER TABLE `users` DROP INDEX `id`;
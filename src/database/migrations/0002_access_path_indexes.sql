@@ -0,0 +1,14 @@
+-- Составные индексы под реальные пути доступа. Одноколоночные индексы по
+-- первой колонке становятся лишними: внешние ключи обслуживаются составными.
+
+-- решения участника: пересчёт сводки и счётчики (участник, задача) в ReportSnapshot
+-- читаются из индекса, без обращения к строкам таблицы
+ALTER TABLE `decisions`
+  ADD KEY `user_task_status` (`id_users`, `id_programminng_tasks`, `status`),
+  ADD KEY `task_user` (`id_programminng_tasks`, `id_users`);
+ALTER TABLE `decisions` DROP INDEX `id_users`, DROP INDEX `id_programminng_tasks`;
+
+-- участники соревнования
+ALTER TABLE `participation`
+  ADD KEY `competition_user` (`id_competition`, `id_users`);
+ALTER TABLE `participation` DROP INDEX `id_competition`;
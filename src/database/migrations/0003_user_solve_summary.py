@@ -0,0 +1,6 @@
+# Сводка решений по участникам (database/summary.py), сразу заполненная
+from database import summary
+
+
+def upgrade(conn):
+    summary.rebuild(conn)
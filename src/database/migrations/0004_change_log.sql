@@ -0,0 +1,14 @@
+-- Журнал изменений и удалений, сделанных приложением (database/changes.py).
+-- Новые строки окна видят по водяному знаку id, журнал нужен для того,
+-- что по id не заметно: правок и удалений.
+CREATE TABLE IF NOT EXISTS `change_log` (
+  `id` bigint(20) NOT NULL AUTO_INCREMENT,
+  `table_name` varchar(64) NOT NULL COMMENT 'таблица',
+  `row_id` int(11) NOT NULL COMMENT 'id изменённой строки',
+  `action` enum('update','delete') NOT NULL COMMENT 'действие',
+  `before_data` text DEFAULT NULL COMMENT 'строка до изменения, JSON',
+  `after_data` text DEFAULT NULL COMMENT 'строка после изменения, JSON',
+  `changed_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  KEY `changed_at` (`changed_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='журнал изменений';
@@ -0,0 +1,137 @@
+# database/migrations — версионированные изменения схемы поверх phpmyadmin.sql
+#
+# Миграция — файл NNNN_описание.sql (операторы через «;» в конце строки)
+# или NNNN_описание.py с функцией upgrade(conn). Применённые версии
+# записываются в schema_migrations; каждая применяется один раз, по порядку.
+# DDL в MySQL фиксируется сразу и не откатывается, поэтому для .sql после
+# каждого оператора запоминается, сколько их выполнено (schema_migration_progress):
+# миграция, прерванная на середине, при повторном запуске продолжается со
+# следующего оператора, а не падает на уже удалённом индексе.
+import importlib.util
+import os
+import re
+from collections import namedtuple
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+FILE_RE = re.compile(r"^(\d{4})_(\w+)\.(sql|py)$")
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version int(11) NOT NULL,
+  name varchar(255) NOT NULL,
+  applied_at datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (version)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+CREATE_PROGRESS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migration_progress (
+  version int(11) NOT NULL,
+  statements_done int(11) NOT NULL,
+  PRIMARY KEY (version)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# Ошибки, означающие, что оператор уже выполнялся: дубликат имени индекса
+# или колонки и удаление несуществующего индекса. Так прощается только
+# первый оператор после сохранённого прогресса — если процесс прервался
+# между DDL и записью прогресса.
+ALREADY_APPLIED_ERRORS = (1060, 1061, 1091)
+
+Migration = namedtuple("Migration", "version name path")
+
+
+def available(directory=MIGRATIONS_DIR):
+    """Все миграции каталога по возрастанию версии"""
+    found = []
+    for filename in os.listdir(directory):
+        m = FILE_RE.match(filename)
+        if m:
+            found.append(Migration(int(m.group(1)), m.group(2), os.path.join(directory, filename)))
+    found.sort()
+    versions = [m.version for m in found]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Повторяющиеся номера миграций в {directory}")
+    return found
+
+
+def applied(conn):
+    """Номера уже применённых миграций"""
+    cur = conn.cursor()
+    try:
+        cur.execute(CREATE_MIGRATIONS_TABLE)
+        cur.execute("SELECT version FROM schema_migrations")
+        return {row[0] for row in cur.fetchall()}
+    finally:
+        cur.close()
+
+
+def pending(conn, directory=MIGRATIONS_DIR):
+    done = applied(conn)
+    return [m for m in available(directory) if m.version not in done]
+
+
+def sql_statements(text):
+    """Операторы SQL-файла: комментарии «--» отбрасываются, разделитель — «;» в конце строки"""
+    lines = [line for line in text.splitlines() if not line.strip().startswith("--")]
+    return [s.strip() for s in re.split(r";\s*$", "\n".join(lines), flags=re.M) if s.strip()]
+
+
+def _apply_sql(conn, migration):
+    with open(migration.path, encoding="utf-8") as f:
+        statements = sql_statements(f.read())
+    cur = conn.cursor()
+    try:
+        cur.execute(CREATE_PROGRESS_TABLE)
+        cur.execute("SELECT statements_done FROM schema_migration_progress WHERE version = %s",
+                    (migration.version,))
+        row = cur.fetchone()
+        done = row[0] if row else 0
+        for index, statement in enumerate(statements[done:], done):
+            try:
+                cur.execute(statement)
+            except Exception as e:
+                if not (index == done and getattr(e, "errno", None) in ALREADY_APPLIED_ERRORS):
+                    raise
+            cur.execute("INSERT INTO schema_migration_progress (version, statements_done) VALUES (%s, %s) "
+                        "ON DUPLICATE KEY UPDATE statements_done = VALUES(statements_done)",
+                        (migration.version, index + 1))
+            conn.commit()
+    finally:
+        cur.close()
+
+
+def apply(conn, migration):
+    if migration.path.endswith(".sql"):
+        _apply_sql(conn, migration)
+    else:
+        spec = importlib.util.spec_from_file_location(f"migration_{migration.version:04d}", migration.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.upgrade(conn)
+
+    cur = conn.cursor()
+    try:
+        cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                    (migration.version, migration.name))
+        if migration.path.endswith(".sql"):
+            cur.execute("DELETE FROM schema_migration_progress WHERE version = %s", (migration.version,))
+        conn.commit()
+    finally:
+        cur.close()
+
+
+def migrate(conn, target=None, directory=MIGRATIONS_DIR, on_apply=None):
+    """Применить ожидающие миграции (до версии target включительно); возвращает применённые"""
+    done = []
+    for migration in pending(conn, directory):
+        if target is not None and migration.version > target:
+            break
+        if on_apply:
+            on_apply(migration)
+        apply(conn, migration)
+        done.append(migration)
+    if done:
+        from database.schema import schema_cache
+        schema_cache.invalidate()
+    return done
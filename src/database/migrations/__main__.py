@@ -0,0 +1,38 @@
+# database/migrations/__main__.py — применение миграций из командной строки
+#
+#   cd src
+#   python -m database.migrations            # применить все ожидающие
+#   python -m database.migrations --list     # показать состояние
+#   python -m database.migrations --to 2     # применить до версии 2 включительно
+import argparse
+import sys
+
+from . import applied, available, migrate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m database.migrations",
+                                     description="Версионированные миграции схемы DataWise.")
+    parser.add_argument("--list", action="store_true", help="показать миграции и их состояние")
+    parser.add_argument("--to", type=int, default=None, metavar="ВЕРСИЯ", help="применить только до этой версии")
+    args = parser.parse_args(argv)
+
+    from database.database import connection
+    try:
+        with connection() as conn:
+            if args.list:
+                done = applied(conn)
+                for m in available():
+                    print(f"{m.version:04d} {m.name:<32} {'применена' if m.version in done else 'ожидает'}")
+                return 0
+            applied_now = migrate(conn, target=args.to,
+                                  on_apply=lambda m: print(f"Применяется {m.version:04d} {m.name}..."))
+    except Exception as e:
+        print(f"Миграция не выполнена: {e}", file=sys.stderr)
+        return 1
+    print(f"Применено миграций: {len(applied_now)}" if applied_now else "Схема в актуальном состоянии")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
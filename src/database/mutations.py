@@ -0,0 +1,124 @@
+# database/mutations.py — изменение строк из приложения вместе с производными таблицами
+#
+# Каждая функция выполняет изменение и пересчёт зависимых данных (сводка
+# user_solve_summary) в одной транзакции. Возвращает тот же словарь, что и
+# QueryExecutor.query(fetch="none"): {'rowcount': ..., 'lastrowid': ...}.
+# С returning=[колонки] insert_row/update_row добавляют 'row' — строку
+# (id, *колонки), перечитанную по первичному ключу в той же транзакции,
+# чтобы вид мог подставить её, не перезагружая таблицу.
+# Правки и удаления записываются в журнал change_log (database/changes.py),
+# по которому открытые окна обновляют счётчики без повторных запросов.
+from contextlib import contextmanager
+
+from database import changes, summary
+
+
+@contextmanager
+def _transaction(conn):
+    cur = conn.cursor()
+    conn.start_transaction()
+    try:
+        yield cur
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def _select_row(cur, table, columns, row_id):
+    cols = ', '.join(['`id`'] + [f"`{c}`" for c in columns])
+    cur.execute(f"SELECT {cols} FROM `{table}` WHERE id=%s", (row_id,))
+    return cur.fetchone()
+
+
+def _derived(conn):
+    """Какие производные таблицы есть: (сводка, журнал изменений).
+
+    Проверяется до начала транзакции и через то же соединение: если кэш
+    схемы устарел, он перечитывается через conn, а не ждёт второго
+    соединения из пула, занятого такими же запросами.
+    """
+    return summary.exists(conn), changes.exists(conn)
+
+
+def insert_row(conn, table, values, returning=None):
+    """INSERT одной строки; values — {колонка: значение}"""
+    cols = ', '.join(f"`{c}`" for c in values)
+    ph = ', '.join(['%s'] * len(values))
+    has_summary, _ = _derived(conn)
+    with _transaction(conn) as cur:
+        cur.execute(f"INSERT INTO `{table}` ({cols}) VALUES ({ph})", list(values.values()))
+        result = {'rowcount': cur.rowcount, 'lastrowid': cur.lastrowid}
+        if has_summary:
+            summary.refresh_users(cur, summary.affected_users(cur, table, [result['lastrowid']]))
+        if returning is not None:
+            result['row'] = _select_row(cur, table, returning, result['lastrowid'])
+    return result
+
+
+def insert_rows(conn, table, columns, rows):
+    """INSERT пачки строк одним executemany; rows — кортежи значений в порядке columns"""
+    cols = ', '.join(f"`{c}`" for c in columns)
+    ph = ', '.join(['%s'] * len(columns))
+    has_summary, _ = _derived(conn)
+    with _transaction(conn) as cur:
+        cur.executemany(f"INSERT INTO `{table}` ({cols}) VALUES ({ph})", rows)
+        result = {'rowcount': cur.rowcount, 'lastrowid': cur.lastrowid}
+        if has_summary:
+            summary.refresh_users(cur, summary.users_in_rows(table, columns, rows))
+    return result
+
+
+def update_row(conn, table, row_id, values, returning=None):
+    """UPDATE строки по id; values — {колонка: новое значение}"""
+    result = update_rows(conn, table, [row_id], values, returning)
+    result['lastrowid'] = row_id
+    if returning is not None:
+        result['row'] = result.pop('rows')[0] if result['rows'] else None
+    return result
+
+
+def update_rows(conn, table, ids, values, returning=None):
+    """Одинаковые values для всех строк с этими id — один UPDATE ... WHERE id IN (...).
+    С returning результат содержит 'rows' — изменённые строки, перечитанные одним запросом"""
+    ids = list(ids)
+    if not ids:
+        return {'rowcount': 0, 'lastrowid': None}
+    set_clause = ', '.join(f"`{c}`=%s" for c in values)
+    ph = ', '.join(['%s'] * len(ids))
+    has_summary, has_log = _derived(conn)
+    with _transaction(conn) as cur:
+        before = summary.affected_users(cur, table, ids) if has_summary else set()
+        logged = changes.rows_by_id(cur, table, ids) if has_log else None
+        cur.execute(f"UPDATE `{table}` SET {set_clause} WHERE id IN ({ph})", (*values.values(), *ids))
+        result = {'rowcount': cur.rowcount, 'lastrowid': None}
+        if has_summary:
+            summary.refresh_users(cur, before | summary.affected_users(cur, table, ids))
+        if logged is not None:
+            changes.log(cur, table, 'update', logged, changes.rows_by_id(cur, table, ids))
+        if returning is not None:
+            cols = ', '.join(['`id`'] + [f"`{c}`" for c in returning])
+            cur.execute(f"SELECT {cols} FROM `{table}` WHERE id IN ({ph}) ORDER BY id", ids)
+            result['rows'] = cur.fetchall()
+    return result
+
+
+def delete_rows(conn, table, ids):
+    """DELETE строк по списку id"""
+    ids = list(ids)
+    if not ids:
+        return {'rowcount': 0, 'lastrowid': None}
+    ph = ', '.join(['%s'] * len(ids))
+    has_summary, has_log = _derived(conn)
+    with _transaction(conn) as cur:
+        before = summary.affected_users(cur, table, ids) if has_summary else set()
+        logged = changes.rows_by_id(cur, table, ids) if has_log else None
+        cur.execute(f"DELETE FROM `{table}` WHERE id IN ({ph})", ids)
+        result = {'rowcount': cur.rowcount, 'lastrowid': None}
+        if has_summary:
+            summary.refresh_users(cur, before)
+        if logged is not None:
+            changes.log(cur, table, 'delete', logged)
+    return result
@@ -0,0 +1,411 @@
+# database/replica.py — локальная копия таблиц в SQLite для чтения
+#
+#   cd src
+#   python -m database.replica            # догрузить новые строки
+#   python -m database.replica --full     # и сверить контрольные суммы
+#
+# При DB_READ_BACKEND=replica соединения для чтения (connection(read_only=True):
+# срез отчётов, главная, дашборд) открываются на файле SQLite, а не на
+# удалённом сервере. Изменения данных всегда идут в MySQL.
+#
+# Синхронизация:
+#   * новые строки — по водяному знаку id: WHERE id > последний скопированный;
+#   * изменения и удаления — сверкой контрольных сумм по диапазонам id
+#     (сумма CRC32 строк; XOR не подходит — CRC линеен, и одинаковые правки
+#     двух строк взаимно гасились бы). Сервер считает суммы сам, по сети
+#     идут только они; расходящиеся диапазоны перечитываются целиком.
+import datetime
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+from database.database import REPLICA_CONFIG, connection
+
+TABLES = ("users", "programming_tasks", "competition", "competition_tasks", "participation", "decisions")
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "datawise", "replica.sqlite3")
+BATCH = 5000   # строк в одном запросе догрузки
+CHUNK = 1000   # ширина диапазона id для контрольной суммы
+NULL_MARK = "<NULL>"  # без обратной косой черты: в литерале MySQL '\N' превратился бы в 'N'
+
+STATE_DDL = """
+CREATE TABLE IF NOT EXISTS _replica_state (
+  table_name TEXT PRIMARY KEY,
+  columns TEXT NOT NULL,
+  watermark INTEGER NOT NULL DEFAULT 0,
+  synced_at REAL,
+  checksum_at REAL
+)
+"""
+
+# тип MySQL (DATA_TYPE) -> объявленный тип колонки в SQLite
+SQLITE_TYPES = {
+    'tinyint': 'INTEGER', 'smallint': 'INTEGER', 'mediumint': 'INTEGER', 'int': 'INTEGER', 'bigint': 'INTEGER',
+    'decimal': 'REAL', 'float': 'REAL', 'double': 'REAL',
+    'date': 'DATE', 'datetime': 'DATETIME', 'timestamp': 'DATETIME',
+}
+
+# даты хранятся строками ISO и при чтении превращаются обратно в date/datetime,
+# как их отдаёт mysql-connector
+sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" "))
+sqlite3.register_converter("DATE", lambda b: datetime.date.fromisoformat(b.decode()))
+sqlite3.register_converter("DATETIME", lambda b: datetime.datetime.fromisoformat(b.decode()))
+
+
+def replica_path():
+    return os.path.expanduser(REPLICA_CONFIG.get('path') or DEFAULT_PATH)
+
+
+def _year(value):
+    if value is None:
+        return None
+    return value.year if hasattr(value, 'year') else int(str(value)[:4])
+
+
+def _open(path, read_only=False):
+    if read_only:
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, detect_types=sqlite3.PARSE_DECLTYPES,
+                             timeout=30, isolation_level=None, check_same_thread=False)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, timeout=30, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")  # чтение не ждёт синхронизацию и наоборот
+    db.create_function("YEAR", 1, _year, deterministic=True)
+    return db
+
+
+# ============================= СОЕДИНЕНИЕ ДЛЯ ЧТЕНИЯ =============================
+class ReplicaCursor:
+    """Курсор SQLite с интерфейсом курсора mysql-connector: %s, dictionary, column_names"""
+
+    def __init__(self, cur, dictionary=False):
+        self._cur = cur
+        self.dictionary = dictionary
+        self.column_names = ()
+
+    def execute(self, sql, params=()):
+        self._cur.execute(sql.replace("%s", "?"), tuple(params or ()))
+        self.column_names = tuple(d[0] for d in self._cur.description or ())
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+    def _row(self, row):
+        if row is None or not self.dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def fetchone(self):
+        return self._row(self._cur.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(r) for r in self._cur.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cur.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cur.close()
+
+
+class ReplicaConnection:
+    """Соединение с копией только для чтения; подменяет соединение из пула"""
+
+    connection_id = None  # KILL QUERY к файлу не применим — отменённый запрос просто дочитывается
+
+    def __init__(self, path):
+        self._db = _open(path, read_only=True)
+
+    @property
+    def in_transaction(self):
+        return self._db.in_transaction
+
+    def cursor(self, dictionary=False, **kwargs):
+        return ReplicaCursor(self._db.cursor(), dictionary)
+
+    def start_transaction(self, **kwargs):
+        # в режиме WAL все чтения одной транзакции видят один и тот же срез
+        self._db.execute("BEGIN")
+
+    def commit(self):
+        if self._db.in_transaction:
+            self._db.execute("COMMIT")
+
+    def rollback(self):
+        if self._db.in_transaction:
+            self._db.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_ready = False
+
+
+def ready(path=None):
+    """Заполнена ли копия: каждая из таблиц хотя бы раз синхронизирована"""
+    path = path or replica_path()
+    if not os.path.exists(path):
+        return False
+    try:
+        db = _open(path, read_only=True)
+        try:
+            rows = db.execute("SELECT table_name FROM _replica_state WHERE synced_at IS NOT NULL").fetchall()
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return False
+    return set(TABLES) <= {r[0] for r in rows}
+
+
+def read_connection():
+    """Соединение с копией или None, если она ещё не заполнена (тогда читаем с сервера)"""
+    global _ready
+    path = replica_path()
+    if not _ready:
+        _ready = ready(path)
+    return ReplicaConnection(path) if _ready else None
+
+
+# ============================= СИНХРОНИЗАЦИЯ =============================
+def _text(value):
+    """Значение колонки так, как его видит CONCAT_WS в MySQL"""
+    if value is None:
+        return NULL_MARK
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(" ")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return str(value)
+
+
+def _select_list(columns):
+    """Колонки для чтения с сервера. SET читается строкой, как его видит CONCAT_WS
+    (значения в порядке объявления), а не множеством mysql-connector: иначе
+    порядок значений в копии и в контрольной сумме разошёлся бы"""
+    return ", ".join(f"CAST(`{c.name}` AS CHAR) AS `{c.name}`" if c.data_type == 'set' else f"`{c.name}`"
+                     for c in columns)
+
+
+def row_checksum(row):
+    return zlib.crc32("#".join(_text(v) for v in row).encode("utf-8"))
+
+
+class Replica:
+    """Заполнение и обновление файла копии. Один экземпляр на процесс — replica()"""
+
+    def __init__(self, path=None, checksum_interval=None):
+        self.path = path or replica_path()
+        self.checksum_interval = (REPLICA_CONFIG.get('checksum_interval', 3600)
+                                  if checksum_interval is None else checksum_interval)
+        self._lock = threading.Lock()
+
+    def sync(self, full_check=None, blocking=True):
+        """Догрузить новые строки; сверить суммы, если full_check или подошёл срок.
+
+        Возвращает {таблица: {'added': n, 'repaired': диапазонов, 'checked': bool}}.
+        blocking=False — если синхронизация уже идёт в другом потоке, не ждать
+        её, а сразу вернуть None.
+        """
+        if not self._lock.acquire(blocking):
+            return None
+        try:
+            return self._sync(full_check)
+        finally:
+            self._lock.release()
+
+    def _sync(self, full_check):
+        global _ready
+        from database.schema import schema_cache
+        stats = {}
+        with connection() as src:
+            db = _open(self.path)
+            try:
+                db.execute(STATE_DDL)
+                for table in TABLES:
+                    schema = schema_cache.columns(table, src)
+                    columns = [c.name for c in schema]
+                    types = [SQLITE_TYPES.get(c.data_type, 'TEXT') for c in schema]
+                    select = _select_list(schema)
+                    state = self._prepare(db, table, columns, types)
+                    added = self._pull_new(src, db, table, columns, select, state['watermark'])
+                    due = full_check if full_check is not None else (
+                        state['checksum_at'] is None or time.time() - state['checksum_at'] >= self.checksum_interval)
+                    repaired = self._checksum_pass(src, db, table, columns, select) if due else 0
+                    db.execute("UPDATE _replica_state SET synced_at = ?"
+                               + (", checksum_at = ?" if due else "") + " WHERE table_name = ?",
+                               (time.time(), time.time(), table) if due else (time.time(), table))
+                    stats[table] = {'added': added, 'repaired': repaired, 'checked': bool(due)}
+            finally:
+                db.close()
+        _ready = True
+        return stats
+
+    @staticmethod
+    def _prepare(db, table, columns, types):
+        """Создать таблицу копии; если колонки на сервере изменились — пересоздать с нуля"""
+        signature = ",".join(f"{c}:{t}" for c, t in zip(columns, types))
+        row = db.execute("SELECT columns, watermark, checksum_at FROM _replica_state WHERE table_name = ?",
+                         (table,)).fetchone()
+        if row is None or row[0] != signature:
+            cols = ", ".join(f"`{c}` {t}" + (" PRIMARY KEY" if c == 'id' else "") for c, t in zip(columns, types))
+            db.execute("BEGIN")
+            db.execute(f"DROP TABLE IF EXISTS `{table}`")
+            db.execute(f"CREATE TABLE `{table}` ({cols})")
+            db.execute("INSERT OR REPLACE INTO _replica_state (table_name, columns, watermark) VALUES (?, ?, 0)",
+                       (table, signature))
+            db.execute("COMMIT")
+            return {'watermark': 0, 'checksum_at': None}
+        return {'watermark': row[1], 'checksum_at': row[2]}
+
+    @staticmethod
+    def _insert_sql(table, columns):
+        cols = ", ".join(f"`{c}`" for c in columns)
+        return f"INSERT OR REPLACE INTO `{table}` ({cols}) VALUES ({', '.join(['?'] * len(columns))})"
+
+    def _pull_new(self, src, db, table, columns, select, watermark):
+        """Строки с id больше водяного знака, пачками по BATCH"""
+        insert = self._insert_sql(table, columns)
+        cur = src.cursor()
+        added = 0
+        try:
+            while True:
+                cur.execute(f"SELECT {select} FROM `{table}` WHERE id > %s ORDER BY id LIMIT %s", (watermark, BATCH))
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                watermark = rows[-1][columns.index('id')]
+                db.execute("BEGIN")
+                db.executemany(insert, rows)
+                db.execute("UPDATE _replica_state SET watermark = ? WHERE table_name = ?", (watermark, table))
+                db.execute("COMMIT")
+                added += len(rows)
+                if len(rows) < BATCH:
+                    break
+        finally:
+            cur.close()
+        return added
+
+    def _checksum_pass(self, src, db, table, columns, select):
+        """Сверить суммы по диапазонам id и перечитать расходящиеся; возвращает их число"""
+        fields = ", ".join(f"COALESCE(`{c}`, '{NULL_MARK}')" for c in columns)
+        cur = src.cursor()
+        try:
+            cur.execute(f"SELECT id DIV %s AS chunk, COUNT(*), SUM(CRC32(CONCAT_WS('#', {fields}))) "
+                        f"FROM `{table}` GROUP BY chunk", (CHUNK,))
+            remote = {int(chunk): (count, int(crc)) for chunk, count, crc in cur.fetchall()}
+
+            local = {}
+            cols = ", ".join(f"`{c}`" for c in columns)
+            id_pos = columns.index('id')
+            for row in db.execute(f"SELECT {cols} FROM `{table}`"):
+                chunk = row[id_pos] // CHUNK
+                count, crc = local.get(chunk, (0, 0))
+                local[chunk] = (count + 1, crc + row_checksum(row))
+
+            stale = sorted(c for c in remote.keys() | local.keys() if remote.get(c) != local.get(c))
+            insert = self._insert_sql(table, columns)
+            for chunk in stale:
+                lo, hi = chunk * CHUNK, (chunk + 1) * CHUNK
+                cur.execute(f"SELECT {select} FROM `{table}` WHERE id >= %s AND id < %s", (lo, hi))
+                rows = cur.fetchall()
+                db.execute("BEGIN")
+                db.execute(f"DELETE FROM `{table}` WHERE id >= ? AND id < ?", (lo, hi))
+                db.executemany(insert, rows)
+                db.execute("COMMIT")
+        finally:
+            cur.close()
+        return len(stale)
+
+    def status(self):
+        """Состояние копии по таблицам: строк, водяной знак, время синхронизации и сверки"""
+        if not os.path.exists(self.path):
+            return {}
+        db = _open(self.path, read_only=True)
+        try:
+            result = {}
+            for table, watermark, synced_at, checksum_at in db.execute(
+                    "SELECT table_name, watermark, synced_at, checksum_at FROM _replica_state"):
+                rows = db.execute(f"SELECT COUNT(*) FROM `{table}`").fetchone()[0]
+                result[table] = {'rows': rows, 'watermark': watermark,
+                                 'synced_at': synced_at, 'checksum_at': checksum_at}
+            return result
+        finally:
+            db.close()
+
+
+_replica = None
+_replica_lock = threading.Lock()
+
+
+def replica():
+    """Общий на процесс экземпляр Replica"""
+    global _replica
+    with _replica_lock:
+        if _replica is None:
+            _replica = Replica()
+        return _replica
+
+
+def enabled():
+    return REPLICA_CONFIG.get('backend') == 'replica'
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m database.replica",
+                                     description="Локальная копия таблиц DataWise в SQLite.")
+    parser.add_argument("--full", action="store_true", help="сверить контрольные суммы всех таблиц")
+    parser.add_argument("--status", action="store_true", help="показать состояние копии и выйти")
+    args = parser.parse_args(argv)
+
+    rep = replica()
+    if args.status:
+        state = rep.status()
+        if not state:
+            print(f"Копия не создана: {rep.path}")
+        for table, s in state.items():
+            synced = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(s['synced_at'])) if s['synced_at'] else "—"
+            print(f"{table:<18} {s['rows']:>10,} строк  id ≤ {s['watermark']:<10} синхронизация {synced}")
+        return 0
+
+    start = time.perf_counter()
+    try:
+        stats = rep.sync(full_check=True if args.full else None)
+    except Exception as e:
+        print(f"Синхронизация не выполнена: {e}", file=sys.stderr)
+        return 1
+    for table, s in stats.items():
+        print(f"{table:<18} новых строк: {s['added']:>8,}"
+              + (f"  перечитано диапазонов: {s['repaired']}" if s['checked'] else ""))
+    print(f"Копия {rep.path} обновлена за {time.perf_counter() - start:.1f} с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
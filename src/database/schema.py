@@ -0,0 +1,93 @@
+# database/schema.py — кэш метаданных схемы (таблицы, колонки, ключи)
+import threading
+import time
+from collections import namedtuple
+
+from database.database import connection
+
+SCHEMA_QUERY = """
+SELECT c.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE, c.COLUMN_TYPE, c.IS_NULLABLE,
+       c.COLUMN_KEY, c.EXTRA, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME
+FROM information_schema.COLUMNS c
+LEFT JOIN information_schema.KEY_COLUMN_USAGE k
+    ON k.TABLE_SCHEMA = c.TABLE_SCHEMA
+   AND k.TABLE_NAME = c.TABLE_NAME
+   AND k.COLUMN_NAME = c.COLUMN_NAME
+   AND k.REFERENCED_TABLE_NAME IS NOT NULL
+WHERE c.TABLE_SCHEMA = DATABASE()
+ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+"""
+
+Column = namedtuple("Column", "name data_type column_type nullable primary_key auto_increment ref_table ref_column")
+
+
+class SchemaCache:
+    """Таблицы и колонки текущей базы, загруженные одним запросом к information_schema.
+
+    Данные живут ttl секунд, после чего перечитываются при следующем обращении.
+    invalidate() сбрасывает кэш сразу — например, после изменения структуры таблиц.
+    Код, который уже держит соединение из пула, передаёт его в conn: тогда
+    перечитывание идёт через него, а не ждёт второго соединения из пула.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tables = None  # {таблица: [Column, ...]}
+        self._loaded_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._tables = None
+
+    def _schema(self, conn=None):
+        with self._lock:
+            if self._tables is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._tables = self._load(conn)
+                self._loaded_at = time.monotonic()
+            return self._tables
+
+    @staticmethod
+    def _load(conn=None):
+        if conn is None:
+            with connection() as conn:
+                return SchemaCache._load(conn)
+        cur = conn.cursor()
+        try:
+            cur.execute(SCHEMA_QUERY)
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+        tables = {}
+        for table, name, data_type, column_type, nullable, key, extra, ref_table, ref_column in rows:
+            cols = tables.setdefault(table, [])
+            if cols and cols[-1].name == name:
+                continue  # колонка входит в несколько внешних ключей
+            cols.append(Column(name, data_type, column_type, nullable == 'YES', key == 'PRI',
+                               'auto_increment' in (extra or ''), ref_table, ref_column))
+        return tables
+
+    def tables(self, conn=None):
+        return sorted(self._schema(conn))
+
+    def columns(self, table, conn=None):
+        return list(self._schema(conn).get(table, []))
+
+    def column(self, table, name, conn=None):
+        for col in self.columns(table, conn):
+            if col.name == name:
+                return col
+        return None
+
+    def column_names(self, table, with_id=False, conn=None):
+        """Имена колонок; служебный id по умолчанию не включается — его не показывают и не редактируют"""
+        return [c.name for c in self.columns(table, conn) if with_id or c.name.lower() != 'id']
+
+    def primary_key(self, table, conn=None):
+        return [c.name for c in self.columns(table, conn) if c.primary_key]
+
+    def foreign_keys(self, table, conn=None):
+        return {c.name: (c.ref_table, c.ref_column) for c in self.columns(table, conn) if c.ref_table}
+
+
+schema_cache = SchemaCache()
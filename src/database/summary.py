@@ -0,0 +1,133 @@
+# database/summary.py — сводка решений по участникам (user_solve_summary)
+#
+#   cd src
+#   python -m database.summary --rebuild
+#
+# Таблица хранит для каждого участника число решений OK, число всех решений
+# и сумму баллов за решённые задачи. Рейтинги отчётов читают её вместо
+# GROUP BY по всей таблице decisions. Приложение обновляет строки только
+# затронутых участников (database/mutations.py); --rebuild пересчитывает
+# всё заново, если данные меняли в обход приложения. Таблицу создаёт
+# миграция 0003 (python -m database.migrations).
+import argparse
+import sys
+
+SUMMARY_TABLE = "user_solve_summary"
+
+CREATE_SUMMARY_TABLE = """
+CREATE TABLE IF NOT EXISTS user_solve_summary (
+  id_users int(11) NOT NULL COMMENT 'Участник',
+  solved int(11) NOT NULL DEFAULT 0 COMMENT 'Решений со статусом OK',
+  attempts int(11) NOT NULL DEFAULT 0 COMMENT 'Всего решений',
+  points int(11) NOT NULL DEFAULT 0 COMMENT 'Баллы за решения OK',
+  PRIMARY KEY (id_users)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Сводка решений по участникам'
+"""
+
+# {where} — пусто для полной перестройки или условие на d.id_users
+SUMMARY_SELECT = """
+SELECT d.id_users,
+       COUNT(CASE WHEN d.status = 'OK' THEN 1 END) AS solved,
+       COUNT(*) AS attempts,
+       COALESCE(SUM(CASE WHEN d.status = 'OK' THEN pt.points END), 0) AS points
+FROM decisions d
+LEFT JOIN programming_tasks pt ON pt.id = d.id_programminng_tasks
+WHERE d.id_users IS NOT NULL{where}
+GROUP BY d.id_users
+"""
+
+INSERT_SUMMARY = "INSERT INTO user_solve_summary (id_users, solved, attempts, points)"
+
+
+def _in(ids):
+    return ', '.join(['%s'] * len(ids))
+
+
+def exists(conn=None):
+    """Создана ли таблица сводки (по кэшу схемы, без лишнего запроса).
+    conn — уже взятое соединение, через него кэш перечитывается при истечении"""
+    from database.schema import schema_cache
+    return SUMMARY_TABLE in schema_cache.tables(conn)
+
+
+def affected_users(cur, table, ids):
+    """Участники, чья сводка зависит от строк ids таблицы table.
+
+    Вызывается до изменения (старые значения) и после (новые) — так учитывается
+    и перенос решения от одного участника к другому.
+    """
+    ids = [i for i in ids if i is not None]
+    if not ids:
+        return set()
+    if table == 'users':
+        return set(ids)
+    if table == 'decisions':
+        cur.execute(f"SELECT DISTINCT id_users FROM decisions WHERE id IN ({_in(ids)})", ids)
+    elif table == 'programming_tasks':
+        # баллы задачи входят в сумму каждого, кто её решал
+        cur.execute(f"SELECT DISTINCT id_users FROM decisions WHERE id_programminng_tasks IN ({_in(ids)})", ids)
+    else:
+        return set()
+    return {row[0] for row in cur.fetchall() if row[0] is not None}
+
+
+def users_in_rows(table, columns, rows):
+    """Участники, затронутые вставкой строк rows — без запроса к БД"""
+    if table == 'decisions' and 'id_users' in columns:
+        pos = list(columns).index('id_users')
+        return {row[pos] for row in rows if row[pos] is not None}
+    return set()  # новые участники и задачи ещё ни в одном решении не встречаются
+
+
+def refresh_users(cur, user_ids):
+    """Пересчитать строки сводки для перечисленных участников (внутри транзакции вызывающего)"""
+    user_ids = sorted(user_ids)
+    if not user_ids:
+        return
+    ph = _in(user_ids)
+    cur.execute(f"DELETE FROM user_solve_summary WHERE id_users IN ({ph})", user_ids)
+    cur.execute(f"{INSERT_SUMMARY} {SUMMARY_SELECT.format(where=f' AND d.id_users IN ({ph})')}", user_ids)
+
+
+def rebuild(conn):
+    """Создать таблицу при необходимости и пересчитать сводку целиком; возвращает число строк"""
+    cur = conn.cursor()
+    try:
+        cur.execute(CREATE_SUMMARY_TABLE)
+        conn.start_transaction()
+        cur.execute("DELETE FROM user_solve_summary")
+        cur.execute(f"{INSERT_SUMMARY} {SUMMARY_SELECT.format(where='')}")
+        rows = cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    from database.schema import schema_cache
+    schema_cache.invalidate()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m database.summary",
+                                     description="Сводка решений по участникам (user_solve_summary).")
+    parser.add_argument("--rebuild", action="store_true", help="пересчитать сводку по таблице decisions")
+    args = parser.parse_args(argv)
+    if not args.rebuild:
+        parser.print_help()
+        return 0
+
+    from database.database import connection
+    try:
+        with connection() as conn:
+            rows = rebuild(conn)
+    except Exception as e:
+        print(f"Не удалось перестроить сводку: {e}", file=sys.stderr)
+        return 1
+    print(f"Сводка перестроена: {rows} участников")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
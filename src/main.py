@@ -1,27 +1,37 @@
 # main.py — Полностью рабочая финальная версия DataWise (ноябрь 2025)
 import sys
+import threading
 from datetime import datetime
-import mysql.connector
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from importlib.util import find_spec
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QStackedWidget, QListWidget, QMessageBox,
-    QTextEdit, QTableWidget, QTableWidgetItem, QDialog, QFormLayout,
-    QLineEdit, QComboBox, QHeaderView, QFrame
+    QTextEdit, QTableView, QDialog, QFormLayout,
+    QLineEdit, QComboBox, QHeaderView, QFrame, QProgressBar, QListWidgetItem,
+    QFileDialog, QProgressDialog
 )
-from PySide6.QtCore import Qt, QObject, Signal
+from PySide6.QtCore import Qt, QObject, QTimer, Signal
 from PySide6.QtGui import QFont, QAction
 
+from database.queries import HOME_STATS_QUERY, COMPETITIONS_BY_YEAR_QUERY
+from database import mutations, replica
+from database.database import REPLICA_CONFIG
+from database.schema import schema_cache
+from app.workers import get_executor
+from app.table_model import PagedTableModel
+from app import change_feed
+
 # ============================= ОТЧЁТЫ =============================
+# Сами отчёты (ReportLab, шрифты) импортируются в фоне при первой генерации,
+# здесь — только лёгкая очередь и проверка, что ReportLab установлен
 try:
-    from app.reports import DetailedReport, StatsReport
-    REPORTS_AVAILABLE = True
+    from app.report_queue import ReportQueue
+    REPORTS_AVAILABLE = find_spec("reportlab") is not None
+    if not REPORTS_AVAILABLE:
+        print("Модуль отчётов недоступен: не установлен reportlab")
 except ImportError as e:
     REPORTS_AVAILABLE = False
-    DetailedReport = StatsReport = None
     print("Модуль отчётов не найден:", e)
 
 # ============================= ЛОГИРОВАНИЕ В UI =============================
@@ -47,6 +57,10 @@ ui_logger = UILogger()
 
 # ============================= ГЛАВНАЯ ПАНЕЛЬ =============================
 class HomePanel(QWidget):
+    # таблица -> карточка; дельты ленты изменений двигают счётчики
+    STAT_TABLES = {"users": "users", "competition": "competitions",
+                   "programming_tasks": "tasks", "decisions": "decisions"}
+
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout(self)
@@ -66,13 +80,15 @@ class HomePanel(QWidget):
         # Статистика карточками
         stats_layout = QHBoxLayout()
         stats = [
-            ("Участников", "SELECT COUNT(*) FROM users"),
-            ("Соревнований", "SELECT COUNT(*) FROM competition"),
-            ("Задач", "SELECT COUNT(*) FROM programming_tasks"),
-            ("Решений", "SELECT COUNT(*) FROM decisions")
+            ("Участников", "users"),
+            ("Соревнований", "competitions"),
+            ("Задач", "tasks"),
+            ("Решений", "decisions")
         ]
+        self.stat_labels = {}
+        self.stats = {}
 
-        for text, query in stats:
+        for text, key in stats:
             frame = QFrame()
             frame.setFixedSize(200, 130)
             frame.setStyleSheet("""
@@ -95,24 +111,7 @@ class HomePanel(QWidget):
             vbox.addWidget(lbl_text)
             vbox.addWidget(lbl_val)
             stats_layout.addWidget(frame)
-
-            # Загрузка данных
-            try:
-                conn = mysql.connector.connect(
-                    host='pma.morohin.info',
-                    user='phpmyadmin',
-                    password='0907',
-                    database='phpmyadmin'
-                )
-                cur = conn.cursor()
-                cur.execute(query)
-                value = cur.fetchone()[0]
-                lbl_val.setText(str(value))
-                cur.close()
-                conn.close()
-            except Exception as e:
-                lbl_val.setText("Err")
-                print("Ошибка статистики:", e)
+            self.stat_labels[key] = lbl_val
 
         # Журнал
         log_label = QLabel("Журнал операций")
@@ -131,9 +130,10 @@ class HomePanel(QWidget):
             font-size: 11pt;
         """)
 
-        ui_logger.log_signal.connect(lambda msg, typ: self.log_view.append(
-            f"<span style='color:{'#27ae60' if typ=='add' else '#3498db' if typ=='edit' else '#e74c3c' if typ=='delete' else '#7f8c8d'}'>{msg}</span>"
-        ))
+        # Вкладка может быть создана позже первых записей — показываем и их
+        for msg, typ in ui_logger.history:
+            self.append_log(msg, typ)
+        ui_logger.log_signal.connect(self.append_log)
 
         layout.addWidget(title)
         layout.addWidget(subtitle)
@@ -142,8 +142,45 @@ class HomePanel(QWidget):
         layout.addWidget(self.log_view)
         layout.addStretch()
 
+        # Счётчики грузятся в фоне одним запросом — окно не ждёт БД;
+        # дальше их обновляют дельты ленты изменений без новых COUNT(*)
+        if change_feed.enabled():
+            change_feed.get_feed().subscribe("home_stats", HOME_STATS_QUERY, self.show_stats, self.apply_delta,
+                                             tables=dict.fromkeys(self.STAT_TABLES, ()), fetch="one",
+                                             on_error=self.show_stats_error)
+        else:
+            get_executor().query(HOME_STATS_QUERY, fetch="one", dictionary=True, key="home_stats", read_only=True,
+                                 on_result=self.show_stats, on_error=self.show_stats_error)
+
+    def append_log(self, msg, typ):
+        self.log_view.append(
+            f"<span style='color:{'#27ae60' if typ=='add' else '#3498db' if typ=='edit' else '#e74c3c' if typ=='delete' else '#7f8c8d'}'>{msg}</span>"
+        )
+
+    def show_stats(self, row):
+        self.stats = dict(row)
+        for key, lbl in self.stat_labels.items():
+            lbl.setText(str(row[key]))
+
+    def apply_delta(self, delta):
+        if not self.stats:
+            return
+        for table, key in self.STAT_TABLES.items():
+            change = delta.count_change(table)
+            if change:
+                self.stats[key] += change
+                self.stat_labels[key].setText(str(self.stats[key]))
+
+    def show_stats_error(self, msg):
+        for lbl in self.stat_labels.values():
+            lbl.setText("Err")
+        print("Ошибка статистики:", msg)
+
 # ============================= ДАШБОРД =============================
 class DashboardView(QWidget):
+    # колонки новых строк, нужные графику (id приходит всегда)
+    FEED_TABLES = {"competition": ("date_of_the_event",)}
+
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout(self)
@@ -153,38 +190,101 @@ class DashboardView(QWidget):
         title.setFont(QFont("Segoe UI", 28, QFont.Bold))
         title.setStyleSheet("color: #1a365d; margin-bottom: 20px;")
 
+        # matplotlib загружается только при первом открытии дашборда
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
         self.canvas = FigureCanvas(Figure(figsize=(10, 6)))
         self.ax = self.canvas.figure.add_subplot(111)
 
         layout.addWidget(title)
         layout.addWidget(self.canvas)
 
-        self.refresh_plot()
+        self.by_year = {}      # год -> число соревнований, как в COMPETITIONS_BY_YEAR_QUERY
+        self.bars = {}         # год -> столбец графика
+        # Первый раз — полный запрос, дальше столбцы двигают дельты ленты изменений
+        if change_feed.enabled():
+            change_feed.get_feed().subscribe("dashboard_plot", COMPETITIONS_BY_YEAR_QUERY, self.draw_plot,
+                                             self.apply_delta, tables=self.FEED_TABLES, on_error=self.show_error)
+        else:
+            self.refresh_plot()
 
     def refresh_plot(self):
-        try:
-            conn = mysql.connector.connect(host='pma.morohin.info', user='phpmyadmin',
-                                         password='0907', database='phpmyadmin')
-            cur = conn.cursor(dictionary=True)
-            cur.execute("SELECT YEAR(date_of_the_event) as year, COUNT(*) as cnt FROM competition GROUP BY year ORDER BY year")
-            data = cur.fetchall()
+        get_executor().query(COMPETITIONS_BY_YEAR_QUERY, dictionary=True, key="dashboard_plot", read_only=True,
+                             on_result=self.draw_plot, on_error=self.show_error)
+
+    def draw_plot(self, data):
+        self.by_year = {row['year']: row['cnt'] for row in data}
+        self.redraw()
+
+    def apply_delta(self, delta):
+        changed = {}
+        for row in delta.inserted.get("competition", ()):
+            year = event_year(row['date_of_the_event'])
+            changed[year] = changed.get(year, 0) + 1
+        for c in delta.for_table("competition", "delete") + delta.for_table("competition", "update"):
+            old = event_year(c['before']['date_of_the_event'])
+            changed[old] = changed.get(old, 0) - 1
+            if c['after'] is not None:
+                new = event_year(c['after']['date_of_the_event'])
+                changed[new] = changed.get(new, 0) + 1
+        changed = {year: n for year, n in changed.items() if n}
+        if not changed:
+            return
+        for year, n in changed.items():
+            self.by_year[year] = self.by_year.get(year, 0) + n
+            if not self.by_year[year]:
+                del self.by_year[year]
+        if set(self.by_year) == set(self.bars):
+            # те же годы — меняем высоту столбцов, без перестройки осей
+            for year in changed:
+                self.bars[year].set_height(self.by_year[year])
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw_idle()
+        else:
+            self.redraw()
 
-            years = [row['year'] for row in data]
-            counts = [row['cnt'] for row in data]
+    def redraw(self):
+        try:
+            years = sorted(self.by_year, key=lambda y: (y is None, y))
+            counts = [self.by_year[y] for y in years]
 
             self.ax.clear()
-            self.ax.bar(years, counts, color='#4299e1', edgecolor='white')
+            bars = self.ax.bar(years, counts, color='#4299e1', edgecolor='white')
+            self.bars = dict(zip(years, bars))
             self.ax.set_title("Количество соревнований по годам", fontsize=16, pad=20)
             self.ax.set_xlabel("Год")
             self.ax.set_ylabel("Кол-во")
             self.ax.grid(True, axis='y', alpha=0.3)
             self.canvas.draw()
         except Exception as e:
-            self.ax.text(0.5, 0.5, f"Ошибка: {e}", transform=self.ax.transAxes,
-                        ha='center', va='center', fontsize=14, color='red')
-            self.canvas.draw()
+            self.show_error(str(e))
+
+    def show_error(self, msg):
+        self.ax.clear()
+        self.bars = {}
+        self.ax.text(0.5, 0.5, f"Ошибка: {msg}", transform=self.ax.transAxes,
+                     ha='center', va='center', fontsize=14, color='red')
+        self.canvas.draw()
+
+def event_year(value):
+    """Год даты соревнования: date из БД или строка из журнала изменений"""
+    if value is None:
+        return None
+    return value.year if hasattr(value, "year") else int(str(value)[:4])
 
 # ============================= ДИАЛОГИ =============================
+def field_hint(table_name, col):
+    """Подсказка к полю по кэшу схемы: тип колонки и, для внешнего ключа, куда он ссылается"""
+    info = schema_cache.column(table_name, col)
+    if not info:
+        return ""
+    hint = info.column_type
+    if info.ref_table:
+        hint += f" → {info.ref_table}.{info.ref_column}"
+    return hint
+
 class DynamicAddDataForm(QDialog):
     def __init__(self, table_name, columns, parent=None):
         super().__init__(parent)
@@ -197,12 +297,13 @@ class DynamicAddDataForm(QDialog):
         for col in columns:
             le = QLineEdit()
             le.setPlaceholderText(f"Введите {col}...")
+            le.setToolTip(field_hint(table_name, col))
             form.addRow(f"{col}:", le)
             self.fields[col] = le
 
-        btn = QPushButton("Сохранить")
-        btn.clicked.connect(self.save_data)
-        form.addRow(btn)
+        self.btn = QPushButton("Сохранить")
+        self.btn.clicked.connect(self.save_data)
+        form.addRow(self.btn)
         self.setLayout(form)
 
     def save_data(self):
@@ -211,24 +312,21 @@ class DynamicAddDataForm(QDialog):
             QMessageBox.warning(self, "Ошибка", "Все поля обязательны")
             return
 
-        try:
-            conn = mysql.connector.connect(host='pma.morohin.info', user='phpmyadmin',
-                                         password='0907', database='phpmyadmin')
-            cur = conn.cursor()
-            ph = ', '.join(['%s'] * len(self.columns))
-            cols = ', '.join(self.columns)
-            cur.execute(f"INSERT INTO `{self.table_name}` ({cols}) VALUES ({ph})", values)
-            conn.commit()
-            ui_logger.add(f"Добавлена запись в {self.table_name}")
-            QMessageBox.information(self, "Успех", "Запись добавлена")
-            self.accept()
-            if self.parent():
-                self.parent().refresh_table()
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", str(e))
-        finally:
-            if 'cur' in locals(): cur.close()
-            if 'conn' in locals(): conn.close()
+        row = dict(zip(self.columns, values))
+        self.btn.setEnabled(False)
+        get_executor().execute(lambda conn: mutations.insert_row(conn, self.table_name, row, returning=self.columns),
+                               write=True, on_result=self.saved, on_error=self.save_failed)
+
+    def saved(self, result):
+        ui_logger.add(f"Добавлена запись в {self.table_name}")
+        QMessageBox.information(self, "Успех", "Запись добавлена")
+        self.accept()
+        if self.parent():
+            self.parent().record_saved(self.table_name, result.get('row'))
+
+    def save_failed(self, msg):
+        self.btn.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", msg)
 
 class DynamicEditDataForm(QDialog):
     def __init__(self, table_name, columns, initial_data, parent=None):
@@ -242,12 +340,13 @@ class DynamicEditDataForm(QDialog):
         form = QFormLayout()
         for col in columns:
             le = QLineEdit(str(initial_data.get(col, '')) if initial_data.get(col) is not None else '')
+            le.setToolTip(field_hint(table_name, col))
             form.addRow(f"{col}:", le)
             self.fields[col] = le
 
-        btn = QPushButton("Сохранить изменения")
-        btn.clicked.connect(self.save_data)
-        form.addRow(btn)
+        self.btn = QPushButton("Сохранить изменения")
+        self.btn.clicked.connect(self.save_data)
+        form.addRow(self.btn)
         self.setLayout(form)
 
     def save_data(self):
@@ -256,27 +355,64 @@ class DynamicEditDataForm(QDialog):
             QMessageBox.warning(self, "Ошибка", "Все поля обязательны")
             return
 
-        try:
-            conn = mysql.connector.connect(host='pma.morohin.info', user='phpmyadmin',
-                                         password='0907', database='phpmyadmin')
-            cur = conn.cursor()
-            set_clause = ', '.join([f"`{c}`=%s" for c in self.columns])
-            cur.execute(f"UPDATE `{self.table_name}` SET {set_clause} WHERE id=%s", (*values, self.id_val))
-            conn.commit()
-            ui_logger.edit(f"Обновлена запись id={self.id_val} в {self.table_name}")
-            QMessageBox.information(self, "Успех", "Изменения сохранены")
-            self.accept()
-            if self.parent():
-                self.parent().refresh_table()
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", str(e))
+        row = dict(zip(self.columns, values))
+        self.btn.setEnabled(False)
+        get_executor().execute(lambda conn: mutations.update_row(conn, self.table_name, self.id_val, row,
+                                                                 returning=self.columns),
+                               write=True, on_result=self.saved, on_error=self.save_failed)
+
+    def saved(self, result):
+        ui_logger.edit(f"Обновлена запись id={self.id_val} в {self.table_name}")
+        QMessageBox.information(self, "Успех", "Изменения сохранены")
+        self.accept()
+        if self.parent():
+            self.parent().record_saved(self.table_name, result.get('row'), self.id_val)
+
+    def save_failed(self, msg):
+        self.btn.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", msg)
+
+class BulkUpdateDialog(QDialog):
+    """Одно значение колонки для всех выбранных записей"""
+
+    def __init__(self, table_name, columns, count, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Изменение записей — {table_name}")
+        self.table_name = table_name
+
+        form = QFormLayout()
+        form.addRow(QLabel(f"Выбрано записей: {count}"))
+        self.combo = QComboBox()
+        self.combo.addItems(columns)
+        self.edit = QLineEdit()
+        self.combo.currentTextChanged.connect(lambda col: self.edit.setToolTip(field_hint(table_name, col)))
+        self.edit.setToolTip(field_hint(table_name, self.combo.currentText()))
+        form.addRow("Колонка:", self.combo)
+        form.addRow("Новое значение:", self.edit)
+
+        self.btn = QPushButton("Применить ко всем")
+        self.btn.clicked.connect(self.accept)
+        form.addRow(self.btn)
+        self.setLayout(form)
+
+    def column(self):
+        return self.combo.currentText()
+
+    def value(self):
+        return self.edit.text().strip()
 
 # ============================= УПРАВЛЕНИЕ ДАННЫМИ =============================
+class ImportProgress(QObject):
+    """Ход массового импорта из фонового потока в GUI-поток"""
+    progress = Signal(int, int, float)  # обработано строк, отклонено, строк/с
+
+
 class DataManagementView(QWidget):
     def __init__(self):
         super().__init__()
         self.current_table = None
         self.selected_row = -1
+        self.selected_rows = []
 
         layout = QHBoxLayout(self)
 
@@ -291,51 +427,58 @@ class DataManagementView(QWidget):
         self.btn_add = QPushButton("Добавить запись")
         self.btn_edit = QPushButton("Редактировать")
         self.btn_del = QPushButton("Удалить")
+        self.btn_bulk = QPushButton("Изменить колонку…")
         self.btn_refresh = QPushButton("Обновить")
+        self.btn_import = QPushButton("Импорт из файла…")
 
-        for btn in (self.btn_add, self.btn_edit, self.btn_del, self.btn_refresh):
+        for btn in (self.btn_add, self.btn_edit, self.btn_del, self.btn_bulk, self.btn_refresh, self.btn_import):
             btn.setStyleSheet("padding: 10px; margin: 3px 0;")
         self.btn_edit.setEnabled(False)
         self.btn_del.setEnabled(False)
+        self.btn_bulk.setEnabled(False)
 
         self.btn_add.clicked.connect(self.add_record)
         self.btn_edit.clicked.connect(self.edit_selected)
         self.btn_del.clicked.connect(self.delete_selected)
+        self.btn_bulk.clicked.connect(self.bulk_update_selected)
         self.btn_refresh.clicked.connect(self.refresh_table)
+        self.btn_import.clicked.connect(self.import_file)
 
         btns.addWidget(self.btn_add)
         btns.addWidget(self.btn_edit)
         btns.addWidget(self.btn_del)
+        btns.addWidget(self.btn_bulk)
         btns.addWidget(self.btn_refresh)
+        btns.addWidget(self.btn_import)
         btns.addStretch()
         left.addLayout(btns)
         layout.addLayout(left, 1)
 
         # Таблица
-        self.table = QTableWidget()
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.model = PagedTableModel(get_executor(), self)
+        self.model.load_error.connect(self.load_failed)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.ExtendedSelection)  # Ctrl/Shift — несколько строк
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.selectionModel().selectionChanged.connect(self.selection_changed)
         layout.addWidget(self.table, 4)
 
         self.load_tables()
 
-    def db_connect(self):
-        return mysql.connector.connect(
-            host='pma.morohin.info', user='phpmyadmin',
-            password='0907', database='phpmyadmin'
-        )
-
     def load_tables(self):
-        try:
-            conn = self.db_connect()
-            cur = conn.cursor()
-            cur.execute("SHOW TABLES")
-            tables = [row[0] for row in cur.fetchall()]
-            self.combo.addItems(tables)
-            if tables:
-                self.combo.setCurrentIndex(0)
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", str(e))
+        # Вся схема грузится одним запросом и дальше берётся из кэша
+        get_executor().execute(schema_cache.tables, connect=False, key="schema_tables",
+                               on_result=self.show_tables, on_error=self.show_error)
+
+    def show_tables(self, tables):
+        self.combo.addItems(tables)
+        if tables:
+            self.combo.setCurrentIndex(0)
+
+    def show_error(self, msg):
+        QMessageBox.critical(self, "Ошибка", msg)
 
     def table_selected(self, name):
         if name:
@@ -344,86 +487,160 @@ class DataManagementView(QWidget):
 
     def refresh_table(self):
         if not self.current_table: return
-        try:
-            conn = self.db_connect()
-            cur = conn.cursor()
-            cur.execute(f"SHOW COLUMNS FROM `{self.current_table}`")
-            cols = [row[0] for row in cur.fetchall() if row[0].lower() != 'id']
-
-            placeholders = ', '.join([f"`{c}`" for c in cols])
-            cur.execute(f"SELECT {placeholders} FROM `{self.current_table}` ORDER BY id")
-            rows = cur.fetchall()
-
-            self.table.setRowCount(len(rows))
-            self.table.setColumnCount(len(cols))
-            self.table.setHorizontalHeaderLabels(cols)
-
-            for r, row in enumerate(rows):
-                for c, val in enumerate(row):
-                    item = QTableWidgetItem(str(val) if val is not None else "")
-                    item.setTextAlignment(Qt.AlignCenter)
-                    self.table.setItem(r, c, item)
-
-            self.table.resizeColumnsToContents()
-            self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", str(e))
-        finally:
-            if 'conn' in locals(): conn.close()
+        table = self.current_table
+        # Ключ "columns" отменяет ещё не завершённый запрос при быстром переключении таблиц
+        get_executor().execute(lambda: schema_cache.column_names(table), connect=False, key="columns",
+                               on_result=lambda cols: self.model.set_table(table, cols),
+                               on_error=self.show_error)
+
+    def load_failed(self, msg):
+        # Возможно, структура таблицы изменилась — при следующем обращении схема перечитается
+        schema_cache.invalidate()
+        QMessageBox.critical(self, "Ошибка", msg)
 
     def selection_changed(self):
-        rows = self.table.selectionModel().selectedRows()
-        self.selected_row = rows[0].row() if rows else -1
+        self.selected_rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        self.selected_row = self.selected_rows[0] if len(self.selected_rows) == 1 else -1
         self.btn_edit.setEnabled(self.selected_row >= 0)
-        self.btn_del.setEnabled(self.selected_row >= 0)
+        self.btn_del.setEnabled(bool(self.selected_rows))
+        self.btn_bulk.setEnabled(bool(self.selected_rows))
 
     def edit_selected(self):
         if self.selected_row >= 0:
             self.edit_record(self.selected_row)
 
     def delete_selected(self):
-        if self.selected_row >= 0:
-            self.delete_record(self.selected_row)
+        if self.selected_rows:
+            self.delete_records(self.selected_rows)
+
+    def bulk_update_selected(self):
+        if self.selected_rows:
+            self.bulk_update(self.selected_rows)
 
     def add_record(self):
         if not self.current_table: return
-        cols = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+        cols = list(self.model.columns)
         dlg = DynamicAddDataForm(self.current_table, cols, self)
         dlg.exec()
 
     def edit_record(self, row):
         record = self.get_record_by_row(row)
         if record:
-            cols = [self.table.horizontalHeaderItem(i).text() for i in range(self.table.columnCount())]
+            cols = list(self.model.columns)
             dlg = DynamicEditDataForm(self.current_table, cols, record, self)
             dlg.exec()
 
-    def delete_record(self, row):
-        record = self.get_record_by_row(row)
-        if not record: return
-        if QMessageBox.question(self, "Удалить?", f"Удалить запись id={record['id']}?") == QMessageBox.Yes:
-            try:
-                conn = self.db_connect()
-                cur = conn.cursor()
-                cur.execute(f"DELETE FROM `{self.current_table}` WHERE id=%s", (record['id'],))
-                conn.commit()
-                ui_logger.delete(f"Удалена запись id={record['id']} из {self.current_table}")
-                self.refresh_table()
-            except Exception as e:
-                QMessageBox.critical(self, "Ошибка", str(e))
+    def selected_ids(self, rows):
+        return [r['id'] for r in map(self.get_record_by_row, rows) if r]
+
+    def delete_records(self, rows):
+        ids = self.selected_ids(rows)
+        if not ids: return
+        question = f"Удалить запись id={ids[0]}?" if len(ids) == 1 else f"Удалить выбранные записи ({len(ids)})?"
+        if QMessageBox.question(self, "Удалить?", question) == QMessageBox.Yes:
+            table = self.current_table
+            # Все записи удаляются одним DELETE ... WHERE id IN (...) в одной транзакции
+            get_executor().execute(lambda conn: mutations.delete_rows(conn, table, ids),
+                                   write=True, on_error=self.show_error,
+                                   on_result=lambda res: self.records_deleted(table, ids))
+
+    def records_deleted(self, table, ids):
+        if len(ids) == 1:
+            ui_logger.delete(f"Удалена запись id={ids[0]} из {table}")
+        else:
+            ui_logger.delete(f"Удалено записей из {table}: {len(ids)}")
+        if table == self.current_table:
+            self.model.remove_ids(ids)
+
+    def bulk_update(self, rows):
+        ids = self.selected_ids(rows)
+        if not ids: return
+        dlg = BulkUpdateDialog(self.current_table, list(self.model.columns), len(ids), self)
+        if dlg.exec() != QDialog.Accepted:
+            return
+        table, column, text = self.current_table, dlg.column(), dlg.value()
+        from database import bulk_import
+
+        def run(conn):
+            # значение проверяется по типу колонки так же, как при импорте
+            value = bulk_import.converter(schema_cache.column(table, column, conn))(text)
+            mutations.update_rows(conn, table, ids, {column: value})
+            return value
+        get_executor().execute(run, write=True, on_error=self.show_error,
+                               on_result=lambda value: self.records_updated(table, ids, column, value))
+
+    def record_saved(self, table, row, record_id=None):
+        """Строка после добавления/правки, перечитанная по ключу, — подставляется в таблицу"""
+        if table != self.current_table:
+            return
+        if row is not None:
+            self.model.upsert_row(row)
+        elif record_id is not None:
+            self.model.remove_ids([record_id])  # запись успели удалить
+        else:
+            self.refresh_table()
+
+    def records_updated(self, table, ids, column, value):
+        ui_logger.edit(f"Изменено записей в {table}: {len(ids)} ({column} = {value})")
+        if table == self.current_table:
+            self.model.update_values(ids, {column: value})
+
+    def import_file(self):
+        if not self.current_table: return
+        path, _ = QFileDialog.getOpenFileName(self, f"Импорт в {self.current_table}", "",
+                                              "CSV и JSON (*.csv *.tsv *.json *.jsonl *.ndjson);;Все файлы (*)")
+        if not path: return
+        from database import bulk_import
+
+        table = self.current_table
+        self.btn_import.setEnabled(False)
+        self.import_dialog = QProgressDialog(f"Загрузка в {table}…", "Прервать", 0, 0, self)
+        self.import_dialog.setWindowTitle("Импорт")
+        self.import_dialog.setMinimumDuration(0)
+        self.import_progress = ImportProgress(self)
+        self.import_progress.progress.connect(
+            lambda done, rejected, rate: self.import_dialog.setLabelText(
+                f"Загрузка в {table}: {done:,} строк, отклонено {rejected:,}, {rate:,.0f} строк/с"))
+        progress = self.import_progress.progress
+        cancelled = threading.Event()
+        self.import_dialog.canceled.connect(cancelled.set)
+        # Пачки коммитятся по мере загрузки, поэтому прерванный импорт оставляет уже добавленные строки
+        get_executor().execute(
+            lambda conn: bulk_import.import_file(
+                conn, table, path,
+                on_progress=lambda r: progress.emit(r.processed, len(r.rejected), r.rows_per_second),
+                should_cancel=cancelled.is_set),
+            write=True, on_result=lambda result: self.import_done(result, path), on_error=self.import_failed)
+
+    def import_done(self, result, path):
+        from database import bulk_import
+        self.import_dialog.close()
+        self.btn_import.setEnabled(True)
+        ui_logger.add(f"Импорт из {path}: {result.summary()}")
+        self.refresh_table()
+        if not result.rejected:
+            QMessageBox.information(self, "Импорт", result.summary())
+            return
+        lines = [f"строка {n}: {reason}" for n, _, reason in result.rejected[:10]]
+        if len(result.rejected) > 10:
+            lines.append(f"… и ещё {len(result.rejected) - 10}")
+        answer = QMessageBox.warning(self, "Импорт", result.summary() + "\n\n" + "\n".join(lines)
+                                     + "\n\nСохранить отклонённые строки в файл?",
+                                     QMessageBox.Save | QMessageBox.Close)
+        if answer == QMessageBox.Save:
+            target, _ = QFileDialog.getSaveFileName(self, "Отклонённые строки", "rejected.csv", "CSV (*.csv)")
+            if target:
+                bulk_import.write_rejects(target, result.rejected)
+
+    def import_failed(self, msg):
+        self.import_dialog.close()
+        self.btn_import.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка импорта", msg)
 
     def get_record_by_row(self, row):
-        try:
-            conn = self.db_connect()
-            cur = conn.cursor(dictionary=True)
-            cur.execute(f"SELECT id FROM `{self.current_table}` ORDER BY id LIMIT 1 OFFSET %s", (row,))
-            res = cur.fetchone()
-            if not res: return None
-            cur.execute(f"SELECT * FROM `{self.current_table}` WHERE id=%s", (res['id'],))
-            return cur.fetchone()
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", str(e))
-            return None
+        # Модель хранит id и значения всех загруженных строк — запрос к БД не нужен,
+        # и запись всегда та, которую пользователь видит в таблице
+        return self.model.record(row)
 
 # ============================= ВКЛАДКА ОТЧЁТЫ =============================
 class ReportsPanel(QWidget):
@@ -438,7 +655,7 @@ class ReportsPanel(QWidget):
         title.setAlignment(Qt.AlignCenter)
         title.setStyleSheet("color: #1a365d;")
 
-        desc = QLabel("Нажмите кнопку — PDF будет создан мгновенно")
+        desc = QLabel("Отчёты создаются в фоне — можно продолжать работу в других вкладках")
         desc.setFont(QFont("Segoe UI", 14))
         desc.setAlignment(Qt.AlignCenter)
         desc.setStyleSheet("color: #4a5568; margin-bottom: 40px;")
@@ -461,9 +678,33 @@ class ReportsPanel(QWidget):
                 QPushButton:pressed { background-color: #2b6cb0; }
             """)
 
+        # Очередь: текущий отчёт с прогрессом, остальные ждут своей очереди
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(0)
+        self.progress.setFormat("Нет активных отчётов")
+        self.progress.setTextVisible(True)
+
+        self.jobs_list = QListWidget()
+        self.jobs_list.setFixedHeight(160)
+        self.jobs_items = {}  # id задания -> (QListWidgetItem, название)
+
+        self.btn_cancel = QPushButton("Отменить выбранный")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel_selected)
+        self.jobs_list.currentItemChanged.connect(
+            lambda item, _: self.btn_cancel.setEnabled(item is not None and item.data(Qt.UserRole) in self.jobs_items))
+
+        self.queue = None
         if REPORTS_AVAILABLE:
-            btn1.clicked.connect(lambda: self.generate(DetailedReport, "Подробный отчёт"))
-            btn2.clicked.connect(lambda: self.generate(StatsReport, "Статистический отчёт"))
+            self.queue = ReportQueue(self)
+            self.queue.job_added.connect(self.job_added)
+            self.queue.job_progress.connect(self.job_progress)
+            self.queue.job_finished.connect(self.job_finished)
+            self.queue.job_failed.connect(self.job_failed)
+            self.queue.job_cancelled.connect(self.job_cancelled)
+            btn1.clicked.connect(lambda: self.generate("detailed", "Подробный отчёт"))
+            btn2.clicked.connect(lambda: self.generate("statistical", "Статистический отчёт"))
         else:
             btn1.setEnabled(False)
             btn2.setEnabled(False)
@@ -472,20 +713,63 @@ class ReportsPanel(QWidget):
         layout.addWidget(desc)
         layout.addWidget(btn1)
         layout.addWidget(btn2)
+        layout.addWidget(self.progress)
+        layout.addWidget(self.jobs_list)
+        layout.addWidget(self.btn_cancel)
         layout.addStretch()
 
-    def generate(self, report_class, name):
-        try:
-            report_class().generate()
-            ui_logger.info(f"{name} успешно создан!")
-            QMessageBox.information(self, "Готово", f"{name} сохранён в корне проекта")
-        except Exception as e:
-            ui_logger.delete(f"Ошибка генерации отчёта: {e}")
-            QMessageBox.critical(self, "Ошибка", str(e))
+    def generate(self, report_type, name):
+        self.queue.submit(report_type, name)
+
+    def cancel_selected(self):
+        item = self.jobs_list.currentItem()
+        if item is not None:
+            self.queue.cancel(item.data(Qt.UserRole))
+
+    # --- сигналы очереди ---
+    def job_added(self, job_id, name):
+        item = QListWidgetItem(f"⏳ {name} — в очереди")
+        item.setData(Qt.UserRole, job_id)
+        self.jobs_list.addItem(item)
+        self.jobs_items[job_id] = (item, name)
+        ui_logger.info(f"{name}: поставлен в очередь")
+
+    def job_progress(self, job_id, fraction, phase):
+        if job_id not in self.jobs_items:
+            return
+        item, name = self.jobs_items[job_id]
+        percent = int(fraction * 100)
+        item.setText(f"▶ {name} — {percent}% — {phase}")
+        self.progress.setValue(percent)
+        self.progress.setFormat(f"{name}: {percent}%")
+
+    def _job_done(self, job_id, icon, result):
+        item, name = self.jobs_items.pop(job_id)
+        item.setText(f"{icon} {name} — {result}")
+        self.progress.setValue(0)
+        self.progress.setFormat("Нет активных отчётов" if not self.queue.pending() else "Ожидание следующего отчёта")
+        if self.jobs_list.currentItem() is item:
+            self.btn_cancel.setEnabled(False)
+        return name
+
+    def job_finished(self, job_id, path):
+        name = self._job_done(job_id, "✅", path)
+        ui_logger.info(f"{name} успешно создан: {path}")
+
+    def job_failed(self, job_id, message):
+        name = self._job_done(job_id, "❌", f"ошибка: {message}")
+        ui_logger.delete(f"Ошибка генерации отчёта: {message}")
+        QMessageBox.critical(self, "Ошибка", f"{name}: {message}")
+
+    def job_cancelled(self, job_id):
+        name = self._job_done(job_id, "✖", "отменён")
+        ui_logger.delete(f"{name}: генерация отменена")
 
 # ============================= ГЛАВНОЕ ОКНО =============================
 class MainWindow(QMainWindow):
-    def __init__(self):
+    REPORTS_PAGE = 3
+
+    def __init__(self, lazy_pages=True):
         super().__init__()
         self.setWindowTitle("DataWise — Система управления соревнованиями")
         self.resize(1280, 720)
@@ -516,18 +800,29 @@ class MainWindow(QMainWindow):
             "❓ Справка"
         ])
 
-        # Стек страниц
+        # Стек страниц. Страница создаётся при первом выборе в боковой панели
+        # (до этого на её месте пустая заглушка): запросы к БД, matplotlib и
+        # загрузка таблиц не задерживают появление окна. lazy_pages=False —
+        # создать все страницы сразу, как раньше (для сравнения в benchmarks/startup.py)
+        self.page_factories = [
+            HomePanel,
+            DashboardView,
+            DataManagementView,
+            ReportsPanel,
+            lambda: QLabel("<h2>Справка и поддержка</h2><p>Скоро здесь будет документация :)</p>"),
+        ]
+        self.pages = [None] * len(self.page_factories)
         self.stack = QStackedWidget()
-        self.stack.addWidget(HomePanel())
-        self.stack.addWidget(DashboardView())
-        self.stack.addWidget(DataManagementView())
-        self.stack.addWidget(ReportsPanel())
-        self.stack.addWidget(QLabel("<h2>Справка и поддержка</h2><p>Скоро здесь будет документация :)</p>"))
+        for _ in self.page_factories:
+            self.stack.addWidget(QWidget())
+        if not lazy_pages:
+            for index in range(len(self.pages)):
+                self.page(index)
 
         main_layout.addWidget(self.sidebar)
         main_layout.addWidget(self.stack)
 
-        self.sidebar.currentRowChanged.connect(self.stack.setCurrentIndex)
+        self.sidebar.currentRowChanged.connect(self.show_page)
         self.sidebar.setCurrentRow(0)
 
         # Меню → Отчёты
@@ -536,11 +831,63 @@ class MainWindow(QMainWindow):
         if REPORTS_AVAILABLE:
             act1 = QAction("Подробный отчёт (PDF)", self)
             act2 = QAction("Статистический отчёт (PDF)", self)
-            act1.triggered.connect(lambda: DetailedReport().generate())
-            act2.triggered.connect(lambda: StatsReport().generate())
+            act1.triggered.connect(lambda: self.page(self.REPORTS_PAGE).generate("detailed", "Подробный отчёт"))
+            act2.triggered.connect(lambda: self.page(self.REPORTS_PAGE).generate("statistical", "Статистический отчёт"))
             reports_menu.addAction(act1)
             reports_menu.addAction(act2)
 
+        # Локальная копия БД для чтения (DB_READ_BACKEND=replica) догружается в фоне
+        self.replica_busy = False
+        if replica.enabled():
+            self.replica_timer = QTimer(self)
+            self.replica_timer.timeout.connect(self.sync_replica)
+            self.replica_timer.start(int(REPLICA_CONFIG.get('sync_interval', 60) * 1000))
+            self.sync_replica()
+
+    def page(self, index):
+        """Страница стека; при первом обращении создаётся на месте заглушки"""
+        if self.pages[index] is None:
+            placeholder = self.stack.widget(index)
+            self.pages[index] = self.page_factories[index]()
+            self.stack.insertWidget(index, self.pages[index])
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+        return self.pages[index]
+
+    def show_page(self, index):
+        if index >= 0:
+            self.stack.setCurrentWidget(self.page(index))
+
+    def sync_replica(self):
+        # Пока идёт прошлая синхронизация, тик пропускается: задачу без
+        # соединения не отменить, а новая заняла бы поток пула в ожидании
+        if self.replica_busy:
+            return
+        self.replica_busy = True
+        get_executor().execute(lambda: replica.replica().sync(blocking=False), connect=False,
+                               key="replica_sync", timeout=0, on_result=self._replica_synced,
+                               on_error=self._replica_failed)
+
+    def _replica_synced(self, stats):
+        self.replica_busy = False
+
+    def _replica_failed(self, msg):
+        self.replica_busy = False
+        print("Синхронизация локальной копии БД:", msg)
+
+    def closeEvent(self, event):
+        # Не оставляем фоновую генерацию дописывать файл после закрытия окна
+        reports = self.pages[self.REPORTS_PAGE]
+        if reports is not None and reports.queue is not None:
+            reports.queue.cancel_all()
+            reports.queue.pool.waitForDone()
+        # и опросы БД — срабатывать, пока окна разрушаются
+        change_feed.stop()
+        if hasattr(self, "replica_timer"):
+            self.replica_timer.stop()
+        get_executor().shutdown()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyleSheet("QLabel { font-family: Segoe UI; }")
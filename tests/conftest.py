@@ -0,0 +1,33 @@
+# tests/conftest.py — общие фикстуры: исходники из src/ и локальный MySQL
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+sys.path.insert(0, SRC_DIR)
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+@pytest.fixture(scope="session")
+def mysql_conn():
+    """Соединение с локальным MySQL из .env; без него тесты пропускаются.
+
+    Только локальный сервер: проверки выполняют настоящие изменения
+    (с откатом) и не должны трогать рабочую базу.
+    """
+    from database.database import ConfigurationError, connection_params, get_pool
+    try:
+        params = connection_params()
+    except ConfigurationError as e:
+        pytest.skip(str(e))
+    if params.get("host") not in LOCAL_HOSTS:
+        pytest.skip(f"Сервер {params.get('host')} не локальный")
+    try:
+        conn = get_pool().acquire()
+    except Exception as e:
+        pytest.skip(f"MySQL недоступен: {e}")
+    yield conn
+    conn.close()
@@ -0,0 +1,165 @@
+# tests/test_bulk_import.py — разбор файлов и проверка значений массовой загрузки
+#
+#   python -m pytest tests/test_bulk_import.py -v
+#
+# MySQL не нужен: колонки описываются вручную через schema.Column, файлы
+# подаются через io.StringIO, вставка заменяется записью в список.
+import datetime
+import io
+
+import pytest
+
+from database import bulk_import
+from database.schema import Column
+
+
+def column(name, data_type, column_type=None, nullable=False, auto_increment=False):
+    return Column(name, data_type, column_type or data_type, nullable, False, auto_increment, None, None)
+
+
+def convert(col, value):
+    return bulk_import.converter(col)(value)
+
+
+# ============================= ПРОВЕРКА ТИПОВ =============================
+def test_int_values():
+    col = column("ID_User", "int", "int(11)")
+    assert convert(col, " 42 ") == 42
+    assert convert(col, 7.0) == 7
+    for bad in ("4.5", "abc", 4.5, True):
+        with pytest.raises(ValueError, match="ID_User"):
+            convert(col, bad)
+
+
+def test_empty_values():
+    with pytest.raises(ValueError, match="пустое значение"):
+        convert(column("Name", "varchar", "varchar(50)"), "  ")
+    assert convert(column("Notes", "text", nullable=True), "") is None
+    assert convert(column("ID", "int", auto_increment=True), None) is None
+
+
+def test_date_formats():
+    col = column("Date", "date")
+    assert convert(col, "05.03.2024") == datetime.date(2024, 3, 5)
+    assert convert(col, "2024-03-05") == datetime.date(2024, 3, 5)
+    for bad in ("2024-13-01", "5.3.2024", "31.02.2024"):
+        with pytest.raises(ValueError, match="не подходит"):
+            convert(col, bad)
+    assert convert(column("At", "datetime"), "2024-03-05 10:30:00") == datetime.datetime(2024, 3, 5, 10, 30)
+
+
+def test_text_length():
+    col = column("Login", "varchar", "varchar(5)")
+    assert convert(col, "admin") == "admin"
+    with pytest.raises(ValueError, match="длиннее 5"):
+        convert(col, "admins")
+
+
+def test_enum_and_set_values():
+    enum = column("Level", "enum", "enum('easy','hard')")
+    assert convert(enum, "easy") == "easy"
+    with pytest.raises(ValueError, match="не входит"):
+        convert(enum, "easy,hard")
+
+    tags = column("Specialization", "set", "set('web','ml','it''s')")
+    assert convert(tags, "web,ml") == "web,ml"
+    assert convert(tags, "it's") == "it's"
+    with pytest.raises(ValueError, match="не входит"):
+        convert(tags, "web,db")
+
+
+# ============================= ЧТЕНИЕ ФАЙЛА =============================
+def read_json(text, chunk, monkeypatch):
+    monkeypatch.setattr(bulk_import, "READ_CHUNK", chunk)
+    return list(bulk_import.read_json_array(io.StringIO(text)))
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 7, 1 << 16])
+def test_json_array_across_chunks(chunk, monkeypatch):
+    text = ' [ {"a": 1, "s": "x,]}"},\n {"a": [2, 3]} ,{"a": "ё"} ]  '
+    assert read_json(text, chunk, monkeypatch) == [(1, {"a": 1, "s": "x,]}"}), (2, {"a": [2, 3]}), (3, {"a": "ё"})]
+
+
+@pytest.mark.parametrize("chunk", [1, 4, 1 << 16])
+def test_json_array_empty(chunk, monkeypatch):
+    assert read_json("[ ]", chunk, monkeypatch) == []
+    assert read_json("", chunk, monkeypatch) == []
+
+
+@pytest.mark.parametrize("text", ['[{"a": 1}, {"a": 2}', '[{"a": 1},', "["])
+def test_json_array_not_closed(text, monkeypatch):
+    with pytest.raises(ValueError, match="не закрыт"):
+        read_json(text, 4, monkeypatch)
+
+
+def test_json_array_broken_object(monkeypatch):
+    with pytest.raises(ValueError):
+        read_json('[{"a": 1}, {"a": }]', 4, monkeypatch)
+
+
+def test_json_not_an_array(monkeypatch):
+    with pytest.raises(ValueError, match="JSON-массив"):
+        read_json('{"a": 1}', 4, monkeypatch)
+
+
+def test_csv_delimiters():
+    for sep in (",", ";", "\t"):
+        text = sep.join(["ID_User", "Name"]) + "\r\n" + sep.join(["1", "Анна"]) + "\r\n" + sep.join(["2", "Олег"]) + "\r\n"
+        rows = list(bulk_import.read_csv(io.StringIO(text, newline="")))
+        assert rows == [(2, {"ID_User": "1", "Name": "Анна"}), (3, {"ID_User": "2", "Name": "Олег"})], repr(sep)
+
+
+def test_csv_extra_values_go_under_none():
+    text = "a;b\r\n1;2\r\n3;4;5\r\n"
+    rows = list(bulk_import.read_csv(io.StringIO(text, newline="")))
+    assert rows[1] == (3, {"a": "3", "b": "4", None: ["5"]})
+
+
+# ============================= ЗАГРУЗКА =============================
+def test_check_keys():
+    names = ["a", "b"]
+    bulk_import.BulkImporter._check_keys(names, {"b": 1, "a": 2})
+    with pytest.raises(ValueError, match="лишних значений"):
+        bulk_import.BulkImporter._check_keys(names, {"a": 1, "b": 2, None: ["3"]})
+    with pytest.raises(ValueError, match="лишние колонки: c"):
+        bulk_import.BulkImporter._check_keys(names, {"a": 1, "b": 2, "c": 3})
+    with pytest.raises(ValueError, match="нет колонок: b"):
+        bulk_import.BulkImporter._check_keys(names, {"a": 1})
+
+
+def make_importer(columns, batch_size):
+    """BulkImporter без обращения к схеме базы"""
+    importer = bulk_import.BulkImporter.__new__(bulk_import.BulkImporter)
+    importer.conn = None
+    importer.table = "t"
+    importer.batch_size = batch_size
+    importer.on_progress = None
+    importer.should_cancel = None
+    importer.columns = {c.name: c for c in columns}
+    importer.converters = {c.name: bulk_import.converter(c) for c in columns}
+    importer.foreign_keys = {}
+    importer._ref_ids = {}
+    return importer
+
+
+def test_run_rejects_bad_rows_and_retries_failed_batch(monkeypatch):
+    inserted = []
+
+    def insert_rows(conn, table, names, rows):
+        if len(rows) > 1 and any(values[0] == 3 for values in rows):
+            raise RuntimeError("Duplicate entry")  # БД отвергла пачку целиком
+        if rows == [(3, "c")]:
+            raise RuntimeError("Duplicate entry '3'")
+        inserted.extend(rows)
+
+    monkeypatch.setattr(bulk_import.mutations, "insert_rows", insert_rows)
+    importer = make_importer([column("id", "int"), column("name", "varchar", "varchar(3)")], batch_size=2)
+    rows = [(1, {"id": "1", "name": "a"}), (2, {"id": "x", "name": "b"}),
+            (3, {"id": "2", "name": "b"}), (4, {"id": "3", "name": "c"}),
+            (5, {"id": "4", "name": "d"}), (6, {"id": "5", "name": "long"})]
+    result = importer.run(iter(rows))
+
+    assert inserted == [(1, "a"), (2, "b"), (4, "d")]
+    assert result.inserted == 3
+    assert [(number, reason.split(":")[0]) for number, _, reason in result.rejected] == [
+        (2, "id"), (4, "Duplicate entry '3'"), (6, "name")]
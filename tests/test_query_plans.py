@@ -0,0 +1,285 @@
+# tests/test_query_plans.py — планы запросов приложения через EXPLAIN
+#
+#   mysql datawise < src/database/phpmyadmin.sql
+#   (cd src && python -m database.migrations)
+#   python -m pytest tests -v
+#
+# Нужен локальный MySQL из .env (DB_HOST=localhost), иначе тесты планов
+# пропускаются; разбор планов (full_scans) и список запросов проверяются и без него.
+# SQL не копируется сюда строками: константы импортируются из модулей, а
+# запросы, которые собираются в коде (страницы таблиц, mutations, сводка,
+# лента изменений, срез отчётов), записываются при прогоне настоящих функций
+# на соединении, где commit заменён на rollback. Тест падает, если запрос
+# читает таблицу целиком (type ALL или полный проход индекса) там, где это
+# не предусмотрено WHOLE_READS.
+#
+# На учебном дампе в таблицах по нескольку сотен строк, и оптимизатор
+# честно предпочёл бы сканирование любому индексу. max_seeks_for_key = 1
+# на время проверки делает поиск по индексу заведомо дешевле — так в плане
+# остаются только сканирования, для которых подходящего индекса нет.
+import re
+from types import SimpleNamespace
+
+import pytest
+
+FULL_SCAN_TYPES = ("ALL", "index")
+EXPLAINABLE = re.compile(r"^\s*(SELECT|UPDATE|DELETE|INSERT\b.*\bSELECT\b)", re.I | re.S)
+TABLES = ("users", "programming_tasks", "competition", "competition_tasks", "participation", "decisions")
+
+
+def whole_reads():
+    """SQL -> сколько полных проходов допустимо. Только запросы, которым по
+    смыслу нужна вся таблица: счётчики и агрегаты первой загрузки окон и
+    чтение среза отчётов (по одной таблице за запрос)"""
+    from app.reports import snapshot
+    from database import queries
+    return {
+        queries.HOME_STATS_QUERY: 4,              # COUNT(*) четырёх таблиц
+        queries.COMPETITIONS_BY_YEAR_QUERY: 1,    # GROUP BY по всем соревнованиям
+        snapshot.USERS_QUERY: 1,
+        snapshot.COMPETITIONS_QUERY: 1,
+        snapshot.TASKS_QUERY: 1,
+        snapshot.COMPETITION_TASKS_QUERY: 1,
+        snapshot.PARTICIPATION_QUERY: 1,
+        snapshot.DECISION_TOTALS_QUERY: 1,        # счётчики по паре (участник, задача)
+        snapshot.SOLVE_SUMMARY_QUERY: 1,
+    }
+
+
+# ============================= ЗАПИСЬ ЗАПРОСОВ =============================
+class RecordingCursor:
+    def __init__(self, cur, log):
+        self._cur = cur
+        self._log = log
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def execute(self, sql, params=()):
+        result = self._cur.execute(sql, params)
+        self._log.append((sql, tuple(params or ())))
+        return result
+
+    def executemany(self, sql, seq):
+        seq = list(seq)
+        result = self._cur.executemany(sql, seq)
+        if seq:
+            self._log.append((sql, tuple(seq[0])))
+        return result
+
+
+class RecordingConnection:
+    """Соединение, которое запоминает выполненные запросы; commit откатывает изменения"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.log = []
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor(self._conn.cursor(*args, **kwargs), self.log)
+
+    def commit(self):
+        self._conn.rollback()
+
+
+def _first(conn, sql):
+    cur = conn.cursor()
+    try:
+        cur.execute(sql)
+        return cur.fetchone()
+    finally:
+        cur.close()
+
+
+def _record(fn):
+    def run(conn):
+        rec = RecordingConnection(conn)
+        fn(rec, conn)
+        rec.rollback()
+        return rec.log
+    return run
+
+
+# ============================= ПУТИ ПРИЛОЖЕНИЯ =============================
+def _page(table, after):
+    def run(conn):
+        from app.table_model import PagedTableModel
+        from database.schema import schema_cache
+        model = SimpleNamespace(table_name=table, columns=schema_cache.column_names(table, conn=conn),
+                                _last_id=after, page_size=PagedTableModel.PAGE_SIZE)
+        sql, params = PagedTableModel._page_query(model)
+        return [(sql, tuple(params))]
+    return run
+
+
+@_record
+def _insert_decision(rec, conn):
+    from database import mutations
+    user_id, task_id = _first(conn, "SELECT id_users, id_programminng_tasks FROM decisions LIMIT 1")
+    mutations.insert_row(rec, "decisions", {"status": "OK", "id_users": user_id, "id_programminng_tasks": task_id},
+                         returning=["status"])
+
+
+@_record
+def _insert_decisions(rec, conn):
+    from database import mutations
+    user_id, task_id = _first(conn, "SELECT id_users, id_programminng_tasks FROM decisions LIMIT 1")
+    mutations.insert_rows(rec, "decisions", ["status", "id_users", "id_programminng_tasks"],
+                          [("OK", user_id, task_id), ("ERROR", user_id, task_id)])
+
+
+def _update(table, column):
+    @_record
+    def run(rec, conn):
+        from database import mutations
+        ids = [row[0] for row in _rows(conn, f"SELECT id FROM `{table}` ORDER BY id LIMIT 2")]
+        value = _first(conn, f"SELECT `{column}` FROM `{table}` WHERE id = {int(ids[0])}")[0]
+        mutations.update_rows(rec, table, ids, {column: value}, returning=[column])
+    return run
+
+
+def _delete(table):
+    @_record
+    def run(rec, conn):
+        from database import mutations
+        ids = [row[0] for row in _rows(conn, f"SELECT id FROM `{table}` ORDER BY id DESC LIMIT 2")]
+        mutations.delete_rows(rec, table, ids)
+    return run
+
+
+def _rows(conn, sql):
+    cur = conn.cursor()
+    try:
+        cur.execute(sql)
+        return cur.fetchall()
+    finally:
+        cur.close()
+
+
+def _feed_tracked():
+    import main
+    tracked = dict.fromkeys(main.HomePanel.STAT_TABLES, ())
+    for table, columns in main.DashboardView.FEED_TABLES.items():
+        tracked[table] = tracked.get(table, ()) + tuple(columns)
+    return tracked
+
+
+@_record
+def _feed_baseline(rec, conn):
+    from app import change_feed
+    from database.queries import COMPETITIONS_BY_YEAR_QUERY, HOME_STATS_QUERY
+    change_feed.read_baseline(rec, {"home_stats": (HOME_STATS_QUERY, "one"),
+                                    "dashboard_plot": (COMPETITIONS_BY_YEAR_QUERY, "all")},
+                              _feed_tracked())
+
+
+@_record
+def _feed_changes(rec, conn):
+    from app import change_feed
+    tracked = _feed_tracked()
+    change_feed.read_changes(rec, tracked, dict.fromkeys(tracked, (1, {})), (0, {}), lag=30)
+
+
+@_record
+def _snapshot(rec, conn):
+    from app.reports import ReportSnapshot
+    ReportSnapshot.load(rec, decisions=True)
+
+
+PATHS = {
+    **{f"page_first:{t}": _page(t, None) for t in TABLES},
+    **{f"page_next:{t}": _page(t, 1) for t in TABLES},
+    "mutations.insert_row(decisions)": _insert_decision,
+    "mutations.insert_rows(decisions)": _insert_decisions,
+    "mutations.update_rows(decisions)": _update("decisions", "status"),
+    "mutations.update_rows(programming_tasks)": _update("programming_tasks", "points"),
+    "mutations.update_rows(competition)": _update("competition", "date_of_the_event"),
+    "mutations.delete_rows(decisions)": _delete("decisions"),
+    "change_feed.read_baseline": _feed_baseline,
+    "change_feed.read_changes": _feed_changes,
+    "ReportSnapshot.load": _snapshot,
+}
+
+
+# ============================= ПРОВЕРКА =============================
+def full_scans(plan, limit=None):
+    """Строки плана, в которых таблица читается целиком.
+
+    Проход индекса с LIMIT (первая страница ORDER BY id) не считается: он
+    читает не больше limit записей.
+    """
+    scans = []
+    for row in plan:
+        table = str(row.get("table") or "")
+        if row.get("type") not in FULL_SCAN_TYPES or not table or table.startswith("<"):
+            continue  # <derivedN>, <subqueryN> — не таблицы
+        if row.get("select_type") == "INSERT":
+            continue  # цель INSERT ... SELECT, а не чтение
+        if limit and row.get("type") == "index" and row.get("rows") is not None and row["rows"] <= limit:
+            continue
+        scans.append(row)
+    return scans
+
+
+@pytest.fixture(scope="module")
+def plan_cursor(mysql_conn):
+    cur = mysql_conn.cursor(dictionary=True)
+    cur.execute("SET SESSION max_seeks_for_key = 1")
+    yield cur
+    cur.execute("SET SESSION max_seeks_for_key = DEFAULT")
+    cur.close()
+
+
+@pytest.mark.parametrize("name", sorted(PATHS))
+def test_no_unexpected_full_scan(mysql_conn, plan_cursor, name):
+    statements = PATHS[name](mysql_conn)
+    assert statements, f"{name}: не выполнено ни одного запроса"
+    allowed = whole_reads()
+    limit = None
+    if name.startswith("page_"):
+        from app.table_model import PagedTableModel
+        limit = PagedTableModel.PAGE_SIZE
+    problems = []
+    for sql, params in statements:
+        if not EXPLAINABLE.match(sql):
+            continue
+        plan_cursor.execute("EXPLAIN " + sql.strip(), params)
+        scans = full_scans(plan_cursor.fetchall(), limit)
+        if len(scans) > allowed.get(sql, 0):
+            detail = ", ".join(f"{row['table']} ({row['type']}, ~{row.get('rows')} строк)" for row in scans)
+            problems.append(f"{' '.join(sql.split())[:120]}: {detail}")
+    assert not problems, "Полное сканирование:\n" + "\n".join(problems)
+
+
+# ============================= БЕЗ MYSQL =============================
+def test_every_query_constant_is_checked():
+    """Все запросы database/queries.py попадают в проверку через ленту изменений"""
+    from database import queries
+    constants = {name: value for name, value in vars(queries).items() if name.endswith("_QUERY")}
+    assert constants
+    for name, sql in constants.items():
+        assert sql in whole_reads(), name
+        assert EXPLAINABLE.match(sql), name
+
+
+def test_full_scans_flags_table_scans():
+    plan = [{"table": "decisions", "type": "ALL", "rows": 5000, "select_type": "SIMPLE"},
+            {"table": "users", "type": "eq_ref", "rows": 1, "select_type": "SIMPLE"}]
+    assert [row["table"] for row in full_scans(plan)] == ["decisions"]
+
+
+def test_full_scans_ignores_derived_and_insert_target():
+    plan = [{"table": "<derived2>", "type": "ALL", "rows": 10, "select_type": "PRIMARY"},
+            {"table": "user_solve_summary", "type": "ALL", "rows": None, "select_type": "INSERT"},
+            {"table": None, "type": None, "rows": None, "select_type": "SIMPLE"}]
+    assert full_scans(plan) == []
+
+
+def test_full_scans_index_pass_within_limit():
+    page = [{"table": "users", "type": "index", "rows": 100, "select_type": "SIMPLE"}]
+    assert full_scans(page, limit=100) == []
+    assert full_scans(page) == page
+    assert full_scans([dict(page[0], rows=5000)], limit=100) == [dict(page[0], rows=5000)]
@@ -0,0 +1,73 @@
+# tests/test_section_cache.py — кэш разделов подробного отчёта
+#
+#   python -m pytest tests/test_section_cache.py -v
+#
+# MySQL не нужен: ReportSnapshot собирается из словарей, отчёт строится с
+# графиками ReportLab во временный каталог. Сравнивается текст страниц PDF
+# (нужен pypdf), время формирования в отчёте фиксируется.
+import datetime
+
+import pytest
+
+pytest.importorskip("reportlab")
+pypdf = pytest.importorskip("pypdf")
+
+from app.reports.detailed_report import DetailedReport
+from app.reports.section_cache import SectionCache
+from app.reports.snapshot import ReportSnapshot
+
+COMPETITIONS = 3
+
+
+def make_snapshot(places=None):
+    """Три соревнования по две задачи и три участника; places — {(соревнование, участник): место}"""
+    users = {1: ("Иванова Анна", "web"), 2: ("Петров Олег", "ml"), 3: ("Сидоров Иван", None)}
+    tasks = {10 + i: (100 * (i + 1), i % 3 + 1) for i in range(2 * COMPETITIONS)}
+    competitions, competition_tasks, participation = [], {}, {}
+    for c in range(1, COMPETITIONS + 1):
+        competitions.append({
+            'id': c, 'title': f"Кубок {c}", 'description': None if c == 2 else f"Этап {c}",
+            'date_of_the_event': datetime.date(2024, c, 1), 'end_date': datetime.date(2024, c, 2),
+            'number_of_tasks': 2,
+        })
+        competition_tasks[c] = [(10 + 2 * (c - 1), "A"), (11 + 2 * (c - 1), "B")]
+        participation[c] = [(uid, (places or {}).get((c, uid), uid)) for uid in users]
+    competitions.reverse()  # как COMPETITIONS_QUERY: по убыванию даты
+    decisions = {(uid, tid): (uid % 2 + (tid % 2), uid) for uid in users for tid in tasks}
+    summary = {uid: (sum(ok for (u, _), (ok, _) in decisions.items() if u == uid),
+                     sum(ok + err for (u, _), (ok, err) in decisions.items() if u == uid), 0)
+               for uid in users}
+    return ReportSnapshot(users, competitions, tasks, competition_tasks, participation, decisions, summary)
+
+
+def build(tmp_path, name, snapshot, cache=False):
+    out = tmp_path / name
+    out.mkdir()
+    report = DetailedReport(snapshot=snapshot, chart_backend="reportlab", cache=cache, output_dir=str(out))
+    report.generated_at = "1 января 2025 в 12:00"
+    report.generate()
+    return [page.extract_text() for page in pypdf.PdfReader(report.filename).pages]
+
+
+def test_cached_run_matches_uncached(tmp_path):
+    snapshot = make_snapshot()
+    expected = build(tmp_path, "plain", snapshot)
+
+    cold = SectionCache(str(tmp_path / "cache"))
+    assert build(tmp_path, "cold", snapshot, cold) == expected
+    assert cold.stats() == {"hits": 0, "misses": COMPETITIONS}
+
+    warm = SectionCache(str(tmp_path / "cache"))
+    assert build(tmp_path, "warm", make_snapshot(), warm) == expected
+    assert warm.stats() == {"hits": COMPETITIONS, "misses": 0}
+
+
+def test_changed_participant_rebuilds_only_their_section(tmp_path):
+    build(tmp_path, "first", make_snapshot(), SectionCache(str(tmp_path / "cache")))
+
+    changed = make_snapshot(places={(2, 3): 7})
+    cache = SectionCache(str(tmp_path / "cache"))
+    pages = build(tmp_path, "second", changed, cache)
+    assert cache.stats() == {"hits": COMPETITIONS - 1, "misses": 1}
+    assert pages == build(tmp_path, "plain", changed)
+    assert pages != build(tmp_path, "before", make_snapshot())